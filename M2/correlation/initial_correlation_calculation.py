@@ -4,17 +4,25 @@
 MAGUS Initial Correlation Calculation - MIC Implementation (Python Version)
 ================================================================================
 Implements Maximum Information Coefficient (MIC) for goal correlation analysis
-Target correlations: Energy↔Exploration: 0.7, Energy↔Affinity: 0.5, Exploration↔Affinity: 0.3
-Uses 3-bin discretization and synthetic data designed to produce target correlations
+MeTTa target correlations: Energy↔Exploration: 0.7, Energy↔Affinity: 0.5, Exploration↔Affinity: 0.3
+MIC is computed from the satisfaction samples by the vectorized engine in mic_engine.py
 
 This Python implementation mirrors the MeTTa version while following Python best practices
 with proper class structure, docstrings, and error handling for educational clarity.
 ================================================================================
 """
 
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Optional, Union
 import math
 from enum import Enum
+from itertools import combinations
+
+import numpy as np
+
+from mic_engine import MIC_MODES, estimate_mic, joint_histogram, mic_matrix
+from parallel_correlation import parallel_mic_matrix
+from satisfaction_store import GoalStore, SatisfactionStore, goal_key, observed_rows
+from streaming_correlation import DEFAULT_RESOLUTION, StreamingCorrelation
 
 
 class Goal(Enum):
@@ -24,6 +32,22 @@ class Goal(Enum):
     AFFINITY = "affinity"
 
 
+def pair_label(goal1: Union[Goal, str], goal2: Union[Goal, str]) -> str:
+    """Display name of a goal pair, e.g. "Energy-Exploration"."""
+    return f"{str(goal_key(goal1)).title()}-{str(goal_key(goal2)).title()}"
+
+
+# Synthetic samples per goal pair
+SYNTHETIC_SAMPLES = 200
+
+# (seed, scatter) of every synthetic goal pair; each reproduces its MeTTa target MIC
+SYNTHETIC_PAIRS = {
+    (Goal.ENERGY, Goal.EXPLORATION): (3, 0.125),      # MIC 0.70
+    (Goal.ENERGY, Goal.AFFINITY): (5, 0.195),         # MIC 0.50
+    (Goal.EXPLORATION, Goal.AFFINITY): (12, 0.33),    # MIC 0.30
+}
+
+
 class CorrelationCalculator:
     """
     Calculates Maximum Information Coefficient (MIC) for goal correlation analysis.
@@ -34,58 +58,76 @@ class CorrelationCalculator:
     
     Educational Note:
     The MIC (Maximum Information Coefficient) is a measure of association that
-    captures both linear and non-linear relationships between variables. In our
-    simplified implementation, we use pre-calculated values based on synthetic
-    data patterns rather than computing full mutual information.
+    captures both linear and non-linear relationships between variables. It is
+    the largest normalized mutual information over all grids with at most
+    B(n) = n^0.6 cells, computed here from the actual satisfaction samples.
     """
 
-    def __init__(self):
-        """Initialize the correlation calculator with synthetic goal satisfaction data."""
-        self._goal_data = self._initialize_synthetic_data()
+    def __init__(self, workers: Optional[int] = 1, store: Optional[GoalStore] = None):
+        """
+        Initialize the correlation calculator with goal satisfaction data.
+        
+        Args:
+            workers: Worker processes used by correlation_matrix; 1 computes in
+                this process, None uses all cores
+            store: Optional SatisfactionStore or FileSatisfactionStore whose
+                goals are all paired with each other; the synthetic data is
+                used when omitted
+        """
+        self.workers = workers
+        if store is None:
+            self._goal_data = self._initialize_synthetic_data()
+        else:
+            self._goal_data = self._pairs_from_store(store)
+
+    @staticmethod
+    def _pairs_from_store(store: GoalStore) -> Dict[Tuple[Union[Goal, str], Union[Goal, str]], GoalStore]:
+        """
+        Map every pair of a store's goals to the store.
         
-    def _initialize_synthetic_data(self) -> Dict[Tuple[Goal, Goal], List[Tuple[float, float]]]:
+        Args:
+            store: Store holding one satisfaction column per goal
+            
+        Returns:
+            Dictionary mapping goal pairs to the shared store
+            
+        Educational Note:
+        Goal names stored on disk are turned back into Goal members where one
+        matches, so lookups by Goal and by name both work. Nothing is read
+        from the store here; column data is paged in when a pair is used.
+        """
+        values = {goal.value: goal for goal in Goal}
+        goals = [values.get(goal_key(goal), goal) for goal in store.goals]
+        return {pair: store for pair in combinations(goals, 2)}
+        
+    def _initialize_synthetic_data(self) -> Dict[Tuple[Goal, Goal], SatisfactionStore]:
         """
         Initialize synthetic goal satisfaction data designed to produce target correlations.
         
         Returns:
-            Dictionary mapping goal pairs to lists of (satisfaction_1, satisfaction_2) tuples
+            Dictionary mapping goal pairs to a two-column SatisfactionStore holding
+            the pair's (satisfaction_1, satisfaction_2) samples
             
         Educational Note:
-        This synthetic data is carefully crafted to produce the target correlation values:
-        - Strong diagonal patterns for high correlation (Energy-Exploration: 0.7)
+        Each pair follows the diagonal satisfaction_2 ≈ satisfaction_1 with
+        Gaussian scatter (reflected back into [0, 1]); the more scatter, the
+        weaker the association. The seed and scatter of every pair in
+        SYNTHETIC_PAIRS were chosen so that the MIC computed from the samples
+        reproduces the MeTTa targets to two decimals:
+        - Little scatter for high correlation (Energy-Exploration: 0.7)
         - Moderate scatter for medium correlation (Energy-Affinity: 0.5) 
-        - Significant scatter for weak correlation (Exploration-Affinity: 0.3)
+        - Wide scatter for weak correlation (Exploration-Affinity: 0.3)
+        
+        Each pair was sampled independently, so each gets its own store.
         """
-        return {
-            # Energy-Exploration data (target correlation: 0.7)
-            # Strong positive correlation: diagonal dominance with minimal cross-bin noise
-            (Goal.ENERGY, Goal.EXPLORATION): [
-                (0.1, 0.05), (0.15, 0.1), (0.2, 0.15), (0.25, 0.2), (0.3, 0.25),
-                (0.4, 0.35), (0.45, 0.4), (0.5, 0.45), (0.55, 0.5), (0.6, 0.55),
-                (0.7, 0.7), (0.75, 0.75), (0.8, 0.8), (0.85, 0.85), (0.9, 0.9), (0.95, 0.95),
-                (0.2, 0.7), (0.7, 0.2), (0.4, 0.8), (0.8, 0.4)
-            ],
-            
-            # Energy-Affinity data (target correlation: 0.5)
-            # Moderate positive correlation with more cross-bin scatter
-            (Goal.ENERGY, Goal.AFFINITY): [
-                (0.1, 0.2), (0.15, 0.25), (0.2, 0.3), (0.25, 0.15), (0.3, 0.35),
-                (0.4, 0.45), (0.45, 0.5), (0.5, 0.4), (0.55, 0.6), (0.6, 0.55),
-                (0.7, 0.75), (0.75, 0.7), (0.8, 0.8), (0.85, 0.75),
-                (0.2, 0.8), (0.8, 0.2), (0.3, 0.7), (0.7, 0.3), (0.4, 0.9), (0.9, 0.4),
-                (0.1, 0.6), (0.6, 0.1)
-            ],
-            
-            # Exploration-Affinity data (target correlation: 0.3)
-            # Weak positive correlation with significant cross-bin scatter
-            (Goal.EXPLORATION, Goal.AFFINITY): [
-                (0.05, 0.15), (0.1, 0.2), (0.15, 0.25), (0.2, 0.1), (0.25, 0.3),
-                (0.35, 0.4), (0.4, 0.5), (0.45, 0.35), (0.5, 0.55), (0.55, 0.45),
-                (0.65, 0.7), (0.7, 0.75), (0.75, 0.65), (0.8, 0.8),
-                (0.1, 0.8), (0.8, 0.1), (0.2, 0.9), (0.9, 0.2), (0.3, 0.7), (0.7, 0.3),
-                (0.4, 0.1), (0.1, 0.6), (0.6, 0.2), (0.9, 0.4), (0.5, 0.9), (0.9, 0.5)
-            ]
-        }
+        stores = {}
+        for pair, (seed, scatter) in SYNTHETIC_PAIRS.items():
+            rng = np.random.default_rng(seed)
+            x = rng.random(SYNTHETIC_SAMPLES)
+            y = x + scatter * rng.standard_normal(SYNTHETIC_SAMPLES)
+            y = 1.0 - np.abs(1.0 - np.abs(y))
+            stores[pair] = SatisfactionStore.from_samples(pair, np.column_stack([x, y]))
+        return stores
 
     def discretize_value(self, value: float) -> int:
         """
@@ -109,7 +151,7 @@ class CorrelationCalculator:
         else:
             return 2  # High bin
 
-    def get_goal_data(self, goal1: Goal, goal2: Goal) -> List[Tuple[float, float]]:
+    def get_goal_data(self, goal1: Union[Goal, str], goal2: Union[Goal, str]) -> Tuple[np.ndarray, np.ndarray]:
         """
         Retrieve goal satisfaction data for a specific goal pair.
         
@@ -118,26 +160,31 @@ class CorrelationCalculator:
             goal2: Second goal in the pair
             
         Returns:
-            List of (satisfaction_1, satisfaction_2) tuples for the goal pair
+            Tuple of (goal1 satisfaction, goal2 satisfaction) column views
             
         Raises:
             KeyError: If the goal pair is not found in the data
+            
+        Educational Note:
+        The columns are views into the pair's SatisfactionStore (or memory
+        maps of a FileSatisfactionStore), so neither a reversed pair nor
+        repeated lookups copy any samples. Readings where a goal was not
+        observed are NaN; see observed_pair.
         """
         # Try both orderings since correlations are symmetric
-        if (goal1, goal2) in self._goal_data:
-            return self._goal_data[(goal1, goal2)]
-        elif (goal2, goal1) in self._goal_data:
-            # Swap the tuple values for symmetric access
-            return [(y, x) for x, y in self._goal_data[(goal2, goal1)]]
-        else:
+        store = self._goal_data.get((goal1, goal2))
+        if store is None:
+            store = self._goal_data.get((goal2, goal1))
+        if store is None:
             raise KeyError(f"No data available for goal pair: {goal1}, {goal2}")
+        return store.pair(goal1, goal2)
 
-    def count_points_in_bins(self, data: List[Tuple[float, float]], bin_x: int, bin_y: int) -> int:
+    def count_points_in_bins(self, data: Tuple[np.ndarray, np.ndarray], bin_x: int, bin_y: int) -> int:
         """
         Count data points that fall into specific bin combination.
         
         Args:
-            data: List of (x, y) satisfaction value tuples
+            data: (x, y) satisfaction columns as returned by get_goal_data
             bin_x: Target bin for x values (0, 1, or 2)
             bin_y: Target bin for y values (0, 1, or 2)
             
@@ -149,53 +196,103 @@ class CorrelationCalculator:
         how the data is distributed across the discretized space, which reveals
         the strength of association between variables.
         """
-        count = 0
-        for x, y in data:
-            if self.discretize_value(x) == bin_x and self.discretize_value(y) == bin_y:
-                count += 1
-        return count
+        return int(self.bin_counts(data)[bin_x, bin_y])
 
-    def calculate_mic(self, goal1: Goal, goal2: Goal) -> float:
+    def bin_counts(self, data: Tuple[np.ndarray, np.ndarray]) -> np.ndarray:
+        """
+        Count data points in every 3×3 bin combination in a single pass.
+        
+        Args:
+            data: (x, y) satisfaction columns as returned by get_goal_data
+            
+        Returns:
+            Array of shape (3, 3) where entry [bin_x, bin_y] is the point count
+            
+        Educational Note:
+        Both coordinates are discretized with np.digitize using the same bin
+        edges as discretize_value, and np.bincount tallies all nine cells at
+        once instead of rescanning the data for each cell.
+        """
+        x, y = data
+        edges = [0.33, 0.66]
+        bins_x = np.digitize(x, edges, right=True)
+        bins_y = np.digitize(y, edges, right=True)
+        return joint_histogram(bins_x, bins_y, 3, 3)
+
+    def calculate_mic(self, goal1: Goal, goal2: Goal, mode: str = "full") -> float:
         """
         Calculate Maximum Information Coefficient (MIC) between two goals.
         
         Args:
             goal1: First goal in the pair
             goal2: Second goal in the pair
+            mode: "full" (default) for the exact grid search, "fast" for the
+                approximate search of calculate_mic_estimate
             
         Returns:
             MIC value representing strength of association (0.0 to 1.0)
             
         Educational Note:
-        In a full MIC implementation, we would calculate mutual information across
-        all possible bin combinations and normalize by the maximum possible mutual
-        information. Here, we use a simplified approach that returns target values
-        based on the synthetic data design, which matches the MeTTa implementation.
+        Mutual information is evaluated for every grid resolution (nx, ny) with
+        nx × ny <= n^0.6, each axis split into equal-frequency bins, and the
+        largest value normalized by log(min(nx, ny)) is returned. The joint
+        histogram is built once with NumPy, so the cost is dominated by the
+        grid search rather than by the number of samples. Defaults to the exact
+        search, since get_correlation and the MeTTa targets rely on this value.
         """
-        try:
-            data = self.get_goal_data(goal1, goal2)
+        return self.calculate_mic_estimate(goal1, goal2, mode)[0]
+
+    def calculate_mic_estimate(self, goal1: Goal, goal2: Goal,
+                               mode: str = "fast") -> Tuple[float, float]:
+        """
+        Calculate MIC between two goals together with its possible deviation.
+        
+        Args:
+            goal1: First goal in the pair
+            goal2: Second goal in the pair
+            mode: "fast" (default) or "full"
             
-            if len(data) == 0:
-                return 0.0
-                
-            # Simplified MIC approximation based on data distribution pattern
-            # Uses expected correlation strengths from synthetic data design
-            # This matches the MeTTa implementation approach
+        Returns:
+            Tuple of (MIC, deviation); the exact MIC lies within
+            [MIC, MIC + deviation], and deviation is 0.0 in full mode
             
-            # Normalize goal comparison (handle symmetric cases)
-            goal_pair = tuple(sorted([goal1, goal2], key=lambda g: g.value))
+        Raises:
+            ValueError: If mode is unknown
             
-            if goal_pair == (Goal.ENERGY, Goal.EXPLORATION):
-                return 0.70
-            elif goal_pair == (Goal.AFFINITY, Goal.ENERGY):
-                return 0.50
-            elif goal_pair == (Goal.AFFINITY, Goal.EXPLORATION):
-                return 0.30
-            else:
-                return 0.0
-                
+        Educational Note:
+        Fast mode only scores square and thin equipartition grids, which is
+        enough for per-decision refreshes. Call sites that need more accuracy
+        can check the deviation and fall back to full mode when it is too wide.
+        Unlike calculate_mic this defaults to fast mode, as the deviation is
+        only informative there (it is always 0.0 in full mode).
+        """
+        if mode not in MIC_MODES:
+            raise ValueError(f"Unknown MIC mode {mode!r}, expected one of {MIC_MODES}")
+        try:
+            x, y = self.observed_pair(goal1, goal2)
         except KeyError:
-            return 0.0
+            return 0.0, 0.0
+        if x.size == 0:
+            return 0.0, 0.0
+            
+        return estimate_mic(x, y, mode=mode)
+
+    def observed_pair(self, goal1: Union[Goal, str], goal2: Union[Goal, str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Goal pair data restricted to readings where both goals were observed.
+        
+        Args:
+            goal1: First goal in the pair
+            goal2: Second goal in the pair
+            
+        Returns:
+            Tuple of (goal1 satisfaction, goal2 satisfaction) arrays; the
+            zero-copy views of get_goal_data when nothing is missing
+            
+        Raises:
+            KeyError: If the goal pair is not found in the data
+        """
+        return observed_rows(*self.get_goal_data(goal1, goal2))
 
     def get_correlation(self, goal1: Goal, goal2: Goal) -> float:
         """
@@ -218,11 +315,63 @@ class CorrelationCalculator:
             List of (goal1, goal2, correlation) tuples for all goal pairs
         """
         return [
-            (Goal.ENERGY, Goal.EXPLORATION, self.get_correlation(Goal.ENERGY, Goal.EXPLORATION)),
-            (Goal.ENERGY, Goal.AFFINITY, self.get_correlation(Goal.ENERGY, Goal.AFFINITY)),
-            (Goal.EXPLORATION, Goal.AFFINITY, self.get_correlation(Goal.EXPLORATION, Goal.AFFINITY))
+            (goal1, goal2, self.get_correlation(goal1, goal2))
+            for goal1, goal2 in self._goal_data
         ]
 
+    def pairs(self) -> List[Tuple[Union[Goal, str], Union[Goal, str]]]:
+        """Goal pairs with stored data, in storage order."""
+        return list(self._goal_data)
+
+    def correlation_matrix(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Calculate the full N×N MIC matrix for an arbitrary set of goals.
+        
+        Args:
+            samples: 2-D array of satisfaction values, shape (samples, goals),
+                one column per goal; NaN marks a missing reading
+            
+        Returns:
+            Symmetric array of shape (N, N); entry [i, j] is the MIC of columns
+            i and j over the rows where both were observed. Rows and columns
+            follow the sample columns, so label them with the same goal list,
+            e.g. OvergoalEngine.from_matrix(goals, matrix, measurabilities)
+            
+        Raises:
+            ValueError: If samples is not 2-D
+            
+        Educational Note:
+        Every column is discretized once and its bin assignments are shared by
+        all pairs it takes part in, so tracking dozens of goals costs one
+        discretization per goal plus one histogram per pair. With more than one
+        worker the pairs are sharded across processes that read the bins from
+        shared memory.
+        """
+        samples = np.asarray(samples, dtype=float)
+        if self.workers == 1:
+            return mic_matrix(samples)
+        return parallel_mic_matrix(samples, workers=self.workers)
+
+    def streaming_correlation(self, resolution: int = DEFAULT_RESOLUTION) -> StreamingCorrelation:
+        """
+        Create an online correlation tracker seeded with the stored goal data.
+        
+        Args:
+            resolution: Number of fine bins per axis of each pair's table
+            
+        Returns:
+            StreamingCorrelation holding one live table per stored goal pair
+            
+        Educational Note:
+        New satisfaction readings can then be folded in with
+        StreamingCorrelation.update in O(1) each, instead of rebuilding this
+        calculator and recomputing MIC from the full sample lists.
+        """
+        streaming = StreamingCorrelation(resolution=resolution)
+        for goal1, goal2 in self.pairs():
+            streaming.update_many(goal1, goal2, zip(*self.observed_pair(goal1, goal2)))
+        return streaming
+
     def calculate_total_score(self) -> float:
         """
         Calculate total correlation score as simple average of all pairwise correlations.
@@ -232,8 +381,8 @@ class CorrelationCalculator:
             
         Educational Note:
         The total score provides a single metric summarizing the overall
-        interconnectedness of the goal system. With target values of 0.7, 0.5, 0.3,
-        the expected total score is (0.7 + 0.5 + 0.3) / 3 = 0.5.
+        interconnectedness of the goal system. With the MeTTa target values of
+        0.7, 0.5, 0.3 the total score would be (0.7 + 0.5 + 0.3) / 3 = 0.5.
         """
         correlations = self.get_all_correlations()
         if not correlations:
@@ -254,8 +403,8 @@ class CorrelationCalculator:
             Number of data points for the specified goal pair
         """
         try:
-            data = self.get_goal_data(goal1, goal2)
-            return len(data)
+            x, _ = self.observed_pair(goal1, goal2)
+            return x.size
         except KeyError:
             return 0
 
@@ -267,9 +416,8 @@ class CorrelationCalculator:
             Dictionary mapping goal pair names to data point counts
         """
         return {
-            "Energy-Exploration": self.get_data_count(Goal.ENERGY, Goal.EXPLORATION),
-            "Energy-Affinity": self.get_data_count(Goal.ENERGY, Goal.AFFINITY),
-            "Exploration-Affinity": self.get_data_count(Goal.EXPLORATION, Goal.AFFINITY)
+            pair_label(goal1, goal2): self.get_data_count(goal1, goal2)
+            for goal1, goal2 in self._goal_data
         }
 
     def test_target_correlations(self) -> Dict[str, float]:
@@ -279,15 +427,14 @@ class CorrelationCalculator:
         Returns:
             Dictionary mapping goal pair names to their correlation values
             
-        Expected values:
+        MeTTa target values:
             Energy-Exploration: 0.7
             Energy-Affinity: 0.5  
             Exploration-Affinity: 0.3
         """
         return {
-            "Energy-Exploration": self.get_correlation(Goal.ENERGY, Goal.EXPLORATION),
-            "Energy-Affinity": self.get_correlation(Goal.ENERGY, Goal.AFFINITY),
-            "Exploration-Affinity": self.get_correlation(Goal.EXPLORATION, Goal.AFFINITY)
+            pair_label(goal1, goal2): corr
+            for goal1, goal2, corr in self.get_all_correlations()
         }
 
     def run_correlation_tests(self) -> Dict[str, any]:
@@ -313,8 +460,8 @@ def main():
     
     Educational Note:
     This main function shows how to use the CorrelationCalculator class
-    and validates that our Python implementation produces the same results
-    as the MeTTa version.
+    and prints the MIC values computed from the synthetic satisfaction data
+    next to the MeTTa target values.
     """
     print("MAGUS MIC Correlation System - Python Implementation")
     print("=" * 60)
@@ -330,18 +477,18 @@ def main():
     for pair, count in results["data_availability"].items():
         print(f"  {pair}: {count} data points")
     
-    print(f"\nTarget Correlations (should be 0.7, 0.5, 0.3):")
+    print(f"\nComputed MIC Correlations (MeTTa targets: 0.7, 0.5, 0.3):")
     for pair, corr in results["target_correlations"].items():
-        print(f"  {pair}: {corr}")
+        print(f"  {pair}: {corr:.3f}")
     
-    print(f"\nTotal Score (should be ~0.5): {results['total_score']:.3f}")
+    print(f"\nTotal Score: {results['total_score']:.3f}")
     
     print(f"\nAll Correlations:")
     for goal1, goal2, corr in results["all_correlations"]:
-        print(f"  {goal1.value}-{goal2.value}: {corr}")
+        print(f"  {goal1.value}-{goal2.value}: {corr:.3f}")
     
     print("\n" + "=" * 60)
-    print("Tests Complete - Python implementation matches MeTTa version!")
+    print("Tests Complete")
 
 
 if __name__ == "__main__":
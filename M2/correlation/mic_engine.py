@@ -0,0 +1,565 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+MAGUS MIC Engine - Vectorized Maximal Information Coefficient
+================================================================================
+Computes the Maximal Information Coefficient (Reshef et al., 2011) between two
+goal satisfaction series using NumPy.
+
+Each series is discretized once into fine equal-frequency bins (np.digitize) and
+the fine joint histogram is built in a single np.bincount over a flattened bin
+index. Every grid resolution (nx, ny) with nx × ny <= B(n) = n^0.6 is then read
+from a 2-D cumulative table of that histogram by merging fine bins into nx and
+ny equal-frequency columns and rows, so no grid ever rescans the samples.
+
+MIC is the largest mutual information over all searched grids, normalized by
+log(min(nx, ny)).
+================================================================================
+"""
+
+from typing import List, Optional, Tuple
+import math
+
+import numpy as np
+
+
+# Exponent of the grid size limit B(n) = n^alpha recommended by Reshef et al.
+DEFAULT_ALPHA = 0.6
+
+# Fine bins per coarse bin at the highest searched resolution. Coarse grids
+# are formed by merging fine bins, so a larger factor keeps them closer to
+# exact equipartitions at the cost of a bigger joint histogram.
+FINE_BINS_PER_BIN = 4
+
+# Accepted values of the `mode` argument of compute_mic / estimate_mic
+MIC_MODES = ("full", "fast")
+
+
+def mic_grid_limit(n: int, alpha: float = DEFAULT_ALPHA) -> int:
+    """
+    Maximum number of grid cells B(n) searched for n samples.
+
+    Args:
+        n: Number of samples
+        alpha: Exponent of the limit (default: 0.6)
+
+    Returns:
+        B(n) = n^alpha, never smaller than 4 so that a 2×2 grid is always searched
+    """
+    return max(4, int(n ** alpha))
+
+
+def fine_resolution(n: int, limit: int) -> int:
+    """
+    Number of fine bins per axis used to build the joint histogram.
+
+    Args:
+        n: Number of samples
+        limit: Maximum number of grid cells B(n)
+
+    Returns:
+        Fine bin count, at most one bin per sample
+    """
+    return max(2, min(n, FINE_BINS_PER_BIN * (limit // 2)))
+
+
+def equipartition_bins(values: np.ndarray, bins: int) -> np.ndarray:
+    """
+    Assign each value to one of `bins` equal-frequency bins.
+
+    Args:
+        values: 1-D array of satisfaction values
+        bins: Number of bins
+
+    Returns:
+        Integer array of bin indices in [0, bins)
+
+    Educational Note:
+    Bin edges are taken from the sorted data at evenly spaced ranks, so every
+    bin holds roughly the same number of points. Tied values always land in
+    the same bin, which can leave some bins empty for heavily discrete data.
+    """
+    n = values.shape[0]
+    edges = np.sort(values)[(np.arange(1, bins) * n) // bins]
+    return np.digitize(values, edges)
+
+
+def joint_histogram(bins_x: np.ndarray, bins_y: np.ndarray, nx: int, ny: int) -> np.ndarray:
+    """
+    Count points per grid cell in a single pass.
+
+    Args:
+        bins_x: Bin index of every point along x (values in [0, nx))
+        bins_y: Bin index of every point along y (values in [0, ny))
+        nx: Number of x bins
+        ny: Number of y bins
+
+    Returns:
+        Array of shape (nx, ny) with the number of points in each cell
+    """
+    flat = bins_x * ny + bins_y
+    return np.bincount(flat, minlength=nx * ny).reshape(nx, ny)
+
+
+def _xlogx(counts: np.ndarray) -> np.ndarray:
+    """Elementwise c·log(c) with 0·log(0) = 0."""
+    counts = np.asarray(counts, dtype=float)
+    return counts * np.log(np.maximum(counts, 1.0))
+
+
+def _merge_boundaries(cumulative: np.ndarray, bins: int) -> np.ndarray:
+    """
+    Fine-bin boundaries that merge a marginal into `bins` equal-frequency bins.
+
+    Args:
+        cumulative: Cumulative marginal counts, length (fine bins + 1), starting at 0
+        bins: Number of coarse bins
+
+    Returns:
+        Array of bins + 1 non-decreasing indices into `cumulative`
+    """
+    total = cumulative[-1]
+    targets = total * np.arange(bins + 1) / bins
+    boundaries = np.searchsorted(cumulative, targets, side='left')
+    boundaries[0] = 0
+    boundaries[-1] = cumulative.shape[0] - 1
+    return boundaries
+
+
+def _cumulative_table(counts: np.ndarray) -> np.ndarray:
+    """2-D cumulative sums of a histogram, padded with a leading row and column of zeros."""
+    cumulative = np.zeros((counts.shape[0] + 1, counts.shape[1] + 1), dtype=np.int64)
+    cumulative[1:, 1:] = counts.cumsum(axis=0).cumsum(axis=1)
+    return cumulative
+
+
+def _grid_mutual_information(cells: np.ndarray, n: int) -> float:
+    """Mutual information (nats) of a coarse grid given its cell counts."""
+    return (math.log(n) + (_xlogx(cells).sum() - _xlogx(cells.sum(axis=1)).sum()
+                           - _xlogx(cells.sum(axis=0)).sum()) / n)
+
+
+def row_boundary_plan(cumulative: np.ndarray, max_bins: int) -> Tuple[np.ndarray, ...]:
+    """
+    Concatenated boundaries for every row resolution 2..max_bins.
+
+    Args:
+        cumulative: Cumulative marginal counts of the y axis, starting at 0
+        max_bins: Largest number of rows searched (B(n) // 2)
+
+    Returns:
+        Tuple of (boundary indices, end offset of each resolution in the indices,
+        mask of within-grid differences, start offset of each resolution among
+        the cells, sum of c·log(c) over each resolution's marginal)
+    """
+    boundaries = [_merge_boundaries(cumulative, bins) for bins in range(2, max_bins + 1)]
+    indices = np.concatenate(boundaries)
+    ends = np.cumsum([len(b) for b in boundaries])
+    # Differences between consecutive indices are cell counts, except across
+    # the junction between two resolutions
+    valid = np.ones(indices.shape[0] - 1, dtype=bool)
+    valid[ends[:-1] - 1] = False
+    starts = np.concatenate(([0], np.cumsum([len(b) - 1 for b in boundaries])[:-1]))
+    marginal_terms = np.array([_xlogx(np.diff(cumulative[b])).sum() for b in boundaries])
+    return indices, ends, valid, starts, marginal_terms
+
+
+def mic_from_counts(counts: np.ndarray, limit: int,
+                    row_plan: Optional[Tuple[np.ndarray, ...]] = None) -> float:
+    """
+    MIC of a fine joint histogram, searching every grid with nx × ny <= limit.
+
+    Args:
+        counts: Fine joint histogram of shape (fine_x, fine_y)
+        limit: Maximum number of grid cells B(n)
+        row_plan: Optional precomputed result of row_boundary_plan for the y
+            marginal of `counts`, shared by every pair with the same y column
+
+    Returns:
+        Maximum normalized mutual information in [0.0, 1.0]
+
+    Educational Note:
+    Mutual information is computed from cell counts as
+    I = log(n) + (Σ c_xy·log c_xy - Σ c_x·log c_x - Σ c_y·log c_y) / n,
+    so each grid only needs its cell counts, never the raw samples. For a
+    fixed number of columns all row resolutions are evaluated in one
+    vectorized step.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    n = int(counts.sum())
+    if n == 0 or limit < 4:
+        return 0.0
+
+    cumulative = _cumulative_table(counts)
+    row_cumulative = cumulative[:, -1]
+    col_cumulative = cumulative[-1, :]
+
+    max_bins = limit // 2
+    if row_plan is None:
+        row_plan = row_boundary_plan(col_cumulative, max_bins)
+    y_indices, y_ends, y_valid, y_starts, y_terms = row_plan
+    log_n = math.log(n)
+
+    best = 0.0
+    for nx in range(2, max_bins + 1):
+        ny_max = limit // nx
+        # Number of y resolutions (2..ny_max) evaluated for this column count
+        resolutions = ny_max - 1
+        x_bounds = _merge_boundaries(row_cumulative, nx)
+        x_term = _xlogx(np.diff(row_cumulative[x_bounds])).sum()
+
+        # Cumulative counts at every row boundary for each of the nx merged columns
+        end = y_ends[resolutions - 1]
+        sampled = np.diff(cumulative[np.ix_(x_bounds, y_indices[:end])], axis=0)
+        cells = np.diff(sampled, axis=1)[:, y_valid[:end - 1]]
+        cell_terms = np.add.reduceat(_xlogx(cells).sum(axis=0), y_starts[:resolutions])
+
+        ny = np.arange(2, ny_max + 1)
+        mi = log_n + (cell_terms - x_term - y_terms[:resolutions]) / n
+        normalized = mi / np.log(np.minimum(nx, ny))
+        best = max(best, float(normalized.max()))
+
+    return min(max(best, 0.0), 1.0)
+
+
+def fast_mic_from_counts(counts: np.ndarray, limit: int) -> Tuple[float, float]:
+    """
+    Approximate MIC of a fine joint histogram from a fixed small set of grids.
+
+    Args:
+        counts: Fine joint histogram of shape (fine_x, fine_y)
+        limit: Maximum number of grid cells B(n)
+
+    Returns:
+        Tuple of (approximate MIC, deviation), where the MIC of the full search
+        over the same histogram is guaranteed to lie within
+        [approximate MIC, approximate MIC + deviation]
+
+    Educational Note:
+    For every k up to sqrt(B(n)) only three equipartition grids are scored:
+    the square k×k grid and the two thin grids k×(B/k) and (B/k)×k, which are
+    where smooth and periodic relationships respectively tend to peak. This
+    is O(sqrt(B)) grids instead of O(B·log B), and being a subset of the full
+    search it can only underestimate it.
+
+    The deviation comes from the data processing inequality: merging the
+    rows of a grid can only lose information, so any grid whose smaller side
+    is k scores at most I(X_k; Y_fine) / log k (or the transposed term). The
+    largest such bound over k caps the full MIC.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    n = int(counts.sum())
+    if n == 0 or limit < 4:
+        return 0.0, 0.0
+
+    cumulative = _cumulative_table(counts)
+    row_cumulative = cumulative[:, -1]
+    col_cumulative = cumulative[-1, :]
+
+    best = 0.0
+    bound = 0.0
+    for k in range(2, math.isqrt(limit) + 1):
+        wide = limit // k
+        x_bounds = _merge_boundaries(row_cumulative, k)
+        y_bounds = _merge_boundaries(col_cumulative, k)
+        x_wide = _merge_boundaries(row_cumulative, wide)
+        y_wide = _merge_boundaries(col_cumulative, wide)
+        log_k = math.log(k)
+
+        for rows, cols in ((x_bounds, y_bounds), (x_bounds, y_wide), (x_wide, y_bounds)):
+            cells = np.diff(np.diff(cumulative[np.ix_(rows, cols)], axis=0), axis=1)
+            best = max(best, _grid_mutual_information(cells, n) / log_k)
+
+        # k merged rows against all fine columns, and the transpose
+        for cells in (np.diff(np.diff(cumulative[x_bounds, :], axis=0), axis=1),
+                      np.diff(np.diff(cumulative[:, y_bounds], axis=1), axis=0)):
+            bound = max(bound, _grid_mutual_information(cells, n) / log_k)
+
+    best = min(max(best, 0.0), 1.0)
+    return float(best), float(max(min(bound, 1.0) - best, 0.0))
+
+
+def _merged_bins(bins: np.ndarray, cumulative: np.ndarray, merged: int) -> np.ndarray:
+    """Coarse bin of every sample when its fine bins are merged into `merged` equal-frequency bins."""
+    boundaries = _merge_boundaries(cumulative, merged)
+    coarse = np.searchsorted(boundaries, np.arange(cumulative.shape[0] - 1), side='right') - 1
+    return coarse[bins]
+
+
+def fast_mic_from_bins(bins_x: np.ndarray, bins_y: np.ndarray, resolution: int,
+                       limit: int) -> Tuple[float, float]:
+    """
+    fast_mic_from_counts computed from the fine bins of the samples directly.
+
+    Args:
+        bins_x: Fine bin index of every sample along x
+        bins_y: Fine bin index of every sample along y
+        resolution: Number of fine bins per axis
+        limit: Maximum number of grid cells B(n)
+
+    Returns:
+        Same (approximate MIC, deviation) as fast_mic_from_counts on the fine
+        joint histogram of the bins
+
+    Educational Note:
+    The fast search only reads a few grids per k, so instead of building the
+    resolution × resolution joint histogram and its 2-D cumulative table
+    (which dominate the cost for large n) each grid is counted with one
+    bincount of the samples' merged bin indices.
+    """
+    n = bins_x.shape[0]
+    if n == 0 or limit < 4:
+        return 0.0, 0.0
+
+    row_cumulative = np.concatenate(([0], np.cumsum(np.bincount(bins_x, minlength=resolution))))
+    col_cumulative = np.concatenate(([0], np.cumsum(np.bincount(bins_y, minlength=resolution))))
+
+    best = 0.0
+    bound = 0.0
+    for k in range(2, math.isqrt(limit) + 1):
+        wide = limit // k
+        x_k = _merged_bins(bins_x, row_cumulative, k)
+        y_k = _merged_bins(bins_y, col_cumulative, k)
+        x_wide = _merged_bins(bins_x, row_cumulative, wide)
+        y_wide = _merged_bins(bins_y, col_cumulative, wide)
+        log_k = math.log(k)
+
+        for cells in (joint_histogram(x_k, y_k, k, k), joint_histogram(x_k, y_wide, k, wide),
+                      joint_histogram(x_wide, y_k, wide, k)):
+            best = max(best, _grid_mutual_information(cells, n) / log_k)
+
+        # k merged rows against all fine columns, and the transpose
+        for cells in (joint_histogram(x_k, bins_y, k, resolution),
+                      joint_histogram(bins_x, y_k, resolution, k)):
+            bound = max(bound, _grid_mutual_information(cells, n) / log_k)
+
+    best = min(max(best, 0.0), 1.0)
+    return float(best), float(max(min(bound, 1.0) - best, 0.0))
+
+
+def estimate_mic(x: np.ndarray, y: np.ndarray, alpha: float = DEFAULT_ALPHA,
+                 mode: str = "full") -> Tuple[float, float]:
+    """
+    MIC between two equally long series together with its possible deviation.
+
+    Args:
+        x: 1-D array of satisfaction values for the first goal
+        y: 1-D array of satisfaction values for the second goal
+        alpha: Exponent of the grid size limit B(n) = n^alpha
+        mode: "full" searches every grid; "fast" uses fast_mic_from_bins
+
+    Returns:
+        Tuple of (MIC, deviation); the full search result lies within
+        [MIC, MIC + deviation], so deviation is always 0.0 in full mode
+
+    Raises:
+        ValueError: If x and y have different lengths or mode is unknown
+
+    Educational Note:
+    The equipartition ranks every sample, so both series are read in full,
+    even when they are memory-mapped columns of a FileSatisfactionStore.
+    """
+    if mode not in MIC_MODES:
+        raise ValueError(f"Unknown MIC mode {mode!r}, expected one of {MIC_MODES}")
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if x.shape != y.shape:
+        raise ValueError(f"Sample arrays differ in length: {x.shape[0]} vs {y.shape[0]}")
+
+    n = x.shape[0]
+    if n < 4:
+        return 0.0, 0.0
+
+    limit = mic_grid_limit(n, alpha)
+    resolution = fine_resolution(n, limit)
+    bins_x = equipartition_bins(x, resolution)
+    bins_y = equipartition_bins(y, resolution)
+    if mode == "fast":
+        # Skips the fine joint histogram, which only the full search needs
+        return fast_mic_from_bins(bins_x, bins_y, resolution, limit)
+    return mic_from_counts(joint_histogram(bins_x, bins_y, resolution, resolution), limit), 0.0
+
+
+def compute_mic(x: np.ndarray, y: np.ndarray, alpha: float = DEFAULT_ALPHA,
+                mode: str = "full") -> float:
+    """
+    Maximal Information Coefficient between two equally long series.
+
+    Args:
+        x: 1-D array of satisfaction values for the first goal
+        y: 1-D array of satisfaction values for the second goal
+        alpha: Exponent of the grid size limit B(n) = n^alpha
+        mode: "full" (exact search) or "fast" (see fast_mic_from_counts)
+
+    Returns:
+        MIC value in [0.0, 1.0]; 0.0 when fewer than 4 samples are available
+
+    Raises:
+        ValueError: If x and y have different lengths or mode is unknown
+    """
+    return estimate_mic(x, y, alpha, mode)[0]
+
+
+def discretize_columns(samples: np.ndarray,
+                       alpha: float = DEFAULT_ALPHA) -> Tuple[np.ndarray, int, int]:
+    """
+    Discretize every column of a samples × goals array into fine bins.
+
+    Args:
+        samples: 2-D array with one row per sample and one column per goal
+        alpha: Exponent of the grid size limit B(n) = n^alpha
+
+    Returns:
+        Tuple of (bins, resolution, limit) where bins has shape (goals, n) and
+        holds each column's fine bin indices as one contiguous row
+    """
+    n, goals = samples.shape
+    limit = mic_grid_limit(n, alpha)
+    resolution = fine_resolution(n, limit)
+    bins = np.empty((goals, n), dtype=np.int64)
+    for j in range(goals):
+        bins[j] = equipartition_bins(samples[:, j], resolution)
+    return bins, resolution, limit
+
+
+def column_plan(column_bins: np.ndarray, resolution: int, limit: int) -> Tuple[np.ndarray, ...]:
+    """
+    Row boundary plan of one discretized column (see row_boundary_plan).
+
+    Args:
+        column_bins: Fine bin indices of the column
+        resolution: Number of fine bins
+        limit: Maximum number of grid cells B(n)
+
+    Returns:
+        Plan usable as the row_plan of mic_from_counts when the column is the
+        second axis of the joint histogram
+    """
+    marginal = np.bincount(column_bins, minlength=resolution)
+    cumulative = np.concatenate(([0], np.cumsum(marginal)))
+    return row_boundary_plan(cumulative, limit // 2)
+
+
+def pair_mic(bins_x: np.ndarray, bins_y: np.ndarray, resolution: int, limit: int,
+             plan_y: Optional[Tuple[np.ndarray, ...]] = None) -> float:
+    """
+    MIC of two discretized columns.
+
+    Args:
+        bins_x: Fine bin indices of the first column
+        bins_y: Fine bin indices of the second column
+        resolution: Number of fine bins per axis
+        limit: Maximum number of grid cells B(n)
+        plan_y: Optional precomputed column_plan of bins_y
+
+    Returns:
+        MIC value in [0.0, 1.0]
+    """
+    counts = joint_histogram(bins_x, bins_y, resolution, resolution)
+    return mic_from_counts(counts, limit, row_plan=plan_y)
+
+
+def mic_matrix(samples: np.ndarray, alpha: float = DEFAULT_ALPHA) -> np.ndarray:
+    """
+    Symmetric MIC matrix for every pair of columns of a samples × goals array.
+
+    Args:
+        samples: 2-D array with one row per sample and one column per goal;
+            NaN marks a missing reading
+        alpha: Exponent of the grid size limit B(n) = n^alpha
+
+    Returns:
+        Array of shape (goals, goals) with MIC values; the diagonal is 1.0 for
+        every column whose observed values are not constant
+
+    Raises:
+        ValueError: If samples is not a 2-D array
+
+    Educational Note:
+    Each complete column is discretized into fine equal-frequency bins exactly
+    once and its row boundary plan is built once, so those costs grow with the
+    number of columns. Each pair then only needs one bincount of the shared
+    fine bin indices and a grid search over the resulting histogram. Pairs
+    involving a column with missing readings are computed separately, over
+    the rows where both goals were observed (see fill_missing_pairs).
+    """
+    samples = np.asarray(samples, dtype=float)
+    matrix = empty_mic_matrix(samples)
+    n, goals = samples.shape
+    if n < 4 or goals < 2:
+        return matrix
+
+    complete = complete_columns(samples)
+    if complete.size >= 2:
+        bins, resolution, limit = discretize_columns(samples[:, complete], alpha)
+        plans = [column_plan(column, resolution, limit) for column in bins]
+        for a in range(complete.size):
+            for b in range(a + 1, complete.size):
+                i, j = complete[a], complete[b]
+                matrix[i, j] = matrix[j, i] = pair_mic(bins[a], bins[b], resolution, limit, plans[b])
+    fill_missing_pairs(samples, matrix, alpha)
+    return matrix
+
+
+def complete_columns(samples: np.ndarray) -> np.ndarray:
+    """Indices of the columns of a samples × goals array without missing (NaN) readings."""
+    return np.flatnonzero(~np.isnan(samples).any(axis=0))
+
+
+def fill_missing_pairs(samples: np.ndarray, matrix: np.ndarray,
+                       alpha: float = DEFAULT_ALPHA) -> None:
+    """
+    Fill in the MIC of every pair involving a column with missing readings.
+
+    Args:
+        samples: 2-D array with one row per sample and one column per goal;
+            NaN marks a missing reading
+        matrix: (goals, goals) MIC matrix updated in place
+        alpha: Exponent of the grid size limit B(n) = n^alpha
+
+    Educational Note:
+    Such pairs cannot share the discretization of the complete columns, as
+    each one is computed over its own subset of rows: those where both goals
+    were observed, exactly as CorrelationCalculator.observed_pair does.
+    """
+    for i, j in missing_pairs(samples):
+        matrix[i, j] = matrix[j, i] = masked_pair_mic(samples, i, j, alpha)
+
+
+def missing_pairs(samples: np.ndarray) -> List[Tuple[int, int]]:
+    """Pairs (i, j), i < j, of a samples × goals array involving a column with missing readings."""
+    goals = samples.shape[1]
+    incomplete = set(np.flatnonzero(np.isnan(samples).any(axis=0)).tolist())
+    return [(i, j) for i in range(goals) for j in range(i + 1, goals)
+            if i in incomplete or j in incomplete]
+
+
+def masked_pair_mic(samples: np.ndarray, i: int, j: int,
+                    alpha: float = DEFAULT_ALPHA) -> float:
+    """MIC of columns i and j over the rows where both were observed (non-NaN)."""
+    observed = ~(np.isnan(samples[:, i]) | np.isnan(samples[:, j]))
+    return compute_mic(samples[observed, i], samples[observed, j], alpha)
+
+
+def empty_mic_matrix(samples: np.ndarray) -> np.ndarray:
+    """
+    MIC matrix with only its diagonal filled in.
+
+    Args:
+        samples: 2-D array with one row per sample and one column per goal
+
+    Returns:
+        Array of shape (goals, goals) that is 1.0 on the diagonal for every
+        column whose observed (non-NaN) values are not constant and 0.0 elsewhere
+
+    Raises:
+        ValueError: If samples is not a 2-D array
+    """
+    if samples.ndim != 2:
+        raise ValueError(f"Expected a 2-D samples × goals array, got shape {samples.shape}")
+    n, goals = samples.shape
+    if n == 0:
+        return np.zeros((goals, goals))
+    # fmax/fmin skip NaN; a column without observations stays NaN and compares False
+    spread = np.fmax.reduce(samples, axis=0) - np.fmin.reduce(samples, axis=0)
+    return np.diag((spread > 0).astype(float))
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+MAGUS Parallel Correlation - Process-Pool MIC Matrix over Shared Memory
+================================================================================
+Spreads the pairs of an N×N MIC matrix across a ProcessPoolExecutor.
+
+The parent discretizes every goal column once and copies the fine bin indices
+into a single multiprocessing.shared_memory block. Workers attach to that block
+by name and only receive the column indices j of their shard, computing every
+pair (i, j) with i < j, so the sample data is never pickled per task, every
+worker reads the same physical pages and each column's row plan is built once.
+Pairs involving a column with missing readings go through the same pool: their
+workers read the raw samples from a second shared block and mask each pair's
+rows themselves.
+
+Small matrices and single-core machines are computed serially: below a few
+hundred thousand sample pairs the pool start-up costs more than it saves.
+================================================================================
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+import heapq
+import os
+
+import numpy as np
+
+from mic_engine import (DEFAULT_ALPHA, column_plan, complete_columns, discretize_columns,
+                        empty_mic_matrix, masked_pair_mic, mic_matrix, missing_pairs, pair_mic)
+
+
+# Shards submitted per worker; more shards balance uneven pair costs better
+SHARDS_PER_WORKER = 4
+
+# Samples × pairs below which parallel_mic_matrix stays serial
+PARALLEL_MIN_WORK = 200_000
+
+
+def default_workers() -> int:
+    """Number of worker processes used when none is requested: all cores."""
+    return os.cpu_count() or 1
+
+
+def shard_columns(goals: int, shards: int) -> List[List[int]]:
+    """
+    Split the columns of a goals × goals matrix into balanced, non-empty shards.
+
+    Args:
+        goals: Number of goal columns
+        shards: Desired number of shards
+
+    Returns:
+        List of shards of column indices j; a shard owns every pair (i, j)
+        with i < j, so column 0 (which owns no pair) is never assigned
+
+    Educational Note:
+    Column j owns j pairs, so columns are dealt out largest first, each to
+    the shard with the fewest pairs so far. Every pair is computed exactly
+    once and every row plan is built by exactly one worker.
+    """
+    shards = max(1, min(shards, goals - 1))
+    heap = [(0, k) for k in range(shards)]
+    assigned: List[List[int]] = [[] for _ in range(shards)]
+    for j in range(goals - 1, 0, -1):
+        load, k = heapq.heappop(heap)
+        assigned[k].append(j)
+        heapq.heappush(heap, (load + j, k))
+    return [columns for columns in assigned if columns]
+
+
+def _mic_shard(shm_name: str, shape: Tuple[int, int], resolution: int, limit: int,
+               columns: List[int]) -> List[Tuple[int, int, float]]:
+    """
+    Worker entry point: MIC of every pair (i, j), i < j, for the columns j of one shard.
+
+    Args:
+        shm_name: Name of the shared memory block holding the bin indices
+        shape: (goals, n) shape of the bin index array
+        resolution: Number of fine bins per axis
+        limit: Maximum number of grid cells B(n)
+        columns: Column indices j owned by the shard
+
+    Returns:
+        List of (i, j, mic) triples
+    """
+    block = shared_memory.SharedMemory(name=shm_name)
+    try:
+        bins = np.ndarray(shape, dtype=np.int64, buffer=block.buf)
+        results = []
+        for j in columns:
+            plan = column_plan(bins[j], resolution, limit)
+            for i in range(j):
+                results.append((i, j, pair_mic(bins[i], bins[j], resolution, limit, plan)))
+        # Drop every view of the buffer before closing the block
+        del bins
+        return results
+    finally:
+        block.close()
+
+
+def _masked_shard(shm_name: str, shape: Tuple[int, int], alpha: float,
+                  pairs: List[Tuple[int, int]]) -> List[Tuple[int, int, float]]:
+    """
+    Worker entry point: MIC of pairs involving a column with missing readings.
+
+    Args:
+        shm_name: Name of the shared memory block holding the raw samples
+        shape: (n, goals) shape of the samples array
+        alpha: Exponent of the grid size limit B(n) = n^alpha
+        pairs: Pairs (i, j) of the shard
+
+    Returns:
+        List of (i, j, mic) triples, each over the rows where both goals were observed
+    """
+    block = shared_memory.SharedMemory(name=shm_name)
+    try:
+        samples = np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+        results = [(i, j, masked_pair_mic(samples, i, j, alpha)) for i, j in pairs]
+        del samples
+        return results
+    finally:
+        block.close()
+
+
+def _shared_copy(array: np.ndarray) -> shared_memory.SharedMemory:
+    """New shared memory block holding a copy of an array."""
+    block = shared_memory.SharedMemory(create=True, size=array.nbytes)
+    shared = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+    shared[:] = array
+    del shared
+    return block
+
+
+def parallel_mic_matrix(samples: np.ndarray, workers: Optional[int] = None,
+                        alpha: float = DEFAULT_ALPHA,
+                        min_work: int = PARALLEL_MIN_WORK) -> np.ndarray:
+    """
+    Symmetric MIC matrix, computed by a pool of worker processes when that pays off.
+
+    Args:
+        samples: 2-D array with one row per sample and one column per goal
+        workers: Number of worker processes (default: all cores)
+        alpha: Exponent of the grid size limit B(n) = n^alpha
+        min_work: Samples × pairs below which the matrix is computed serially
+
+    Returns:
+        Array of shape (goals, goals), identical to mic_engine.mic_matrix
+
+    Raises:
+        ValueError: If samples is not a 2-D array or workers is not positive
+    """
+    if workers is None:
+        workers = default_workers()
+    if workers < 1:
+        raise ValueError(f"Workers must be positive, got {workers}")
+
+    samples = np.asarray(samples, dtype=float)
+    if samples.ndim == 2:
+        n, goals = samples.shape
+        if workers == 1 or default_workers() == 1 or n * goals * (goals - 1) // 2 < min_work:
+            return mic_matrix(samples, alpha)
+    return pool_mic_matrix(samples, workers, alpha)
+
+
+def pool_mic_matrix(samples: np.ndarray, workers: int,
+                    alpha: float = DEFAULT_ALPHA) -> np.ndarray:
+    """
+    Symmetric MIC matrix computed by a pool of worker processes, whatever its size.
+
+    Args:
+        samples: 2-D array with one row per sample and one column per goal;
+            NaN marks a missing reading
+        workers: Number of worker processes
+        alpha: Exponent of the grid size limit B(n) = n^alpha
+
+    Returns:
+        Array of shape (goals, goals), identical to mic_engine.mic_matrix
+
+    Raises:
+        ValueError: If samples is not a 2-D array
+
+    Educational Note:
+    Pairs of complete columns share one discretization (see mic_matrix).
+    Pairs involving a column with missing readings are each computed over
+    their own observed rows, as fill_missing_pairs does, and are dealt out
+    round-robin to shards of the same pool, so missing readings do not make
+    the matrix serial.
+    """
+    samples = np.asarray(samples, dtype=float)
+    matrix = empty_mic_matrix(samples)
+    n, goals = samples.shape
+    if n < 4 or goals < 2:
+        return matrix
+
+    complete = complete_columns(samples)
+    masked = missing_pairs(samples)
+    shards = workers * SHARDS_PER_WORKER
+    blocks = []
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = []
+            if complete.size >= 2:
+                bins, resolution, limit = discretize_columns(samples[:, complete], alpha)
+                blocks.append(_shared_copy(bins))
+                futures += [(complete, pool.submit(_mic_shard, blocks[-1].name, bins.shape,
+                                                   resolution, limit, shard))
+                            for shard in shard_columns(complete.size, shards)]
+            if masked:
+                blocks.append(_shared_copy(samples))
+                futures += [(None, pool.submit(_masked_shard, blocks[-1].name, samples.shape,
+                                               alpha, masked[k::shards]))
+                            for k in range(min(shards, len(masked)))]
+            for columns, future in futures:
+                for i, j, value in future.result():
+                    if columns is not None:
+                        i, j = columns[i], columns[j]
+                    matrix[i, j] = matrix[j, i] = value
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+    return matrix
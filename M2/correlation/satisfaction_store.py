@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+MAGUS Satisfaction Store - Columnar Goal Satisfaction Data
+================================================================================
+Stores satisfaction readings as one contiguous float64 column per goal plus a
+shared timestamp column. Every reading is one row: all goals observed at the
+same time. Goals that were not observed in a reading hold NaN.
+
+Pair access returns NumPy views of two columns, so asking for (goal2, goal1)
+instead of (goal1, goal2) just hands back the same two views in the other order
+and repeated MIC calls never copy the samples.
+
+Long histories live on disk in a FileSatisfactionStore: one raw float64 file
+per column plus a small JSON header, opened with np.memmap so that only the
+pages a computation touches are ever read.
+================================================================================
+"""
+
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+import json
+
+import numpy as np
+
+
+# Rows allocated by an empty store; capacity doubles whenever it is exhausted
+INITIAL_CAPACITY = 64
+
+# Name of the JSON header of an on-disk store and the version it is written with
+HEADER_FILE = "header.json"
+FORMAT_VERSION = 1
+
+# On-disk dtype of every column: little-endian float64
+DISK_DTYPE = np.dtype("<f8")
+
+# Rows scanned at a time when streaming over (possibly memory-mapped) columns
+CHUNK_ROWS = 1 << 16
+
+
+def goal_key(goal: Hashable) -> Hashable:
+    """
+    Lookup key of a goal: the value of Enum members, the goal itself otherwise.
+
+    Educational Note:
+    Stores index their columns by this key, so Goal.ENERGY from either the
+    correlation or the measurability module and the plain name "energy" all
+    find the same column.
+    """
+    return goal.value if isinstance(goal, Enum) else goal
+
+
+def observed_rows(x: np.ndarray, y: np.ndarray,
+                  chunk_rows: int = CHUNK_ROWS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Values of two columns restricted to the rows where both are observed.
+
+    Args:
+        x: Satisfaction column of the first goal
+        y: Satisfaction column of the second goal, as long as x
+        chunk_rows: Rows scanned at a time
+
+    Returns:
+        Tuple of (x, y) arrays; x and y themselves when nothing is missing
+
+    Educational Note:
+    Both columns are scanned chunk by chunk, so a pair of memory-mapped
+    columns is never masked as a whole: the NaN check and the mask only ever
+    cover chunk_rows readings, and only observed values are copied out.
+    """
+    kept_x: List[np.ndarray] = []
+    kept_y: List[np.ndarray] = []
+    complete = True
+    for start in range(0, x.shape[0], chunk_rows):
+        chunk_x = x[start:start + chunk_rows]
+        chunk_y = y[start:start + chunk_rows]
+        observed = ~(np.isnan(chunk_x) | np.isnan(chunk_y))
+        if complete and observed.all():
+            continue
+        if complete:
+            # First gap: everything before this chunk was observed
+            complete = False
+            kept_x.append(np.asarray(x[:start]))
+            kept_y.append(np.asarray(y[:start]))
+        kept_x.append(chunk_x[observed])
+        kept_y.append(chunk_y[observed])
+    if complete:
+        return x, y
+    return np.concatenate(kept_x), np.concatenate(kept_y)
+
+
+class SatisfactionStore:
+    """
+    Append-only columnar table of goal satisfaction readings.
+
+    Educational Note:
+    The columns live in one (goals, capacity) array, so each goal's samples
+    are contiguous in memory. Views returned by column() and pair() stay valid
+    until the next append that has to grow the capacity.
+    """
+
+    def __init__(self, goals: Sequence[Hashable], capacity: int = INITIAL_CAPACITY):
+        """
+        Initialize an empty store.
+
+        Args:
+            goals: Goals tracked by the store, one column each
+            capacity: Number of rows to allocate up front
+
+        Raises:
+            ValueError: If a goal is listed twice
+        """
+        if len({goal_key(goal) for goal in goals}) != len(goals):
+            raise ValueError(f"Duplicate goals: {list(goals)}")
+        self._goals: List[Hashable] = list(goals)
+        self._index: Dict[Hashable, int] = {goal_key(goal): i for i, goal in enumerate(self._goals)}
+        capacity = max(capacity, 1)
+        self._columns = np.full((len(self._goals), capacity), np.nan)
+        self._timestamps = np.zeros(capacity)
+        self._size = 0
+
+    @classmethod
+    def from_samples(cls, goals: Sequence[Hashable], samples: Iterable[Sequence[float]],
+                     timestamps: Optional[Sequence[float]] = None) -> "SatisfactionStore":
+        """
+        Build a store from rows of satisfaction values.
+
+        Args:
+            goals: Goals tracked by the store, one per value in each row
+            samples: Rows of satisfaction values, e.g. (satisfaction_1, satisfaction_2) tuples
+            timestamps: Optional time of each row (default: 0, 1, 2, ...)
+
+        Returns:
+            Store holding every row
+        """
+        rows = np.asarray(list(samples), dtype=float).reshape(-1, len(goals))
+        if timestamps is None:
+            timestamps = np.arange(rows.shape[0], dtype=float)
+        store = cls(goals, capacity=rows.shape[0])
+        store.extend(timestamps, rows)
+        return store
+
+    @property
+    def goals(self) -> List[Hashable]:
+        """Goals tracked by the store, in column order."""
+        return list(self._goals)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """View of the timestamp column."""
+        return self._timestamps[:self._size]
+
+    def __len__(self) -> int:
+        """Number of readings stored."""
+        return self._size
+
+    def __contains__(self, goal: Hashable) -> bool:
+        """Whether the store has a column for a goal."""
+        return goal_key(goal) in self._index
+
+    def _reserve(self, rows: int) -> None:
+        """Grow the capacity geometrically so that `rows` more readings fit."""
+        needed = self._size + rows
+        capacity = self._timestamps.shape[0]
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        columns = np.full((len(self._goals), capacity), np.nan)
+        columns[:, :self._size] = self._columns[:, :self._size]
+        timestamps = np.zeros(capacity)
+        timestamps[:self._size] = self._timestamps[:self._size]
+        self._columns = columns
+        self._timestamps = timestamps
+
+    def append(self, timestamp: float, values: Mapping[Hashable, float]) -> None:
+        """
+        Append one reading.
+
+        Args:
+            timestamp: Time of the reading
+            values: Mapping of goal to satisfaction value; omitted goals are
+                recorded as missing (NaN)
+
+        Raises:
+            KeyError: If a value is given for a goal the store does not track
+        """
+        self._reserve(1)
+        row = self._size
+        for goal, value in values.items():
+            self._columns[self._index[goal_key(goal)], row] = value
+        self._timestamps[row] = timestamp
+        self._size += 1
+
+    def extend(self, timestamps: Sequence[float], rows: np.ndarray) -> None:
+        """
+        Append many readings at once.
+
+        Args:
+            timestamps: Time of each reading
+            rows: Array of shape (readings, goals) in column order
+
+        Raises:
+            ValueError: If the shapes of timestamps and rows disagree
+        """
+        timestamps = np.asarray(timestamps, dtype=float)
+        rows = np.asarray(rows, dtype=float)
+        if rows.ndim != 2 or rows.shape != (timestamps.shape[0], len(self._goals)):
+            raise ValueError(
+                f"Expected rows of shape ({timestamps.shape[0]}, {len(self._goals)}), "
+                f"got {rows.shape}")
+        count = rows.shape[0]
+        self._reserve(count)
+        self._columns[:, self._size:self._size + count] = rows.T
+        self._timestamps[self._size:self._size + count] = timestamps
+        self._size += count
+
+    def column(self, goal: Hashable) -> np.ndarray:
+        """
+        View of one goal's satisfaction column.
+
+        Args:
+            goal: Goal to look up
+
+        Returns:
+            Contiguous 1-D view of length len(self)
+
+        Raises:
+            KeyError: If the store does not track the goal
+        """
+        return self._columns[self._index[goal_key(goal)], :self._size]
+
+    def pair(self, goal1: Hashable, goal2: Hashable) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Views of two goals' columns, in the order requested.
+
+        Args:
+            goal1: First goal
+            goal2: Second goal
+
+        Returns:
+            Tuple of (goal1 column, goal2 column) views
+
+        Raises:
+            KeyError: If the store does not track one of the goals
+        """
+        return self.column(goal1), self.column(goal2)
+
+    def save(self, directory: Union[str, Path]) -> "FileSatisfactionStore":
+        """
+        Write the store to disk.
+
+        Args:
+            directory: Directory to create the on-disk store in
+
+        Returns:
+            FileSatisfactionStore opened on the written directory
+        """
+        on_disk = FileSatisfactionStore.create(directory, self._goals)
+        on_disk.extend(self.timestamps, self._columns[:, :self._size].T)
+        return on_disk
+
+
+class FileSatisfactionStore:
+    """
+    Read-mostly satisfaction store backed by memory-mapped column files.
+
+    The directory holds header.json, timestamps.f64 and one column_<i>.f64
+    file per goal. The header records the goal names, the column file names
+    and the number of readings, which is the only thing readers trust: bytes
+    written past it by an interrupted extend are ignored.
+
+    Educational Note:
+    Columns are opened with np.memmap the first time they are requested, so
+    opening a store with months of readings costs nothing, and a computation
+    over one goal only pages in that goal's file. The read interface matches
+    SatisfactionStore, so calculators accept either.
+
+    File backing saves resident memory between computations, not during
+    one: an exact MIC equipartitions each column by rank, so it reads the
+    whole pair. Missing readings are dropped by streaming through the
+    columns in chunks (observed_rows) rather than masking them at once.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        """
+        Open an existing on-disk store.
+
+        Args:
+            directory: Directory written by create() or SatisfactionStore.save()
+
+        Raises:
+            FileNotFoundError: If the directory has no header
+            ValueError: If the header was written by an unsupported format version
+        """
+        self.directory = Path(directory)
+        with open(self.directory / HEADER_FILE) as f:
+            header = json.load(f)
+        if header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported store format version: {header.get('version')}")
+        self._goals: List[Hashable] = header["goals"]
+        self._index: Dict[Hashable, int] = {goal: i for i, goal in enumerate(self._goals)}
+        self._files: List[str] = header["columns"]
+        self._timestamp_file: str = header["timestamps"]
+        self._size: int = header["length"]
+        self._maps: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def create(cls, directory: Union[str, Path], goals: Sequence[Hashable]) -> "FileSatisfactionStore":
+        """
+        Create an empty on-disk store.
+
+        Args:
+            directory: Directory to create; it may exist but must not hold a store
+            goals: Goals tracked by the store; Enum members are stored by value
+
+        Returns:
+            The opened, empty store
+
+        Raises:
+            FileExistsError: If the directory already holds a store
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        if (directory / HEADER_FILE).exists():
+            raise FileExistsError(f"A satisfaction store already exists in {directory}")
+
+        names = [goal_key(goal) for goal in goals]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate goals: {names}")
+        files = [f"column_{i}.f64" for i in range(len(names))]
+        for name in files + ["timestamps.f64"]:
+            (directory / name).touch()
+        cls._write_header(directory, names, files, 0)
+        return cls(directory)
+
+    @staticmethod
+    def _write_header(directory: Path, goals: List[Hashable], files: List[str], length: int) -> None:
+        """Write the JSON header atomically (temporary file + rename)."""
+        header = {
+            "version": FORMAT_VERSION,
+            "dtype": DISK_DTYPE.str,
+            "goals": goals,
+            "columns": files,
+            "timestamps": "timestamps.f64",
+            "length": length,
+        }
+        temporary = directory / (HEADER_FILE + ".tmp")
+        with open(temporary, "w") as f:
+            json.dump(header, f, indent=2)
+        temporary.replace(directory / HEADER_FILE)
+
+    @property
+    def goals(self) -> List[Hashable]:
+        """Goal names tracked by the store, in column order."""
+        return list(self._goals)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Memory-mapped timestamp column."""
+        return self._map(self._timestamp_file)
+
+    def __len__(self) -> int:
+        """Number of readings stored."""
+        return self._size
+
+    def __contains__(self, goal: Hashable) -> bool:
+        """Whether the store has a column for a goal."""
+        return goal_key(goal) in self._index
+
+    def _map(self, name: str) -> np.ndarray:
+        """Memory-map one column file, read-only, up to the header length."""
+        if name not in self._maps:
+            if self._size == 0:
+                # np.memmap cannot map zero bytes
+                self._maps[name] = np.empty(0, dtype=DISK_DTYPE)
+            else:
+                self._maps[name] = np.memmap(self.directory / name, dtype=DISK_DTYPE,
+                                             mode="r", shape=(self._size,))
+        return self._maps[name]
+
+    def extend(self, timestamps: Sequence[float], rows: np.ndarray) -> None:
+        """
+        Append many readings to the column files.
+
+        Args:
+            timestamps: Time of each reading
+            rows: Array of shape (readings, goals) in column order
+
+        Raises:
+            ValueError: If the shapes of timestamps and rows disagree
+
+        Educational Note:
+        Column bytes are appended first and the header length is updated
+        last, so a reader never sees a partially written reading.
+        """
+        timestamps = np.asarray(timestamps, dtype=DISK_DTYPE)
+        rows = np.asarray(rows, dtype=DISK_DTYPE)
+        if rows.ndim != 2 or rows.shape != (timestamps.shape[0], len(self._goals)):
+            raise ValueError(
+                f"Expected rows of shape ({timestamps.shape[0]}, {len(self._goals)}), "
+                f"got {rows.shape}")
+
+        byte_offset = self._size * DISK_DTYPE.itemsize
+        for name, values in [(self._timestamp_file, timestamps)] + list(zip(self._files, rows.T)):
+            with open(self.directory / name, "r+b") as f:
+                f.seek(byte_offset)
+                f.write(np.ascontiguousarray(values).tobytes())
+                f.truncate()
+        self._size += rows.shape[0]
+        self._write_header(self.directory, self._goals, self._files, self._size)
+        # Existing maps cover the old length only
+        self._maps.clear()
+
+    def column(self, goal: Hashable) -> np.ndarray:
+        """
+        Memory-mapped view of one goal's satisfaction column.
+
+        Args:
+            goal: Goal name, or an Enum member whose value is the name
+
+        Returns:
+            Read-only 1-D array of length len(self)
+
+        Raises:
+            KeyError: If the store does not track the goal
+        """
+        return self._map(self._files[self._index[goal_key(goal)]])
+
+    def pair(self, goal1: Hashable, goal2: Hashable) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Memory-mapped views of two goals' columns, in the order requested.
+
+        Args:
+            goal1: First goal
+            goal2: Second goal
+
+        Returns:
+            Tuple of (goal1 column, goal2 column)
+
+        Raises:
+            KeyError: If the store does not track one of the goals
+        """
+        return self.column(goal1), self.column(goal2)
+
+
+# Either store type; calculators only use the shared read interface
+GoalStore = Union[SatisfactionStore, FileSatisfactionStore]
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+MAGUS Streaming Correlation - Online MIC from Live Contingency Tables
+================================================================================
+Keeps one fine contingency table per goal pair and updates it in O(1) for every
+new (x, y) satisfaction sample. MIC is read from the live table on demand with
+the same grid search the batch engine uses (mic_engine.mic_from_counts), so
+agents that emit readings continuously never recompute from raw history.
+================================================================================
+"""
+
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+import math
+
+import numpy as np
+
+from mic_engine import DEFAULT_ALPHA, mic_from_counts, mic_grid_limit
+
+
+# Fine bins per axis of every live table
+DEFAULT_RESOLUTION = 64
+
+
+class ContingencyTable:
+    """
+    Fine equal-width joint histogram of one goal pair.
+
+    Educational Note:
+    Satisfaction values live in a known range, so bin edges can be fixed up
+    front and each sample increments exactly one cell. Coarser grids are
+    derived at read time by merging fine bins into equal-frequency rows and
+    columns, which keeps updates O(1) regardless of how many grid
+    resolutions MIC searches.
+    """
+
+    def __init__(self, resolution: int = DEFAULT_RESOLUTION,
+                 value_range: Tuple[float, float] = (0.0, 1.0),
+                 alpha: float = DEFAULT_ALPHA):
+        """
+        Initialize an empty table.
+
+        Args:
+            resolution: Number of fine bins per axis
+            value_range: (low, high) range of satisfaction values; values outside
+                it are clamped into the edge bins
+            alpha: Exponent of the grid size limit B(n) = n^alpha
+        """
+        if resolution < 2:
+            raise ValueError(f"Resolution must be at least 2, got {resolution}")
+        low, high = value_range
+        if high <= low:
+            raise ValueError(f"Invalid value range: {value_range}")
+
+        self.resolution = resolution
+        self.alpha = alpha
+        self._low = low
+        self._scale = resolution / (high - low)
+        self.counts = np.zeros((resolution, resolution), dtype=np.int64)
+        self.n = 0
+        self._cached_mic: Optional[float] = None
+
+    def bin_index(self, value: float) -> int:
+        """
+        Fine bin of a single value.
+
+        Args:
+            value: Finite satisfaction value
+
+        Returns:
+            Bin index in [0, resolution)
+        """
+        index = int((value - self._low) * self._scale)
+        return min(max(index, 0), self.resolution - 1)
+
+    def add(self, x: float, y: float, weight: int = 1) -> bool:
+        """
+        Add (or, with a negative weight, remove) one sample in O(1).
+
+        Args:
+            x: Satisfaction value of the first goal
+            y: Satisfaction value of the second goal
+            weight: Count added to the sample's cell
+
+        Returns:
+            True if the sample was counted; False if it was skipped because
+            x or y is not finite (e.g. a missing reading stored as NaN)
+        """
+        if not (math.isfinite(x) and math.isfinite(y)):
+            return False
+        self.counts[self.bin_index(x), self.bin_index(y)] += weight
+        self.n += weight
+        self._cached_mic = None
+        return True
+
+    def mic(self) -> float:
+        """
+        MIC of the samples currently in the table.
+
+        Returns:
+            MIC value in [0.0, 1.0]; 0.0 with fewer than 4 samples
+
+        Educational Note:
+        The result is cached until the next update, so repeated reads between
+        samples cost nothing.
+        """
+        if self._cached_mic is None:
+            if self.n < 4:
+                self._cached_mic = 0.0
+            else:
+                # Grids cannot be finer than the table itself
+                limit = min(mic_grid_limit(self.n, self.alpha), 2 * self.resolution)
+                self._cached_mic = mic_from_counts(self.counts, limit)
+        return self._cached_mic
+
+
+class StreamingCorrelation:
+    """
+    Online MIC correlations for any number of goal pairs.
+
+    Educational Note:
+    Pairs are symmetric: a sample reported as (goal2, goal1) updates the same
+    table as (goal1, goal2) with its coordinates swapped.
+    """
+
+    def __init__(self, resolution: int = DEFAULT_RESOLUTION,
+                 value_range: Tuple[float, float] = (0.0, 1.0),
+                 alpha: float = DEFAULT_ALPHA):
+        """
+        Initialize with no tracked pairs.
+
+        Args:
+            resolution: Number of fine bins per axis of every table
+            value_range: (low, high) range of satisfaction values
+            alpha: Exponent of the grid size limit B(n) = n^alpha
+        """
+        self.resolution = resolution
+        self.value_range = value_range
+        self.alpha = alpha
+        self._tables: Dict[Tuple[Hashable, Hashable], ContingencyTable] = {}
+        # Incremented on every update so caches of derived values
+        # (e.g. overgoal scores) know when to invalidate
+        self.version = 0
+
+    def _lookup(self, goal1: Hashable, goal2: Hashable) -> Tuple[Optional[ContingencyTable], bool]:
+        """Return (table, swapped) for a pair, or (None, False) if untracked."""
+        if (goal1, goal2) in self._tables:
+            return self._tables[(goal1, goal2)], False
+        if (goal2, goal1) in self._tables:
+            return self._tables[(goal2, goal1)], True
+        return None, False
+
+    def update(self, goal1: Hashable, goal2: Hashable, x: float, y: float) -> None:
+        """
+        Fold one new satisfaction sample of a goal pair into its table.
+
+        Args:
+            goal1: First goal
+            goal2: Second goal
+            x: Satisfaction of goal1
+            y: Satisfaction of goal2; samples where either value is not
+                finite are skipped
+        """
+        table, swapped = self._lookup(goal1, goal2)
+        if table is None:
+            table = ContingencyTable(self.resolution, self.value_range, self.alpha)
+            self._tables[(goal1, goal2)] = table
+        if swapped:
+            x, y = y, x
+        if table.add(x, y):
+            self.version += 1
+
+    def update_many(self, goal1: Hashable, goal2: Hashable,
+                    samples: Iterable[Tuple[float, float]]) -> None:
+        """
+        Fold a batch of (x, y) samples of one goal pair into its table.
+
+        Args:
+            goal1: First goal
+            goal2: Second goal
+            samples: Iterable of (satisfaction_1, satisfaction_2) tuples
+        """
+        for x, y in samples:
+            self.update(goal1, goal2, x, y)
+
+    def get_correlation(self, goal1: Hashable, goal2: Hashable) -> float:
+        """
+        Current MIC of a goal pair.
+
+        Args:
+            goal1: First goal
+            goal2: Second goal
+
+        Returns:
+            MIC of all samples seen so far; 0.0 for untracked pairs
+        """
+        table, _ = self._lookup(goal1, goal2)
+        return table.mic() if table is not None else 0.0
+
+    def get_data_count(self, goal1: Hashable, goal2: Hashable) -> int:
+        """
+        Number of samples folded into a goal pair's table.
+
+        Args:
+            goal1: First goal
+            goal2: Second goal
+
+        Returns:
+            Sample count; 0 for untracked pairs
+        """
+        table, _ = self._lookup(goal1, goal2)
+        return table.n if table is not None else 0
+
+    def pairs(self) -> List[Tuple[Hashable, Hashable]]:
+        """Goal pairs currently tracked, in insertion order."""
+        return list(self._tables)
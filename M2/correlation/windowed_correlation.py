@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+MAGUS Windowed Correlation - Sliding-Window MIC with Expiry
+================================================================================
+Rolling goal correlations for the M3 metagoals module (get-rolling-correlation).
+
+Every goal pair keeps a time-ordered buffer of its samples next to a live
+contingency table. Samples entering the window add one count to the table and
+samples leaving it subtract one, so each sample costs O(1) twice over its
+lifetime and MIC always reflects exactly the samples inside the window.
+================================================================================
+"""
+
+from collections import deque
+from itertools import combinations
+from typing import Deque, Dict, Hashable, Iterable, List, Optional, Tuple
+import math
+
+from mic_engine import DEFAULT_ALPHA
+from streaming_correlation import DEFAULT_RESOLUTION, ContingencyTable
+
+
+# Expiry horizon of samples added directly; add_records takes its window from
+# the caller (evaluation-window-duration in M3/core/metagoals.metta)
+DEFAULT_WINDOW = 1000.0
+
+
+class WindowedCorrelationStore:
+    """
+    Time-indexed per-pair sample buffers with rolling MIC.
+
+    Educational Note:
+    The window only slides forward: timestamps of one pair must be
+    non-decreasing, and once a sample has expired it cannot re-enter. This is
+    what makes expiry a pop from the front of the buffer instead of a scan.
+    """
+
+    def __init__(self, window: float = DEFAULT_WINDOW,
+                 resolution: int = DEFAULT_RESOLUTION,
+                 value_range: Tuple[float, float] = (0.0, 1.0),
+                 alpha: float = DEFAULT_ALPHA):
+        """
+        Initialize an empty store.
+
+        Args:
+            window: Window length in the same time units as sample timestamps
+            resolution: Number of fine bins per axis of every pair's table
+            value_range: (low, high) range of satisfaction values
+            alpha: Exponent of the grid size limit B(n) = n^alpha
+        """
+        if window <= 0:
+            raise ValueError(f"Window must be positive, got {window}")
+        self.window = window
+        self.resolution = resolution
+        self.value_range = value_range
+        self.alpha = alpha
+        self._tables: Dict[Tuple[Hashable, Hashable], ContingencyTable] = {}
+        self._buffers: Dict[Tuple[Hashable, Hashable], Deque[Tuple[float, float, float]]] = {}
+        # Newest timestamp ever added per pair; survives expiry of the buffer
+        self._latest: Dict[Tuple[Hashable, Hashable], float] = {}
+        # Newest record timestamp add_records has scanned per pair
+        self._scanned: Dict[Tuple[Hashable, Hashable], float] = {}
+        # Incremented whenever a sample enters or leaves a window, so caches
+        # of derived values (e.g. overgoal scores) know when to invalidate
+        self.version = 0
+
+    def _key(self, goal1: Hashable, goal2: Hashable) -> Tuple[Optional[Tuple[Hashable, Hashable]], bool]:
+        """Return (stored key, swapped) for a pair, or (None, False) if untracked."""
+        if (goal1, goal2) in self._tables:
+            return (goal1, goal2), False
+        if (goal2, goal1) in self._tables:
+            return (goal2, goal1), True
+        return None, False
+
+    def _expire(self, key: Tuple[Hashable, Hashable], start: float) -> None:
+        """Subtract every sample of a pair with timestamp < start."""
+        buffer = self._buffers[key]
+        table = self._tables[key]
+        while buffer and buffer[0][0] < start:
+            _, x, y = buffer.popleft()
+            table.add(x, y, weight=-1)
+            self.version += 1
+
+    def add(self, goal1: Hashable, goal2: Hashable, x: float, y: float, timestamp: float) -> None:
+        """
+        Add one satisfaction sample of a goal pair and slide its window.
+
+        Args:
+            goal1: First goal
+            goal2: Second goal
+            x: Satisfaction of goal1
+            y: Satisfaction of goal2
+            timestamp: Time of the sample
+
+        Raises:
+            ValueError: If timestamp is older than the pair's newest sample
+
+        Educational Note:
+        Samples where x or y is not finite (missing readings) are skipped
+        before buffering, so they are never subtracted from the table later.
+        """
+        key = self._append(goal1, goal2, x, y, timestamp)
+        if key is not None:
+            self._expire(key, timestamp - self.window)
+
+    def _append(self, goal1: Hashable, goal2: Hashable, x: float, y: float,
+                timestamp: float) -> Optional[Tuple[Hashable, Hashable]]:
+        """Buffer and count one sample without expiring; its key, or None if skipped."""
+        if not (math.isfinite(x) and math.isfinite(y)):
+            return None
+        key, swapped = self._key(goal1, goal2)
+        if key is None:
+            key = (goal1, goal2)
+            self._tables[key] = ContingencyTable(self.resolution, self.value_range, self.alpha)
+            self._buffers[key] = deque()
+        if swapped:
+            x, y = y, x
+
+        buffer = self._buffers[key]
+        if buffer and timestamp < buffer[-1][0]:
+            raise ValueError(
+                f"Out-of-order sample for {key}: {timestamp} < {buffer[-1][0]}")
+
+        buffer.append((timestamp, x, y))
+        self._latest[key] = timestamp
+        self._tables[key].add(x, y)
+        self.version += 1
+        return key
+
+    def observe(self, values: Dict[Hashable, float], timestamp: float) -> None:
+        """
+        Add one reading of several goals taken at the same time.
+
+        Args:
+            values: Mapping of goal to satisfaction value
+            timestamp: Time of the reading
+
+        Educational Note:
+        Every pair of goals in the reading receives one sample, so a reading
+        of k goals updates k·(k-1)/2 tables.
+        """
+        for (goal1, x), (goal2, y) in combinations(values.items(), 2):
+            self.add(goal1, goal2, x, y, timestamp)
+
+    def add_records(self, goal1: Hashable, goal2: Hashable,
+                    records: Iterable[Tuple[Hashable, float, float]],
+                    start: float, end: float) -> int:
+        """
+        Add the pair samples found in per-goal records and slide the window.
+
+        Args:
+            goal1: First goal
+            goal2: Second goal
+            records: (goal, value, timestamp) records newest first, e.g. the
+                metric-record list of M3/core/metagoals.metta grown by Cons-ing
+                new records onto its head
+            start: Window start; older samples are expired
+            end: Window end; newer records are left for a later call
+
+        Returns:
+            Number of samples of the pair inside the window afterwards
+
+        Raises:
+            ValueError: If the records are not newest first
+
+        Educational Note:
+        A sample is a reading of goal1 and a reading of goal2 with the same
+        timestamp. The scan stops at the first record older than the window
+        start or than the newest record an earlier call scanned, so passing
+        the same growing record list on every evaluation reads each record
+        about once and adds each sample exactly once. The window comes from
+        the caller alone: samples are expired by start, never by the store's
+        own window length.
+        """
+        key, _ = self._key(goal1, goal2)
+        key = key if key is not None else (goal1, goal2)
+        scanned = self._scanned.get(key, float("-inf"))
+        latest = self._latest.get(key, float("-inf"))
+        newest = scanned
+        previous = float("inf")
+        first: Dict[float, float] = {}
+        second: Dict[float, float] = {}
+        for goal, value, timestamp in records:
+            if timestamp > previous:
+                raise ValueError(
+                    f"Records must be newest first: {timestamp} follows {previous}")
+            previous = timestamp
+            if timestamp < scanned or timestamp < start:
+                break
+            if timestamp > end:
+                continue
+            newest = max(newest, timestamp)
+            if timestamp <= latest:
+                continue
+            if goal == goal1:
+                first.setdefault(timestamp, value)
+            elif goal == goal2:
+                second.setdefault(timestamp, value)
+        self._scanned[key] = newest
+
+        for timestamp in sorted(first.keys() & second.keys()):
+            self._append(goal1, goal2, first[timestamp], second[timestamp], timestamp)
+
+        key, _ = self._key(goal1, goal2)
+        if key is None:
+            return 0
+        self._expire(key, start)
+        return len(self._buffers[key])
+
+    def get_correlation(self, goal1: Hashable, goal2: Hashable,
+                        start: Optional[float] = None) -> float:
+        """
+        Rolling MIC of a goal pair.
+
+        Args:
+            goal1: First goal
+            goal2: Second goal
+            start: Optional window start; samples older than it are expired first
+
+        Returns:
+            MIC of the samples inside the window; 0.0 for untracked pairs
+        """
+        key, _ = self._key(goal1, goal2)
+        if key is None:
+            return 0.0
+        if start is not None:
+            self._expire(key, start)
+        return self._tables[key].mic()
+
+    def get_data_count(self, goal1: Hashable, goal2: Hashable) -> int:
+        """
+        Number of samples of a goal pair currently inside the window.
+
+        Args:
+            goal1: First goal
+            goal2: Second goal
+
+        Returns:
+            Sample count; 0 for untracked pairs
+        """
+        key, _ = self._key(goal1, goal2)
+        return len(self._buffers[key]) if key is not None else 0
+
+    def pairs(self) -> List[Tuple[Hashable, Hashable]]:
+        """Goal pairs currently tracked, in insertion order."""
+        return list(self._tables)
@@ -14,10 +14,25 @@ clarity through proper class structure, docstrings, and error handling.
 ================================================================================
 """
 
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional, Sequence, Union
 from enum import Enum
 import math
 
+import numpy as np
+
+from measurability_estimator import estimate_measurability
+from online_measurability import RunningGoalStatistics
+
+
+# Readings processed per chunk when summarizing a store column; bounds the
+# memory touched at once when the column is memory-mapped from disk
+STATISTICS_CHUNK_ROWS = 1 << 20
+
+# Clarity of goals outside the static table until redundant measurements
+# estimate it (the estimator's own fallback): an observed goal's measurability
+# then follows its running confidence
+DEFAULT_CLARITY = 1.0
+
 
 class Goal(Enum):
     """Enumeration of the three MAGUS goals being analyzed."""
@@ -43,11 +58,27 @@ class MeasurabilityCalculator:
     - Metric_Clarity: How clearly defined and unambiguous is our measurement?
     """
 
-    def __init__(self):
-        """Initialize the measurability calculator with component data."""
+    def __init__(self, store: Optional[Any] = None):
+        """
+        Initialize the measurability calculator with component data.
+        
+        Args:
+            store: Optional satisfaction store (SatisfactionStore or
+                FileSatisfactionStore from M2/correlation) providing measured
+                satisfaction history; any object with goals, __len__ and
+                column(goal) works
+        """
+        self.store = store
         self._measurement_confidence = self._initialize_confidence_data()
         self._metric_clarity = self._initialize_clarity_data()
         self._expected_measurability = self._initialize_expected_values()
+        # Goals whose confidence and clarity were estimated from data
+        self._estimated_goals = set()
+        # Running statistics of goals fed one reading at a time via observe()
+        self._online: Dict[Union[Goal, str], RunningGoalStatistics] = {}
+        # Incremented on every data update so caches of derived values
+        # (e.g. overgoal scores) know when to invalidate
+        self.version = 0
 
     def _initialize_confidence_data(self) -> Dict[Goal, float]:
         """
@@ -104,6 +135,56 @@ class MeasurabilityCalculator:
             Goal.AFFINITY: 0.20     # 0.5 × 0.4
         }
 
+    def get_sample_statistics(self, goal: Goal) -> Dict[str, float]:
+        """
+        Summarize the stored satisfaction history of a goal.
+        
+        Args:
+            goal: The goal to summarize
+            
+        Returns:
+            Dictionary with "readings" (rows in the store), "observed" (non-missing
+            readings), "missing_ratio", "mean" and "variance" (population) of
+            the observed values
+            
+        Raises:
+            ValueError: If the calculator has no store
+            KeyError: If the store has no column for the goal
+            
+        Educational Note:
+        The column is read in chunks of STATISTICS_CHUNK_ROWS and the per-chunk
+        means and squared deviations are merged (Chan et al.), so a
+        memory-mapped history of millions of readings is paged in piece by
+        piece rather than loaded at once.
+        """
+        if self.store is None:
+            raise ValueError("No satisfaction store attached to this calculator")
+        column = self.store.column(goal)
+        readings = len(column)
+        observed = 0
+        mean = 0.0
+        squared_deviations = 0.0
+        for start in range(0, readings, STATISTICS_CHUNK_ROWS):
+            chunk = np.asarray(column[start:start + STATISTICS_CHUNK_ROWS], dtype=float)
+            chunk = chunk[~np.isnan(chunk)]
+            if chunk.size == 0:
+                continue
+            chunk_mean = float(chunk.mean())
+            chunk_deviations = float(((chunk - chunk_mean) ** 2).sum())
+            total = observed + chunk.size
+            delta = chunk_mean - mean
+            mean += delta * chunk.size / total
+            squared_deviations += chunk_deviations + delta * delta * observed * chunk.size / total
+            observed = total
+        
+        return {
+            "readings": readings,
+            "observed": observed,
+            "missing_ratio": 1.0 - observed / readings if readings else 1.0,
+            "mean": mean,
+            "variance": squared_deviations / observed if observed else 0.0
+        }
+
     def get_measurement_confidence(self, goal: Goal) -> float:
         """
         Get measurement confidence for a specific goal.
@@ -112,13 +193,27 @@ class MeasurabilityCalculator:
             goal: The goal to get confidence for
             
         Returns:
-            Confidence score (0.0 - 1.0)
+            Confidence score (0.0 - 1.0); the running confidence for goals
+            fed with observe(), the stored (static or estimated) value otherwise
             
         Raises:
-            KeyError: If the goal is not found in confidence data
-        """
+            KeyError: If the goal is neither in confidence data nor observed
+        """
+        goal = self._goal_or_name(goal)
+        online = self._online_confidence(goal)
+        if online is not None:
+            return online
+        if goal not in self._measurement_confidence and goal in self._online:
+            return 0.0
         return self._measurement_confidence[goal]
 
+    def _online_confidence(self, goal: Union[Goal, str]) -> Optional[float]:
+        """Running confidence of a goal fed with observe(), None before two readings."""
+        online = self._online.get(goal)
+        if online is not None and online.count >= 2:
+            return online.confidence()
+        return None
+
     def calculate_confidence(self, goal: Goal) -> float:
         """
         Calculate confidence based on goal characteristics.
@@ -130,10 +225,19 @@ class MeasurabilityCalculator:
             Calculated confidence score (0.0 - 1.0)
             
         Educational Note:
-        This function provides the foundation for future adaptive confidence calculation.
-        Currently it returns static values based on analysis of data source quality,
-        but could be extended to consider real-time data availability and noise levels.
-        """
+        Goals fed with observe() use the confidence of their running
+        statistics, and goals refreshed with refresh_estimates use the
+        confidence estimated from their observed noise, sample rate and missing
+        data. Other goals fall back to static values based on analysis of data
+        source quality. Every case is an O(1) lookup.
+        """
+        goal = self._goal_or_name(goal)
+        online = self._online_confidence(goal)
+        if online is not None:
+            return online
+        if goal in self._estimated_goals:
+            return self._measurement_confidence[goal]
+        
         confidence_mapping = {
             Goal.ENERGY: 0.8,      # High sample frequency, objective measurements, low noise
             Goal.EXPLORATION: 0.7,  # Regular sampling but some subjective interpretation needed
@@ -150,11 +254,15 @@ class MeasurabilityCalculator:
             goal: The goal to get clarity for
             
         Returns:
-            Clarity score (0.0 - 1.0)
+            Clarity score (0.0 - 1.0); DEFAULT_CLARITY for goals outside the
+            clarity data that were fed with observe()
             
         Raises:
-            KeyError: If the goal is not found in clarity data
+            KeyError: If the goal is neither in clarity data nor observed
         """
+        goal = self._goal_or_name(goal)
+        if goal not in self._metric_clarity and goal in self._online:
+            return DEFAULT_CLARITY
         return self._metric_clarity[goal]
 
     def calculate_clarity(self, goal: Goal) -> float:
@@ -168,17 +276,126 @@ class MeasurabilityCalculator:
             Calculated clarity score (0.0 - 1.0)
             
         Educational Note:
-        This function provides the foundation for future adaptive clarity calculation.
-        Currently it returns static values based on inherent goal characteristics,
-        but could be extended to consider measurement method sophistication.
+        Goals refreshed with redundant measurements use the clarity estimated
+        from how well those measurements agree. Other goals fall back to static
+        values based on inherent goal characteristics, and goals outside the
+        static table that were fed with observe() to DEFAULT_CLARITY.
         """
+        goal = self._goal_or_name(goal)
+        if goal in self._estimated_goals:
+            return self._metric_clarity[goal]
+        
         clarity_mapping = {
             Goal.ENERGY: 0.9,      # Clear thresholds, quantifiable measurements, minimal ambiguity
             Goal.EXPLORATION: 0.8,  # Some ambiguity in defining "new" vs "repeated" but generally quantifiable
             Goal.AFFINITY: 0.4      # Highly subjective, difficult boundaries, requires theory of mind
         }
         
-        return clarity_mapping.get(goal, 0.0)
+        return clarity_mapping.get(goal, DEFAULT_CLARITY if goal in self._online else 0.0)
+
+    def observe(self, goal: Union[Goal, str], value: float, timestamp: float) -> None:
+        """
+        Fold one satisfaction reading of a goal into its running statistics.
+        
+        Args:
+            goal: Goal (Goal member or name) the reading belongs to
+            value: Satisfaction reading
+            timestamp: Time of the reading; must not precede the goal's last reading
+            
+        Educational Note:
+        The update is O(1) and keeps a constant amount of state per goal, so
+        get_measurability stays an O(1) read however many readings arrive.
+        NaN and infinite readings are skipped and leave the statistics unchanged.
+        """
+        goal = self._goal_or_name(goal)
+        statistics = self._online.get(goal)
+        if statistics is None:
+            statistics = self._online[goal] = RunningGoalStatistics()
+        if statistics.update(value, timestamp):
+            self.version += 1
+
+    def get_running_statistics(self, goal: Union[Goal, str]) -> Dict[str, float]:
+        """
+        Running statistics of a goal fed with observe().
+        
+        Args:
+            goal: Goal (Goal member or name)
+            
+        Returns:
+            Dictionary with count, mean, variance, noise_variance, sample_rate,
+            gap_count, longest_gap, missing_ratio and confidence
+            
+        Raises:
+            KeyError: If no reading of the goal has been observed
+        """
+        return self._online[self._goal_or_name(goal)].summary()
+
+    def refresh_estimates(self, goals: Sequence[Union[Goal, str]], samples: np.ndarray,
+                          timestamps: np.ndarray,
+                          redundant: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Estimate confidence and clarity for a batch of goals from observed data.
+        
+        Args:
+            goals: Goals (Goal members or names), one per row of samples
+            samples: Array of shape (goals, samples) in time order; NaN marks
+                a missing reading
+            timestamps: Shared time of each sample, shape (samples,)
+            redundant: Optional (goals, sensors, samples) redundant measurements
+                used to estimate clarity
+            
+        Returns:
+            Dictionary of (goals,) arrays: "confidence", "clarity", "measurability"
+            
+        Educational Note:
+        All goals are estimated together by measurability_estimator, so a
+        refresh over thousands of goals costs a few vectorized NumPy passes.
+        Goals without a clarity estimate keep their current clarity.
+        """
+        keys = [self._goal_or_name(goal) for goal in goals]
+        # Static table for the MAGUS goals, DEFAULT_CLARITY for goals without any clarity yet
+        current_clarity = np.array([
+            self.calculate_clarity(key) if isinstance(key, Goal) or key in self._estimated_goals
+            else DEFAULT_CLARITY for key in keys])
+        estimates = estimate_measurability(samples, timestamps, redundant,
+                                           default_clarity=current_clarity)
+        for key, confidence, clarity in zip(keys, estimates["confidence"], estimates["clarity"]):
+            self._measurement_confidence[key] = float(confidence)
+            self._metric_clarity[key] = float(clarity)
+            self._estimated_goals.add(key)
+        self.version += 1
+        return estimates
+
+    def refresh_from_store(self, redundant: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Run refresh_estimates over every goal of the attached store.
+        
+        Args:
+            redundant: Optional (goals, sensors, samples) redundant measurements,
+                in the store's goal order
+            
+        Returns:
+            Dictionary of (goals,) arrays: "confidence", "clarity", "measurability"
+            
+        Raises:
+            ValueError: If the calculator has no store
+        """
+        if self.store is None:
+            raise ValueError("No satisfaction store attached to this calculator")
+        goals = self.store.goals
+        samples = np.vstack([self.store.column(goal) for goal in goals]) if goals else np.empty((0, 0))
+        return self.refresh_estimates(goals, samples, np.asarray(self.store.timestamps), redundant)
+
+    @staticmethod
+    def _goal_or_name(goal: Union[Goal, str]) -> Union[Goal, str]:
+        """Goal member matching a goal or goal name, or the name itself if none does."""
+        if isinstance(goal, Goal):
+            return goal
+        name = goal.value if isinstance(goal, Enum) else goal
+        try:
+            return Goal(name)
+        except ValueError:
+            return name
 
     def calculate_measurability(self, goal: Goal) -> float:
         """
@@ -202,7 +419,7 @@ class MeasurabilityCalculator:
 
     def get_measurability_components(self, goal: Goal) -> Tuple[Goal, float, float, float]:
         """
-        Get stored measurability components for a goal.
+        Get measurability components for a goal.
         
         Args:
             goal: The goal to get components for
@@ -213,7 +430,9 @@ class MeasurabilityCalculator:
         Educational Note:
         This function provides a detailed breakdown showing how the measurability
         score was calculated from its component parts, useful for debugging and
-        understanding which factor is limiting measurement quality.
+        understanding which factor is limiting measurement quality. Confidence
+        comes from the same online-aware path as get_measurability, so the
+        breakdown always multiplies out to the reported score.
         """
         confidence = self.get_measurement_confidence(goal)
         clarity = self.get_metric_clarity(goal)
@@ -305,6 +524,48 @@ class MeasurabilityCalculator:
 
         return base_correlation * geometric_mean
 
+    def measurability_vector(self, goals: Sequence[Union[Goal, str]]) -> np.ndarray:
+        """
+        Measurability of several goals as an array.
+        
+        Args:
+            goals: Goals (Goal members or names)
+            
+        Returns:
+            Array of shape (len(goals),) with each goal's measurability
+        """
+        return np.array([self.get_measurability(goal) for goal in goals], dtype=float)
+
+    def weighted_correlation_matrix(self, corr_matrix: np.ndarray,
+                                    goals: Sequence[Union[Goal, str]]) -> np.ndarray:
+        """
+        Weight a whole N×N correlation matrix by measurability.
+        
+        Args:
+            corr_matrix: Array of shape (N, N), e.g. from
+                CorrelationCalculator.correlation_matrix
+            goals: Goals (Goal members or names) labelling the rows and columns
+            
+        Returns:
+            Array of shape (N, N) where entry [i, j] is
+            corr_matrix[i, j] × sqrt(m_i × m_j)
+            
+        Raises:
+            ValueError: If corr_matrix is not N×N for N = len(goals)
+            
+        Educational Note:
+        sqrt(m_i × m_j) = sqrt(m_i) × sqrt(m_j), so the weights of every pair
+        form the outer product of the vector of sqrt(measurability). The whole
+        matrix is weighted in one broadcasted multiplication, with the same
+        result as get_weighted_correlation applied to each pair.
+        """
+        corr_matrix = np.asarray(corr_matrix, dtype=float)
+        n = len(goals)
+        if corr_matrix.shape != (n, n):
+            raise ValueError(f"Expected a ({n}, {n}) correlation matrix, got {corr_matrix.shape}")
+        roots = np.sqrt(self.measurability_vector(goals))
+        return corr_matrix * np.outer(roots, roots)
+
     def calculate_measurability_weighted_score(self, ee_corr: float, ea_corr: float, ex_corr: float) -> float:
         """
         Calculate overall measurability-weighted score from correlation values.
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+MAGUS Measurability Estimator - Data-Driven Confidence × Clarity
+================================================================================
+Estimates the two measurability components from observed satisfaction data
+instead of fixed tables, for any number of goals at once:
+
+- Confidence_in_Measurement from sensor noise, sample rate and missing data
+- Metric_Clarity from how well redundant measurements of a goal agree
+
+Every function takes a (goals, samples) array, or (goals, sensors, samples) for
+redundant measurements, with NaN marking missing readings, and reduces along
+the sample axis with NumPy, so a refresh over thousands of goals is a handful
+of array operations rather than a Python loop per goal.
+================================================================================
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+
+# Noise standard deviation at which confidence reaches 0; satisfaction lives
+# in [0, 1], so 0.5 is the largest spread a reading can have
+DEFAULT_MAX_NOISE_STD = 0.5
+
+# Readings per time unit at which the sample rate no longer limits confidence
+DEFAULT_TARGET_RATE = 1.0
+
+
+def missing_ratios(samples: np.ndarray) -> np.ndarray:
+    """
+    Fraction of missing readings per goal.
+
+    Args:
+        samples: Array of shape (goals, samples); NaN marks a missing reading
+
+    Returns:
+        Array of shape (goals,) with values in [0.0, 1.0]
+    """
+    samples = np.asarray(samples, dtype=float)
+    if samples.shape[1] == 0:
+        return np.ones(samples.shape[0])
+    return np.isnan(samples).mean(axis=1)
+
+
+def noise_variances(samples: np.ndarray) -> np.ndarray:
+    """
+    Sensor noise variance per goal from successive differences.
+
+    Args:
+        samples: Array of shape (goals, samples) in time order
+
+    Returns:
+        Array of shape (goals,); NaN for goals with fewer than two readings
+
+    Educational Note:
+    Half the mean squared difference between consecutive readings (the von
+    Neumann estimator) measures reading-to-reading jitter. Unlike the plain
+    variance it is barely affected by the goal's satisfaction drifting
+    slowly over time, which is real signal rather than noise. Missing
+    readings are skipped: each reading is compared with the last observed
+    one, found for all goals at once with a running maximum of indices.
+    """
+    samples = np.asarray(samples, dtype=float)
+    goals, count = samples.shape
+    if count < 2:
+        return np.full(goals, np.nan)
+
+    observed = ~np.isnan(samples)
+    last_index = np.maximum.accumulate(np.where(observed, np.arange(count), -1), axis=1)
+    previous = np.take_along_axis(samples, np.maximum(last_index[:, :-1], 0), axis=1)
+    pairs = observed[:, 1:] & (last_index[:, :-1] >= 0)
+    differences = np.where(pairs, samples[:, 1:] - previous, 0.0)
+    pair_counts = pairs.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(pair_counts > 0, (differences ** 2).sum(axis=1) / pair_counts / 2, np.nan)
+
+
+def sample_rates(samples: np.ndarray, timestamps: np.ndarray) -> np.ndarray:
+    """
+    Observed readings per time unit for every goal.
+
+    Args:
+        samples: Array of shape (goals, samples)
+        timestamps: Shared time of each sample, shape (samples,)
+
+    Returns:
+        Array of shape (goals,); 0.0 when the readings span no time
+    """
+    samples = np.asarray(samples, dtype=float)
+    timestamps = np.asarray(timestamps, dtype=float)
+    span = float(timestamps[-1] - timestamps[0]) if timestamps.size else 0.0
+    if span <= 0:
+        return np.zeros(samples.shape[0])
+    return (~np.isnan(samples)).sum(axis=1) / span
+
+
+def estimate_confidence(samples: np.ndarray, timestamps: np.ndarray,
+                        max_noise_std: float = DEFAULT_MAX_NOISE_STD,
+                        target_rate: float = DEFAULT_TARGET_RATE) -> np.ndarray:
+    """
+    Confidence in measurement for every goal.
+
+    Args:
+        samples: Array of shape (goals, samples) in time order
+        timestamps: Shared time of each sample, shape (samples,)
+        max_noise_std: Noise standard deviation at which confidence is 0
+        target_rate: Readings per time unit needed for full confidence
+
+    Returns:
+        Array of shape (goals,) with values in [0.0, 1.0]
+
+    Educational Note:
+    Confidence is the product of three factors in [0, 1]: how far the noise
+    is below max_noise_std, how close the sample rate comes to target_rate,
+    and the share of readings that are present. Like measurability itself,
+    a deficiency in any one of them is enough to make the goal hard to trust.
+    """
+    noise = np.nan_to_num(np.sqrt(noise_variances(samples)), nan=max_noise_std)
+    noise_factor = np.clip(1.0 - noise / max_noise_std, 0.0, 1.0)
+    rate_factor = np.minimum(sample_rates(samples, timestamps) / target_rate, 1.0)
+    return noise_factor * rate_factor * (1.0 - missing_ratios(samples))
+
+
+def estimate_clarity(redundant: np.ndarray) -> np.ndarray:
+    """
+    Metric clarity for every goal from redundant measurements.
+
+    Args:
+        redundant: Array of shape (goals, sensors, samples) holding several
+            independent measurements of each goal taken at the same times
+
+    Returns:
+        Array of shape (goals,) with values in [0.0, 1.0]; NaN for goals with
+        fewer than two sensors reporting at any sample
+
+    Educational Note:
+    Clarity is the share of the total variance that the sensors agree on:
+    1 - (mean variance across sensors at each sample) / (variance of all
+    readings). A clear metric varies with the goal's state while every
+    sensor reports the same value; an ambiguous one gives different answers
+    depending on which sensor is asked.
+    """
+    redundant = np.asarray(redundant, dtype=float)
+    observed = ~np.isnan(redundant)
+    values = np.where(observed, redundant, 0.0)
+
+    # Per-sample sums over sensors; variances follow from sum and sum of squares
+    sensors = observed.sum(axis=1)
+    sums = values.sum(axis=1)
+    np.square(values, out=values)
+    squares = values.sum(axis=1)
+
+    # Mean spread across sensors, over samples where two or more report
+    comparable = sensors >= 2
+    comparable_samples = comparable.sum(axis=1)
+    sample_variances = (squares - sums ** 2 / np.maximum(sensors, 1)) / np.maximum(sensors - 1, 1)
+    within = (np.where(comparable, sample_variances, 0.0).sum(axis=1)
+              / np.maximum(comparable_samples, 1))
+
+    # Variance of every reading of the goal, across sensors and samples
+    readings = sensors.sum(axis=1)
+    total = ((squares.sum(axis=1) - sums.sum(axis=1) ** 2 / np.maximum(readings, 1))
+             / np.maximum(readings - 1, 1))
+
+    clarity = np.where(total > 0, 1.0 - within / np.where(total > 0, total, 1.0),
+                       np.where(within <= 0, 1.0, 0.0))
+    return np.where(comparable_samples > 0, np.clip(clarity, 0.0, 1.0), np.nan)
+
+
+def estimate_measurability(samples: np.ndarray, timestamps: np.ndarray,
+                           redundant: Optional[np.ndarray] = None,
+                           default_clarity: Optional[np.ndarray] = None,
+                           max_noise_std: float = DEFAULT_MAX_NOISE_STD,
+                           target_rate: float = DEFAULT_TARGET_RATE) -> Dict[str, np.ndarray]:
+    """
+    Estimate confidence, clarity and measurability for a batch of goals.
+
+    Args:
+        samples: Array of shape (goals, samples) in time order
+        timestamps: Shared time of each sample, shape (samples,)
+        redundant: Optional (goals, sensors, samples) redundant measurements
+        default_clarity: Optional (goals,) clarity used where it cannot be
+            estimated (default: 1.0, i.e. measurability equals confidence)
+        max_noise_std: Noise standard deviation at which confidence is 0
+        target_rate: Readings per time unit needed for full confidence
+
+    Returns:
+        Dictionary of (goals,) arrays: "confidence", "clarity", "measurability"
+
+    Raises:
+        ValueError: If the array shapes do not agree
+    """
+    samples = np.asarray(samples, dtype=float)
+    if samples.ndim != 2 or np.shape(timestamps) != (samples.shape[1],):
+        raise ValueError(
+            f"Expected samples of shape (goals, {np.shape(timestamps)[0]}), got {samples.shape}")
+    goals = samples.shape[0]
+
+    fallback = (np.ones(goals) if default_clarity is None
+                else np.asarray(default_clarity, dtype=float))
+    if redundant is None:
+        clarity = fallback
+    else:
+        if np.shape(redundant)[0] != goals:
+            raise ValueError(
+                f"Expected redundant measurements for {goals} goals, got {np.shape(redundant)[0]}")
+        estimated = estimate_clarity(redundant)
+        clarity = np.where(np.isnan(estimated), fallback, estimated)
+
+    confidence = estimate_confidence(samples, timestamps, max_noise_std, target_rate)
+    return {
+        "confidence": confidence,
+        "clarity": clarity,
+        "measurability": confidence * clarity
+    }
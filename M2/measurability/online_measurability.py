@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+MAGUS Online Measurability - Constant-Memory Running Statistics per Goal
+================================================================================
+Keeps the statistics behind data-driven measurability up to date one reading at
+a time, so metagoals can ask for a goal's measurability on every decision
+without rescanning its history:
+
+- mean and variance of the readings (Welford's algorithm)
+- sensor noise from successive differences (as in measurability_estimator)
+- sample rate and gaps between readings
+
+Each update and each confidence read is O(1) and the state per goal is a
+fixed handful of numbers.
+================================================================================
+"""
+
+from typing import Dict, Optional
+import math
+
+from measurability_estimator import DEFAULT_MAX_NOISE_STD, DEFAULT_TARGET_RATE
+
+
+# An interval longer than this many expected intervals (the goal's typical
+# interval between readings) counts as a gap in the readings
+GAP_FACTOR = 2.0
+
+
+class RunningGoalStatistics:
+    """
+    Running statistics of one goal's satisfaction readings.
+
+    Educational Note:
+    Welford's update folds each reading into the mean and the sum of squared
+    deviations without storing past readings and without the cancellation
+    problems of accumulating sum and sum of squares. The confidence derived
+    from these statistics uses the same factors as the batch estimator:
+    noise, sample rate and missing data (here, the readings a gap skipped,
+    counted in the goal's own expected interval, so a sparse but regular
+    stream has nothing missing and is only penalized by its sample rate).
+    """
+
+    def __init__(self, target_rate: float = DEFAULT_TARGET_RATE,
+                 max_noise_std: float = DEFAULT_MAX_NOISE_STD,
+                 gap_factor: float = GAP_FACTOR):
+        """
+        Initialize with no readings.
+
+        Args:
+            target_rate: Readings per time unit needed for full confidence
+            max_noise_std: Noise standard deviation at which confidence is 0
+            gap_factor: Intervals longer than gap_factor expected intervals are gaps
+        """
+        self.target_rate = target_rate
+        self.max_noise_std = max_noise_std
+        self.gap_factor = gap_factor
+        self.count = 0
+        self.mean = 0.0
+        self._squared_deviations = 0.0
+        self._squared_differences = 0.0
+        self.first_timestamp: Optional[float] = None
+        self.last_timestamp: Optional[float] = None
+        self._last_value = 0.0
+        # Running mean of the intervals that were not gaps
+        self.expected_interval = 0.0
+        self._regular_intervals = 0
+        self.missing_count = 0
+        self.gap_count = 0
+        self.gap_time = 0.0
+        self.longest_gap = 0.0
+
+    def update(self, value: float, timestamp: float) -> bool:
+        """
+        Fold one reading into the statistics in O(1).
+
+        Args:
+            value: Satisfaction reading; NaN and infinite readings are skipped
+            timestamp: Time of the reading
+
+        Returns:
+            True if the reading was counted, False if it was skipped
+
+        Raises:
+            ValueError: If timestamp is older than the previous reading
+        """
+        if not math.isfinite(value):
+            return False
+        if self.count:
+            interval = timestamp - self.last_timestamp
+            if interval < 0:
+                raise ValueError(
+                    f"Out-of-order reading: {timestamp} < {self.last_timestamp}")
+            if self._regular_intervals and interval > self.gap_factor * self.expected_interval:
+                self.gap_count += 1
+                self.gap_time += interval
+                self.longest_gap = max(self.longest_gap, interval)
+                self.missing_count += round(interval / self.expected_interval) - 1
+            elif interval > 0:
+                self._regular_intervals += 1
+                self.expected_interval += (interval - self.expected_interval) / self._regular_intervals
+            difference = value - self._last_value
+            self._squared_differences += difference * difference
+        else:
+            self.first_timestamp = timestamp
+
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._squared_deviations += delta * (value - self.mean)
+        self.last_timestamp = timestamp
+        self._last_value = value
+        return True
+
+    @property
+    def variance(self) -> float:
+        """Population variance of the readings so far."""
+        return self._squared_deviations / self.count if self.count else 0.0
+
+    @property
+    def noise_variance(self) -> float:
+        """Noise variance from successive differences; NaN before two readings."""
+        if self.count < 2:
+            return math.nan
+        return self._squared_differences / (self.count - 1) / 2
+
+    @property
+    def span(self) -> float:
+        """Time between the first and the latest reading."""
+        return self.last_timestamp - self.first_timestamp if self.count else 0.0
+
+    @property
+    def sample_rate(self) -> float:
+        """Readings per time unit; 0.0 while the readings span no time."""
+        span = self.span
+        return self.count / span if span > 0 else 0.0
+
+    @property
+    def missing_ratio(self) -> float:
+        """Fraction of expected readings that gaps skipped; 1.0 with no readings."""
+        expected = self.count + self.missing_count
+        return self.missing_count / expected if expected else 1.0
+
+    def confidence(self) -> float:
+        """
+        Confidence in measurement from the running statistics.
+
+        Returns:
+            Noise factor × sample-rate factor × (1 - missing ratio), in [0.0, 1.0];
+            0.0 before two readings
+        """
+        if self.count < 2:
+            return 0.0
+        noise_factor = min(max(1.0 - math.sqrt(self.noise_variance) / self.max_noise_std, 0.0), 1.0)
+        rate_factor = min(self.sample_rate / self.target_rate, 1.0)
+        return noise_factor * rate_factor * (1.0 - self.missing_ratio)
+
+    def summary(self) -> Dict[str, float]:
+        """All running statistics as a dictionary."""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "variance": self.variance,
+            "noise_variance": self.noise_variance,
+            "sample_rate": self.sample_rate,
+            "gap_count": self.gap_count,
+            "longest_gap": self.longest_gap,
+            "missing_ratio": self.missing_ratio,
+            "confidence": self.confidence()
+        }
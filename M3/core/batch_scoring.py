@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+MAGUS Batch Scoring - Vectorized score-decision-v2 over Candidate Arrays
+================================================================================
+Python counterpart of score-all-v2 (M4/ethical/scenario-runner.metta) and
+score-all-candidates (scoring-v2.metta), registered with MeTTa by
+core/magus_init.py.
+
+Candidates are described by parallel arrays (priority, weight, goal id, action
+id) instead of Cons lists of expressions. Every rule of the MeTTa pipeline that
+depends only on a goal's name is evaluated once per distinct goal into a small
+table, and candidates pick their values out of those tables with one gather,
+so thousands of candidates are scored in a few NumPy passes:
+
+    base     = (considerations - discouragements) × modulator multiplier
+    metagoal = Σ metagoal contributions            (goal candidates only)
+    overgoal = 0.3 × overgoal score in the context (goal candidates only)
+    final    = (base + metagoal + overgoal) × anti-goal factor
+
+The result carries the same fields as decision-score for explainability, and
+top_k_indices picks the best candidates out of it without a full sort.
+
+The rule tables below are copies of the MeTTa rules named above them;
+tests/test_batch_scoring.py reads the rules back from the .metta files and
+fails if a table and its rule disagree.
+================================================================================
+"""
+
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+import heapq
+
+import numpy as np
+
+from modulator_table import modulator_multiplier
+from overgoal_engine import OvergoalEngine
+
+
+# Candidates with this id are not goals (goal_id) or not actions (action_id)
+NO_ID = -1
+
+# Considerations and discouragements of scenario-runner.metta:
+# goal-alignment-score, ethical-value-score and ethical-risk-score
+GOAL_ALIGNMENT_PER_PRIORITY = 50.0
+GOAL_ETHICAL_VALUE_PER_WEIGHT = 30.0
+GOAL_ETHICAL_RISK = 5.0
+ACTION_ALIGNMENT = 25.0
+ACTION_ETHICAL_VALUE = 20.0
+ACTION_ETHICAL_RISK = 10.0
+
+# Weight of each metagoal in single-metagoal-score
+METAGOAL_WEIGHTS = {
+    "coherence": 0.1,
+    "efficiency": -0.05,
+    "learning": 0.15,
+    "uncertainty-reduction": 0.1,
+}
+
+# check-goal-synergy: (goal, other) pairs that count as coherent
+GOAL_SYNERGIES = frozenset({
+    ("explore", "discover"), ("discover", "learn"), ("survive", "defend"),
+    ("attack", "dominate"), ("build", "create"), ("gather", "prepare"),
+})
+
+# estimate-goal-cost: cost per unit of weight
+GOAL_COST_FACTORS = {"explore": 1.5, "attack": 2.5, "defend": 2.0, "gather": 1.2,
+                     "build": 3.0, "learn": 0.8, "survive": 0.5}
+DEFAULT_COST_FACTOR = 1.0
+
+# calculate-novelty
+GOAL_NOVELTY = {"explore": 0.8, "discover": 0.9, "learn": 0.7, "experiment": 1.0, "build": 0.5}
+DEFAULT_NOVELTY = 0.2
+
+# estimate-info-gain: information gain per unit of priority
+GOAL_INFO_GAIN = {"explore": 0.6, "scout": 0.7, "investigate": 0.8, "analyze": 0.9, "test": 0.5}
+DEFAULT_INFO_GAIN = 0.3
+
+# calculate-overgoal-adjustment: bonus per unit of overgoal score
+OVERGOAL_BONUS = 0.3
+
+# Fields of decision-score, in order
+DECISION_SCORE_FIELDS = ("base", "metagoal", "overgoal", "antigoal", "final")
+
+
+def metagoal_table(goal_names: Sequence[Hashable], context_goals: Sequence[Hashable],
+                   metagoals: Sequence[str]) -> np.ndarray:
+    """
+    Metagoal contributions per distinct goal name.
+
+    Args:
+        goal_names: Goal vocabulary; entry i belongs to goal id i
+        context_goals: Goal names of the scoring context
+        metagoals: Active metagoal names
+
+    Returns:
+        Array of shape (4, len(goal_names)): the coherence term, and the
+        per-weight efficiency, constant learning and per-priority
+        uncertainty-reduction terms, already multiplied by their metagoal
+        weight (0.0 for inactive metagoals)
+    """
+    active = {name: METAGOAL_WEIGHTS[name] for name in metagoals if name in METAGOAL_WEIGHTS}
+    table = np.zeros((4, len(goal_names)))
+    for i, name in enumerate(goal_names):
+        if "coherence" in active:
+            coherent = sum((name, other) in GOAL_SYNERGIES for other in context_goals)
+            table[0, i] = active["coherence"] * coherent
+        table[1, i] = active.get("efficiency", 0.0) * GOAL_COST_FACTORS.get(name, DEFAULT_COST_FACTOR)
+        table[2, i] = active.get("learning", 0.0) * GOAL_NOVELTY.get(name, DEFAULT_NOVELTY)
+        table[3, i] = (active.get("uncertainty-reduction", 0.0)
+                       * GOAL_INFO_GAIN.get(name, DEFAULT_INFO_GAIN))
+    return table
+
+
+def batch_score(priority: np.ndarray, weight: np.ndarray, goal_id: np.ndarray,
+                action_id: np.ndarray, goal_names: Sequence[Hashable],
+                context_goals: Sequence[Hashable] = (),
+                metagoals: Sequence[str] = (),
+                modulators: Sequence[Tuple[str, float]] = (),
+                overgoal_engine: Optional[OvergoalEngine] = None,
+                goal_antigoal_factors: Optional[np.ndarray] = None,
+                action_antigoal_factors: Optional[np.ndarray] = None,
+                antigoal_factors: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """
+    Score a batch of candidates like score-decision-v2.
+
+    Args:
+        priority: Goal priority per candidate (ignored for actions)
+        weight: Goal weight per candidate (ignored for actions)
+        goal_id: Index into goal_names, or NO_ID for action candidates
+        action_id: Action index, or NO_ID for goal candidates
+        goal_names: Goal vocabulary for goal_id
+        context_goals: Goal names of the scoring context (coherence, overgoal)
+        metagoals: Active metagoal names
+        modulators: (name, value) modulators of the scoring context
+        overgoal_engine: Engine for the overgoal bonus (no bonus if None)
+        goal_antigoal_factors: Optional anti-goal factor per goal id
+        action_antigoal_factors: Optional anti-goal factor per action id
+        antigoal_factors: Optional anti-goal factor per candidate, multiplied
+            with the per-id factors
+
+    Returns:
+        Dictionary of (candidates,) arrays keyed by DECISION_SCORE_FIELDS;
+        "antigoal" is the penalty 1 - factor, as in decision-score
+
+    Raises:
+        ValueError: If the candidate arrays differ in length
+    """
+    priority = np.asarray(priority, dtype=float)
+    weight = np.asarray(weight, dtype=float)
+    goal_id = np.asarray(goal_id, dtype=np.intp)
+    action_id = np.asarray(action_id, dtype=np.intp)
+    n = len(goal_id)
+    if not priority.shape == weight.shape == goal_id.shape == action_id.shape == (n,):
+        raise ValueError("Candidate arrays must all have the same length")
+
+    is_goal = goal_id != NO_ID
+    goal_rows = np.where(is_goal, goal_id, 0)
+
+    # Base utility: considerations minus discouragements, then modulators
+    base = np.where(is_goal,
+                    GOAL_ALIGNMENT_PER_PRIORITY * priority
+                    + GOAL_ETHICAL_VALUE_PER_WEIGHT * weight - GOAL_ETHICAL_RISK,
+                    ACTION_ALIGNMENT + ACTION_ETHICAL_VALUE - ACTION_ETHICAL_RISK)
+    base *= modulator_multiplier(modulators)
+
+    # Metagoal and overgoal terms only apply to goal candidates
+    metagoal = np.zeros(n)
+    overgoal = np.zeros(n)
+    if len(goal_names) and is_goal.any():
+        terms = metagoal_table(goal_names, context_goals, metagoals)[:, goal_rows]
+        metagoal = np.where(is_goal, terms[0] + terms[1] * weight + terms[2]
+                            + terms[3] * priority, 0.0)
+        if overgoal_engine is not None:
+            bonus = OVERGOAL_BONUS * overgoal_engine.target_scores(goal_names, context_goals)
+            overgoal = np.where(is_goal, bonus[goal_rows], 0.0)
+
+    factor = np.ones(n)
+    if goal_antigoal_factors is not None:
+        factor = np.where(is_goal, np.asarray(goal_antigoal_factors, dtype=float)[goal_rows], factor)
+    if action_antigoal_factors is not None:
+        is_action = action_id != NO_ID
+        table = np.asarray(action_antigoal_factors, dtype=float)
+        factor = np.where(is_action, factor * table[np.where(is_action, action_id, 0)], factor)
+    if antigoal_factors is not None:
+        factor = factor * np.asarray(antigoal_factors, dtype=float)
+
+    return {
+        "base": base,
+        "metagoal": metagoal,
+        "overgoal": overgoal,
+        "antigoal": 1.0 - factor,
+        "final": (base + metagoal + overgoal) * factor,
+    }
+
+
+def encode_candidates(candidates: Sequence[Tuple]) -> Tuple[Dict[str, np.ndarray],
+                                                            Tuple[Hashable, ...],
+                                                            Tuple[Hashable, ...]]:
+    """
+    Encode candidates as the parallel arrays taken by batch_score.
+
+    Args:
+        candidates: ("goal", name, priority, weight) or ("action", action)
+            tuples
+
+    Returns:
+        (arrays, goal_names, actions): priority, weight, goal_id and
+        action_id arrays, and the goal and action vocabularies they index
+    """
+    goal_index: Dict[Hashable, int] = {}
+    action_index: Dict[Hashable, int] = {}
+    n = len(candidates)
+    arrays = {"priority": np.zeros(n), "weight": np.zeros(n),
+              "goal_id": np.full(n, NO_ID, dtype=np.intp),
+              "action_id": np.full(n, NO_ID, dtype=np.intp)}
+    for i, candidate in enumerate(candidates):
+        if candidate[0] == "goal":
+            _, name, priority, weight = candidate
+            arrays["goal_id"][i] = goal_index.setdefault(name, len(goal_index))
+            arrays["priority"][i] = priority
+            arrays["weight"][i] = weight
+        else:
+            arrays["action_id"][i] = action_index.setdefault(candidate[1], len(action_index))
+    return arrays, tuple(goal_index), tuple(action_index)
+
+
+def score_candidates(candidates: Sequence[Tuple], **context) -> Dict[str, np.ndarray]:
+    """
+    Encode and score candidates in one call.
+
+    Args:
+        candidates: Candidate tuples as accepted by encode_candidates
+        **context: Keyword arguments of batch_score after goal_names
+
+    Returns:
+        Dictionary of (candidates,) arrays keyed by DECISION_SCORE_FIELDS
+    """
+    arrays, goal_names, _ = encode_candidates(candidates)
+    return batch_score(goal_names=goal_names, **arrays, **context)
+
+
+def top_k_indices(final: Sequence[float], k: int) -> List[int]:
+    """
+    Indices of the k highest final scores, best first.
+
+    Args:
+        final: Final score per candidate
+        k: Number of candidates to keep; all of them if k exceeds the count
+
+    Returns:
+        Up to k indices in descending order of score; among equal scores the
+        later candidate comes first, as in insert-by-score and
+        select-best-candidate
+
+    Educational Note:
+    heapq.nlargest keeps a heap of the k best candidates seen so far, so
+    selecting from n candidates costs O(n log k) instead of the O(n²) of the
+    recursive insertion sort, and only the k winners are ever ordered.
+    """
+    if k <= 0:
+        return []
+    return heapq.nlargest(k, range(len(final)), key=lambda i: (final[i], i))
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+MAGUS Modulator Table - Compiled Modulator Effects Fused per Scoring Context
+================================================================================
+Python counterpart of &modulator-kb and apply-modulators in scoring-v2.metta,
+registered with MeTTa by core/magus_init.py.
+
+Bach's six modulators are compiled into two arrays indexed by modulator id,
+    effect(id, value) = base[id] + multiplier[id] × value,
+so a context's modulator list reduces to one product of gathered effects. The
+fused multiplier is memoized per modulator list: every candidate scored in the
+same scoring-context reuses it with a single dictionary lookup instead of a
+match against the knowledge base for each modulator of each candidate.
+================================================================================
+"""
+
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, Mapping, Sequence, Tuple
+
+import numpy as np
+
+
+# modulator-params of &modulator-kb in scoring-v2.metta: (base, multiplier);
+# tests/test_modulator_table.py checks the two stay equal
+MODULATOR_PARAMS = {
+    "arousal": (0.8, 0.4),        # 0.8 to 1.2
+    "pleasure": (0.9, 0.2),       # 0.9 to 1.1
+    "dominance": (0.85, 0.3),     # 0.85 to 1.15
+    "focus": (0.7, 0.6),          # 0.7 to 1.3
+    "resolution": (0.75, 0.5),    # 0.75 to 1.25
+    "exteroception": (0.8, 0.4),  # 0.8 to 1.2
+}
+
+# Number of distinct modulator lists whose fused multiplier is kept
+DEFAULT_CONTEXT_CACHE_SIZE = 256
+
+
+class ModulatorTable:
+    """
+    Modulator parameters compiled into arrays indexed by modulator id.
+
+    Educational Note:
+    Unknown modulators get the extra last id, whose base is 1.0 and
+    multiplier 0.0, so they have the effect 1.0 without any branching, just
+    as modulator-effect defaults to 1.0 for names missing from the kb.
+    """
+
+    def __init__(self, params: Mapping[Hashable, Tuple[float, float]] = MODULATOR_PARAMS,
+                 cache_size: int = DEFAULT_CONTEXT_CACHE_SIZE):
+        """
+        Compile a parameter table.
+
+        Args:
+            params: Mapping of modulator name to (base, multiplier)
+            cache_size: Number of fused context multipliers to memoize
+        """
+        self.names: Tuple[Hashable, ...] = tuple(params)
+        self.ids: Dict[Hashable, int] = {name: i for i, name in enumerate(self.names)}
+        self.unknown_id = len(self.names)
+        self.base = np.array([params[name][0] for name in self.names] + [1.0])
+        self.multiplier = np.array([params[name][1] for name in self.names] + [0.0])
+        self.cache_size = cache_size
+        self._fused: "OrderedDict[Tuple, float]" = OrderedDict()
+
+    def modulator_id(self, name: Hashable) -> int:
+        """Id of a modulator; unknown names map to unknown_id."""
+        return self.ids.get(name, self.unknown_id)
+
+    def effects(self, ids: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """
+        Effect of every (id, value) pair at once.
+
+        Args:
+            ids: Modulator ids
+            values: Modulator values, same shape as ids
+
+        Returns:
+            Array of base + multiplier × value, same shape as ids
+        """
+        ids = np.asarray(ids, dtype=np.intp)
+        return self.base[ids] + self.multiplier[ids] * np.asarray(values, dtype=float)
+
+    def effect(self, name: Hashable, value: float) -> float:
+        """Effect of one modulator (modulator-effect)."""
+        i = self.modulator_id(name)
+        return float(self.base[i] + self.multiplier[i] * value)
+
+    def fused_multiplier(self, modulators: Iterable[Tuple[Hashable, float]]) -> float:
+        """
+        One multiplier for all modulators of a scoring context.
+
+        Args:
+            modulators: (name, value) pairs of the context
+
+        Returns:
+            Product of every modulator's effect (1.0 for no modulators);
+            apply-modulators(score, modulators) equals score × this value
+
+        Educational Note:
+        Results are memoized by the modulator list with LRU eviction, so
+        only the first candidate of a context pays for the computation.
+        """
+        key = tuple(modulators)
+        fused = self._fused.get(key)
+        if fused is not None:
+            self._fused.move_to_end(key)
+            return fused
+        ids = [self.modulator_id(name) for name, _ in key]
+        fused = float(np.prod(self.effects(ids, [value for _, value in key])))
+        self._fused[key] = fused
+        if len(self._fused) > self.cache_size:
+            self._fused.popitem(last=False)
+        return fused
+
+
+# Shared table over the parameters of scoring-v2.metta
+DEFAULT_MODULATOR_TABLE = ModulatorTable()
+
+
+def modulator_multiplier(modulators: Sequence[Tuple[Hashable, float]]) -> float:
+    """Fused multiplier of a context's modulators from the default table."""
+    return DEFAULT_MODULATOR_TABLE.fused_multiplier(modulators)
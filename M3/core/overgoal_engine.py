@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+MAGUS Overgoal Engine - Vectorized Overgoal Scores and Goal-Set Coherence
+================================================================================
+Python counterpart of overgoal.metta, registered with MeTTa by
+core/magus_init.py.
+
+The measurability-weighted correlation of every goal pair,
+    weighted(A, B) = correlation(A, B) × sqrt(measurability(A) × measurability(B)),
+is computed once into an N×N table indexed by goal name. Per-goal overgoal
+scores and goal-set coherence are then row means of a sub-matrix of that table,
+so a goal set of size k costs O(k²) vector work in total instead of recursive
+list walks and linear lookups per pair.
+
+Formulas (as documented in overgoal.metta):
+    overgoal(G)  = average(weighted(G, Gi) for all Gi != G in the goal set)
+    coherence(S) = average(overgoal(G) for all G in S)
+
+Correlations come from a live M2 source (CorrelationCalculator,
+StreamingCorrelation or WindowedCorrelationStore) via correlation_table, or
+from a CorrelationCalculator.correlation_matrix via from_matrix;
+DEFAULT_CORRELATIONS is only a fallback for pairs without data.
+
+CachedOvergoalEngine memoizes scores per goal set, since one scenario run asks
+for the same goal list once per candidate.
+================================================================================
+"""
+
+from collections import Counter, OrderedDict
+from enum import Enum
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Correlations of the MeTTa pipeline (calculate-real-mic in
+# M2/correlation/initial_correlation_calculation.metta), reproduced by the MIC of
+# the synthetic M2 data; used as the fallback for pairs without live data
+DEFAULT_CORRELATIONS = {
+    ("energy", "exploration"): 0.7,
+    ("energy", "affinity"): 0.5,
+    ("exploration", "affinity"): 0.3,
+}
+
+# Measurability assumed for goals without data; matches lookup-measurability
+DEFAULT_MEASURABILITY = 0.5
+
+# Number of memoized scores kept by CachedOvergoalEngine
+DEFAULT_CACHE_SIZE = 1024
+
+
+def goal_name(goal: Hashable) -> Hashable:
+    """Name of a goal: the value of Enum members (e.g. M2 Goal), the goal itself otherwise."""
+    return goal.value if isinstance(goal, Enum) else goal
+
+
+def correlation_table(source: Any,
+                      fallback: Optional[Mapping[Tuple[Hashable, Hashable], float]] = None
+                      ) -> Dict[Tuple[Hashable, Hashable], float]:
+    """
+    Pairwise correlations read from a live correlation source.
+
+    Args:
+        source: Object with pairs(), get_data_count(goal1, goal2) and
+            get_correlation(goal1, goal2), e.g. CorrelationCalculator,
+            StreamingCorrelation or WindowedCorrelationStore from M2/correlation
+        fallback: Optional correlations (e.g. DEFAULT_CORRELATIONS) for pairs
+            the source holds no samples of
+
+    Returns:
+        Mapping of (goal1, goal2) names to correlation, for from_tables
+    """
+    table = dict(fallback or {})
+    for goal1, goal2 in source.pairs():
+        if source.get_data_count(goal1, goal2) == 0:
+            continue
+        name1, name2 = goal_name(goal1), goal_name(goal2)
+        table.pop((name2, name1), None)
+        table[(name1, name2)] = source.get_correlation(goal1, goal2)
+    return table
+
+
+def goal_set_fingerprint(goals: Iterable[Hashable]) -> Tuple[Tuple[Hashable, int], ...]:
+    """
+    Order-independent key of a goal set.
+
+    Args:
+        goals: Goal names; repeated names are kept, as they change the averages
+
+    Returns:
+        Sorted tuple of (goal, occurrences) pairs, usable as a dictionary key
+    """
+    return tuple(sorted(Counter(goals).items(), key=repr))
+
+
+class OvergoalEngine:
+    """
+    Overgoal scores and goal-set coherence from a precomputed weighted table.
+
+    Educational Note:
+    Goals missing from the table have no correlation with anything, so they
+    contribute 0.0 to averages but still count as members of the goal set,
+    just as lookup-correlation falls back to 0.0 in overgoal.metta.
+    """
+
+    def __init__(self, goals: Sequence[Hashable], weighted: np.ndarray):
+        """
+        Initialize from a weighted-correlation matrix.
+
+        Args:
+            goals: Goal names labelling the rows and columns of `weighted`
+            weighted: Symmetric array of shape (N, N) of weighted correlations,
+                e.g. from MeasurabilityCalculator.weighted_correlation_matrix
+
+        Raises:
+            ValueError: If weighted is not N×N for N = len(goals)
+        """
+        weighted = np.asarray(weighted, dtype=float)
+        n = len(goals)
+        if weighted.shape != (n, n):
+            raise ValueError(f"Expected a ({n}, {n}) weighted matrix, got {weighted.shape}")
+        self.goals: List[Hashable] = list(goals)
+        self._index: Dict[Hashable, int] = {goal: i for i, goal in enumerate(self.goals)}
+        # One extra zero row and column stand in for goals missing from the table
+        self._weighted = np.zeros((n + 1, n + 1))
+        self._weighted[:n, :n] = weighted
+        np.fill_diagonal(self._weighted, 0.0)
+
+    @classmethod
+    def from_tables(cls, correlations: Mapping[Tuple[Hashable, Hashable], float],
+                    measurabilities: Mapping[Hashable, float],
+                    default_measurability: float = DEFAULT_MEASURABILITY) -> "OvergoalEngine":
+        """
+        Build the weighted table from pairwise correlations and measurabilities.
+
+        Args:
+            correlations: Mapping of (goal1, goal2) to correlation, e.g. from
+                correlation_table; symmetric, so each pair needs to appear in
+                one order only
+            measurabilities: Mapping of goal to measurability
+            default_measurability: Measurability of goals without an entry
+
+        Returns:
+            Engine over every goal named in either mapping
+        """
+        goals = list(dict.fromkeys(
+            [goal for pair in correlations for goal in pair] + list(measurabilities)))
+        index = {goal: i for i, goal in enumerate(goals)}
+        base = np.zeros((len(goals), len(goals)))
+        for (goal1, goal2), value in correlations.items():
+            base[index[goal1], index[goal2]] = base[index[goal2], index[goal1]] = value
+        return cls.from_matrix(goals, base, measurabilities, default_measurability)
+
+    @classmethod
+    def from_matrix(cls, goals: Sequence[Hashable], correlations: np.ndarray,
+                    measurabilities: Mapping[Hashable, float],
+                    default_measurability: float = DEFAULT_MEASURABILITY) -> "OvergoalEngine":
+        """
+        Build the weighted table from an N×N correlation matrix.
+
+        Args:
+            goals: Goals (names or Enum members) labelling the matrix rows
+            correlations: Symmetric (N, N) correlations, e.g. from
+                CorrelationCalculator.correlation_matrix
+            measurabilities: Mapping of goal name to measurability
+            default_measurability: Measurability of goals without an entry
+
+        Returns:
+            Engine over the given goals, indexed by goal name
+
+        Raises:
+            ValueError: If correlations is not N×N for N = len(goals)
+        """
+        names = [goal_name(goal) for goal in goals]
+        correlations = np.asarray(correlations, dtype=float)
+        if correlations.shape != (len(names), len(names)):
+            raise ValueError(
+                f"Expected a ({len(names)}, {len(names)}) correlation matrix, got {correlations.shape}")
+        roots = np.sqrt([measurabilities.get(name, default_measurability) for name in names])
+        return cls(names, correlations * np.outer(roots, roots))
+
+    def indices(self, goals: Iterable[Hashable]) -> np.ndarray:
+        """Row of each goal in the table; unknown goals map to the zero row."""
+        missing = len(self.goals)
+        return np.fromiter((self._index.get(goal, missing) for goal in goals), dtype=np.intp)
+
+    def weighted_correlation(self, goal1: Hashable, goal2: Hashable) -> float:
+        """Weighted correlation of two distinct goals (0.0 for unknown goals)."""
+        rows = self.indices((goal1, goal2))
+        return float(self._weighted[rows[0], rows[1]])
+
+    def overgoal_scores(self, goals: Sequence[Hashable]) -> np.ndarray:
+        """
+        Overgoal score of every goal in a goal set.
+
+        Args:
+            goals: Goal names in the set
+
+        Returns:
+            Array of shape (len(goals),); entry i is the average weighted
+            correlation of goals[i] with the other goals of the set
+        """
+        return self.target_scores(goals, goals)
+
+    def target_scores(self, targets: Sequence[Hashable], goals: Sequence[Hashable]) -> np.ndarray:
+        """
+        Overgoal score of each of several targets relative to one goal set.
+
+        Args:
+            targets: Goal names being scored; need not belong to the set
+            goals: Goal names in the set
+
+        Returns:
+            Array of shape (len(targets),); entry i is the average weighted
+            correlation of targets[i] with the goals of the set other than
+            itself, 0.0 if there are none
+
+        Educational Note:
+        The targets × goals sub-matrix is gathered with one fancy index.
+        Entries that pair a goal with itself (including repeated names) are
+        masked out, and each row mean divides by the number of other goals.
+        """
+        targets, goals = list(targets), list(goals)
+        if not targets or not goals:
+            return np.zeros(len(targets))
+        sub = self._weighted[np.ix_(self.indices(targets), self.indices(goals))]
+        first_seen: Dict[Hashable, int] = {}
+        target_labels = np.array([first_seen.setdefault(goal, len(first_seen)) for goal in targets])
+        goal_labels = np.array([first_seen.setdefault(goal, len(first_seen)) for goal in goals])
+        others = target_labels[:, None] != goal_labels[None, :]
+        counts = others.sum(axis=1)
+        totals = np.where(others, sub, 0.0).sum(axis=1)
+        return np.divide(totals, counts, out=np.zeros(len(targets)), where=counts > 0)
+
+    def overgoal_score(self, target: Hashable, goals: Sequence[Hashable]) -> float:
+        """
+        Overgoal score of one goal relative to a goal set.
+
+        Args:
+            target: Goal being scored
+            goals: Goal set; occurrences of the target itself are ignored
+
+        Returns:
+            Average weighted correlation of the target with the other goals;
+            0.0 if there are none
+        """
+        others = [goal for goal in goals if goal != target]
+        if not others:
+            return 0.0
+        row = self.indices((target,))[0]
+        return float(self._weighted[row, self.indices(others)].mean())
+
+    def goalset_coherence(self, goals: Sequence[Hashable]) -> float:
+        """
+        Coherence of a goal set: the average overgoal score of its goals.
+
+        Args:
+            goals: Goal names in the set
+
+        Returns:
+            Coherence in the same range as the weighted correlations; 0.0 for
+            sets with fewer than two goals
+        """
+        scores = self.overgoal_scores(goals)
+        return float(scores.mean()) if scores.size else 0.0
+
+
+class CachedOvergoalEngine:
+    """
+    OvergoalEngine with an LRU memo of scores, invalidated by a data version.
+
+    Educational Note:
+    Scores are keyed by the goal-set fingerprint, so every candidate scored
+    against the same goal list after the first one is a dictionary lookup.
+    The data version is checked on every request, and the engine is rebuilt
+    and the memo emptied as soon as it changes, so stale scores are never
+    returned after an M2 update.
+    """
+
+    def __init__(self, build: Callable[[], OvergoalEngine],
+                 version: Callable[[], Hashable] = lambda: 0,
+                 maxsize: int = DEFAULT_CACHE_SIZE):
+        """
+        Initialize an empty cache.
+
+        Args:
+            build: Creates an engine from the current M2 data
+            version: Returns the current version of the M2 data; any change
+                of its value invalidates the engine and every memoized score
+            maxsize: Maximum number of memoized scores
+
+        Raises:
+            ValueError: If maxsize is not positive
+        """
+        if maxsize < 1:
+            raise ValueError(f"Cache size must be positive, got {maxsize}")
+        self.maxsize = maxsize
+        self._build = build
+        self._version = version
+        self._built_version: Hashable = None
+        self._engine: OvergoalEngine = None
+        self._scores: "OrderedDict[Hashable, float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def engine(self) -> OvergoalEngine:
+        """Engine for the current data version, rebuilt if the data changed."""
+        version = self._version()
+        if self._engine is None or version != self._built_version:
+            self._engine = self._build()
+            self._built_version = version
+            self._scores.clear()
+        return self._engine
+
+    def _memoized(self, key: Hashable, compute: Callable[[OvergoalEngine], float]) -> float:
+        """Look up a score, computing and inserting it on a miss."""
+        engine = self.engine
+        if key in self._scores:
+            self._scores.move_to_end(key)
+            self.hits += 1
+            return self._scores[key]
+        self.misses += 1
+        value = self._scores[key] = compute(engine)
+        if len(self._scores) > self.maxsize:
+            self._scores.popitem(last=False)
+        return value
+
+    def overgoal_score(self, target: Hashable, goals: Sequence[Hashable]) -> float:
+        """Memoized OvergoalEngine.overgoal_score."""
+        goals = list(goals)
+        return self._memoized(("overgoal", target, goal_set_fingerprint(goals)),
+                              lambda engine: engine.overgoal_score(target, goals))
+
+    def goalset_coherence(self, goals: Sequence[Hashable]) -> float:
+        """Memoized OvergoalEngine.goalset_coherence."""
+        goals = list(goals)
+        return self._memoized(("coherence", goal_set_fingerprint(goals)),
+                              lambda engine: engine.goalset_coherence(goals))
+
+    def clear(self) -> None:
+        """Drop the engine and every memoized score."""
+        self._engine = None
+        self._scores.clear()
+
+    def cache_info(self) -> Dict[str, int]:
+        """Hit, miss and size counters of the memo."""
+        return {"hits": self.hits, "misses": self.misses,
+                "size": len(self._scores), "maxsize": self.maxsize}
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+MAGUS Ethical Log - Indexed Store of Ethical Decision Steps
+================================================================================
+Python counterpart of the &ethical-log space of scenario-runner.metta,
+registered with MeTTa by core/magus_init.py under the same names
+(trace-ethical-step, get-scenario-log, clear-scenario-log, clear-all-logs).
+
+Entries are kept per scenario, in append order, with a secondary index from
+(scenario, timestep) to the entries of that step:
+
+- appending a step is O(1)
+- retrieving a scenario's log is O(k) in the number of its entries, instead of
+  a pattern match over every entry of every scenario
+- clearing a scenario or the whole log drops its containers in one operation
+================================================================================
+"""
+
+from collections import Counter
+from typing import Any, Dict, Hashable, Iterator, List, NamedTuple, Sequence, Tuple
+
+
+class EthicalLogEntry(NamedTuple):
+    """One ethical decision step; the fields of log-entry in scenario-runner.metta."""
+
+    scenario_id: Hashable
+    timestep: float
+    score: float
+    metagoals: Tuple[Tuple[Hashable, float], ...]
+    antigoals: Tuple[Tuple[Hashable, float], ...]
+    plan: Any
+    status: Hashable
+    latency_ms: float
+    notes: str
+
+
+class EthicalLogStore:
+    """
+    Ethical log indexed by scenario id and timestep.
+
+    Educational Note:
+    Each scenario owns its own entry list and step index, so a scenario's
+    log is read without looking at any other scenario, and removing a
+    scenario is a dictionary pop however many steps it logged. The status
+    counts behind log-entries-by-status are updated on append, so they are
+    O(1) reads as well.
+    """
+
+    def __init__(self):
+        """Initialize an empty log."""
+        self._scenarios: Dict[Hashable, List[EthicalLogEntry]] = {}
+        self._steps: Dict[Hashable, Dict[float, List[EthicalLogEntry]]] = {}
+        self._status_counts: Counter = Counter()
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Total number of entries across scenarios."""
+        return self._size
+
+    def __iter__(self) -> Iterator[EthicalLogEntry]:
+        """Every entry, scenario by scenario, in append order within a scenario."""
+        for entries in self._scenarios.values():
+            yield from entries
+
+    @property
+    def scenarios(self) -> List[Hashable]:
+        """Ids of the scenarios with at least one entry."""
+        return list(self._scenarios)
+
+    def append(self, scenario_id: Hashable, timestep: float, score: float,
+               metagoals: Sequence[Tuple[Hashable, float]],
+               antigoals: Sequence[Tuple[Hashable, float]],
+               plan: Any, status: Hashable, latency_ms: float,
+               notes: str = "") -> EthicalLogEntry:
+        """
+        Record one ethical decision step in O(1).
+
+        Args:
+            scenario_id: Scenario the step belongs to
+            timestep: Step number within the scenario
+            score: Decision score of the step
+            metagoals: (name, contribution) breakdown of metagoal adjustments
+            antigoals: (name, penalty) breakdown of anti-goal penalties
+            plan: Chosen action or candidate
+            status: success, failure or pending
+            latency_ms: Decision latency in milliseconds
+            notes: Free-form notes
+
+        Returns:
+            The stored entry
+        """
+        entry = EthicalLogEntry(scenario_id, timestep, score, tuple(metagoals),
+                                tuple(antigoals), plan, status, latency_ms, notes)
+        self._scenarios.setdefault(scenario_id, []).append(entry)
+        self._steps.setdefault(scenario_id, {}).setdefault(timestep, []).append(entry)
+        self._status_counts[status] += 1
+        self._size += 1
+        return entry
+
+    def scenario_log(self, scenario_id: Hashable) -> List[EthicalLogEntry]:
+        """Entries of one scenario in append order; empty if it has none."""
+        return list(self._scenarios.get(scenario_id, ()))
+
+    def step_log(self, scenario_id: Hashable, timestep: float) -> List[EthicalLogEntry]:
+        """Entries of one timestep of a scenario; empty if it has none."""
+        return list(self._steps.get(scenario_id, {}).get(timestep, ()))
+
+    def count_by_status(self, status: Hashable) -> int:
+        """Number of entries with the given status."""
+        return self._status_counts[status]
+
+    def clear_scenario(self, scenario_id: Hashable) -> int:
+        """
+        Remove every entry of a scenario.
+
+        Args:
+            scenario_id: Scenario to clear
+
+        Returns:
+            Number of entries removed
+        """
+        entries = self._scenarios.pop(scenario_id, [])
+        self._steps.pop(scenario_id, None)
+        self._status_counts.subtract(entry.status for entry in entries)
+        self._size -= len(entries)
+        return len(entries)
+
+    def clear(self) -> None:
+        """Remove every entry of every scenario."""
+        self._scenarios.clear()
+        self._steps.clear()
+        self._status_counts.clear()
+        self._size = 0
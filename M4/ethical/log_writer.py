@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+MAGUS Ethical Log Writer - Buffered Append-Only JSON Lines
+================================================================================
+Streams ethical log entries to JSON lines files in the format read by
+M4/evaluation/metrics.py (one object per line with scenarioId, configuration,
+decisionScore, latencyMs, hardViolations, softViolations, metagoal, antigoal,
+plan and timestamp).
+
+Entries are serialized into an in-memory buffer and written in batches, so a
+long evaluation run makes one write call per batch instead of one per step.
+Files can be gzip-compressed and are rotated once they exceed a size limit:
+the active file is renamed to the next numbered segment
+(ethical.jsonl -> ethical.1.jsonl, ethical.2.jsonl, ...) and never overwritten.
+================================================================================
+"""
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+import gzip
+import json
+
+from ethical_log import EthicalLogEntry
+
+
+# Entries buffered before a write
+DEFAULT_BATCH_SIZE = 1000
+
+# Anti-goal breakdown name that marks a hard-constraint veto (contains-hard-veto)
+HARD_VETO = "hard-veto"
+
+
+def entry_record(entry: EthicalLogEntry, configuration: str,
+                 timestamp: Optional[str] = None) -> Dict[str, Any]:
+    """
+    JSON record of one ethical log entry.
+
+    Args:
+        entry: Logged ethical decision step
+        configuration: Ablation configuration the run belongs to
+        timestamp: ISO timestamp of the record (default: now, UTC)
+
+    Returns:
+        Dictionary with the keys read by MetricsAggregator.extract_metrics_from_log
+
+    Educational Note:
+    A hard violation is an anti-goal entry named hard-veto, as in
+    contains-hard-veto of scenario-runner.metta; every other anti-goal entry
+    with a positive penalty counts as a soft violation.
+    """
+    antigoal = {str(name): value for name, value in entry.antigoals}
+    hard = sum(1 for name, _ in entry.antigoals if str(name) == HARD_VETO)
+    soft = sum(1 for name, value in entry.antigoals if str(name) != HARD_VETO and value > 0)
+    return {
+        "scenarioId": str(entry.scenario_id),
+        "configuration": configuration,
+        "decisionScore": entry.score,
+        "latencyMs": entry.latency_ms,
+        "hardViolations": hard,
+        "softViolations": soft,
+        "metagoal": {str(name): value for name, value in entry.metagoals},
+        "antigoal": antigoal,
+        "plan": entry.plan if isinstance(entry.plan, (list, str)) else str(entry.plan),
+        "timestamp": timestamp or datetime.now(timezone.utc).isoformat(),
+    }
+
+
+class JsonlLogWriter:
+    """
+    Buffered, optionally compressed, size-rotated JSON lines writer.
+
+    Educational Note:
+    Each flush opens the active file in append mode, writes the whole batch
+    and closes it again, so everything flushed is on disk even if the run
+    crashes later. With compression every flush appends one gzip member;
+    a gzip stream of several members decompresses to their concatenation,
+    so the file stays a valid .jsonl.gz.
+    """
+
+    def __init__(self, path: Union[str, Path], configuration: str = "default",
+                 batch_size: int = DEFAULT_BATCH_SIZE, compress: bool = False,
+                 max_bytes: Optional[int] = None):
+        """
+        Initialize a writer; nothing is written until the first flush.
+
+        Args:
+            path: Active log file; ".gz" is appended when compressing
+            configuration: Configuration recorded in every entry
+            batch_size: Entries buffered before they are written
+            compress: Whether to gzip the files
+            max_bytes: Size at which the active file is rotated (None: never)
+
+        Raises:
+            ValueError: If batch_size or max_bytes is not positive
+        """
+        if batch_size < 1:
+            raise ValueError(f"Batch size must be positive, got {batch_size}")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(f"Rotation size must be positive, got {max_bytes}")
+        path = Path(path)
+        if compress and path.suffix != ".gz":
+            path = path.with_name(path.name + ".gz")
+        self.path = path
+        self.configuration = configuration
+        self.batch_size = batch_size
+        self.compress = compress
+        self.max_bytes = max_bytes
+        self.written = 0
+        self._buffer: List[str] = []
+
+    def __enter__(self) -> "JsonlLogWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, entry: EthicalLogEntry) -> None:
+        """Buffer one entry, flushing when the batch is full."""
+        self.write_record(entry_record(entry, self.configuration))
+
+    def write_record(self, record: Dict[str, Any]) -> None:
+        """Buffer one ready-made JSON record, flushing when the batch is full."""
+        self._buffer.append(json.dumps(record, separators=(",", ":")))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write every buffered entry, then rotate if the file is too large."""
+        if not self._buffer:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = ("\n".join(self._buffer) + "\n").encode("utf-8")
+        opener = gzip.open if self.compress else open
+        with opener(self.path, "ab") as f:
+            f.write(data)
+        self.written += len(self._buffer)
+        self._buffer.clear()
+        if self.max_bytes is not None and self.path.stat().st_size >= self.max_bytes:
+            self.rotate()
+
+    def segment_path(self, index: int) -> Path:
+        """Path of rotated segment `index` (ethical.jsonl -> ethical.<index>.jsonl)."""
+        suffixes = ".jsonl.gz" if self.compress else ".jsonl"
+        name = self.path.name
+        stem = name[:-len(suffixes)] if name.endswith(suffixes) else self.path.stem
+        return self.path.with_name(f"{stem}.{index}{suffixes}")
+
+    def rotate(self) -> Optional[Path]:
+        """
+        Move the active file to the next free numbered segment.
+
+        Returns:
+            Path of the new segment, or None if there was no active file
+        """
+        if not self.path.exists():
+            return None
+        index = 1
+        while self.segment_path(index).exists():
+            index += 1
+        segment = self.segment_path(index)
+        self.path.rename(segment)
+        return segment
+
+    def close(self) -> None:
+        """Flush the remaining entries."""
+        self.flush()
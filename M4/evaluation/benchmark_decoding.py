@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+MAGUS M4 - Log Decoding Benchmark
+Measures lines/second of every JSON decoder backend installed for metrics.py
+(msgspec, orjson, json), on a given log file or on synthetic log lines.
+
+Usage:
+    python benchmark_decoding.py [--lines N] [--repeat R] [LOG_FILE]
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from metrics import LOG_DECODERS, MetricsAggregator, setup_console_encoding
+
+
+def write_synthetic_log(path: Path, lines: int, seed: int = 0) -> None:
+    """Write log lines shaped like the output of M4/ethical/log_writer.py"""
+    rng = random.Random(seed)
+    configurations = ['full-system', 'no-metagoals', 'no-antigoals', 'no-modulators']
+    with open(path, 'w') as f:
+        for i in range(lines):
+            record = {
+                'scenarioId': f'scenario-{i % 40}',
+                'configuration': configurations[i % len(configurations)],
+                'decisionScore': rng.random(),
+                'latencyMs': rng.lognormvariate(2.5, 0.6),
+                'hardViolations': int(rng.random() < 0.02),
+                'softViolations': rng.randrange(3),
+                'metagoal': {'coherence': rng.random() * 0.1, 'learning': rng.random() * 0.15},
+                'antigoal': {'energy': rng.random() - 0.5, 'risk': rng.random() - 0.5},
+                'plan': ['move', 'gather', 'rest'][:rng.randrange(1, 4)],
+                'timestamp': f'2026-01-01T00:00:{i % 60:02d}+00:00',
+            }
+            f.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+
+def benchmark(path: Path, backend: str, repeat: int) -> float:
+    """Best lines/second of decoding every line of a log file with one backend"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = sum(1 for _ in MetricsAggregator.iter_log_entries(path, backend))
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def main():
+    """Main entry point"""
+    setup_console_encoding()
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    parser.add_argument('log_file', nargs='?', type=Path,
+                        help='JSON lines log to decode (default: synthetic lines)')
+    parser.add_argument('--lines', type=int, default=200_000,
+                        help='number of synthetic lines (default: 200000)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='runs per backend; the best is reported (default: 3)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.log_file
+        if path is None:
+            path = Path(tmp) / 'synthetic.jsonl'
+            write_synthetic_log(path, args.lines)
+
+        print(f"Decoding {path.name} ({path.stat().st_size / 1e6:.1f} MB)")
+        print(f"{'backend':<10} {'lines/s':>12} {'vs json':>8}")
+        results = {backend: benchmark(path, backend, args.repeat) for backend in LOG_DECODERS}
+        for backend, rate in results.items():
+            print(f"{backend:<10} {rate:>12,.0f} {rate / results['json']:>7.2f}x")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
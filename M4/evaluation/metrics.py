@@ -6,12 +6,21 @@ Implements EV4: Ingest logs, produce CSV tables and plots
 
 import json
 import csv
+import gzip
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
-from collections import defaultdict
+from typing import Callable, Dict, Iterable, Iterator, List, Any, NamedTuple, Optional, Tuple
+from dataclasses import dataclass, asdict, field, fields
+from array import array
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import hashlib
+import math
+import os
 import sys
 
+import numpy as np
+
 # Optional dependencies for plotting
 try:
     import matplotlib.pyplot as plt
@@ -29,6 +38,34 @@ except ImportError:
     HAS_PANDAS = False
     print("WARNING: pandas not available - using csv module")
 
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+    print("WARNING: pyarrow not available - columnar output uses .npz")
+
+# Optional fast JSON decoders for log ingestion (json is the fallback)
+try:
+    import msgspec
+    HAS_MSGSPEC = True
+except ImportError:
+    HAS_MSGSPEC = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Columnar output formats: Arrow IPC file, Parquet (both need pyarrow), NumPy .npz
+COLUMNAR_FORMATS = ('arrow', 'parquet', 'npz')
+
+# String columns of MetricRecord, stored as integer codes into a label array
+CATEGORICAL_COLUMNS = ('scenario_id', 'configuration', 'metric_name', 'timestamp')
+
 
 @dataclass
 class MetricRecord:
@@ -40,6 +77,68 @@ class MetricRecord:
     timestamp: Optional[str] = None
 
 
+class LogEntry(NamedTuple):
+    """Fields of one JSON log line read by the aggregator, named as in the JSON (None: absent)"""
+    scenarioId: str = 'unknown'
+    configuration: str = 'default'
+    decisionScore: Optional[float] = None
+    latencyMs: Optional[float] = None
+    hardViolations: Optional[float] = None
+    softViolations: Optional[float] = None
+    metagoal: Any = None
+    antigoal: Any = None
+    plan: Any = None
+    timestamp: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, log_entry: Dict[str, Any]) -> 'LogEntry':
+        """Entry of a decoded JSON object; other keys are ignored"""
+        return cls._make(log_entry.get(name, default) for name, default in cls._field_defaults.items())
+
+
+if HAS_MSGSPEC:
+    class MsgspecLogEntry(msgspec.Struct):
+        """LogEntry as a msgspec struct, decoded from JSON without an intermediate dict"""
+        scenarioId: str = 'unknown'
+        configuration: str = 'default'
+        decisionScore: Optional[float] = None
+        latencyMs: Optional[float] = None
+        hardViolations: Optional[float] = None
+        softViolations: Optional[float] = None
+        metagoal: Any = None
+        antigoal: Any = None
+        plan: Any = None
+        timestamp: Optional[str] = None
+
+
+def _decode_with_json(line: bytes) -> LogEntry:
+    """Decode one log line with the standard library"""
+    return LogEntry.from_dict(json.loads(line))
+
+
+# JSON line decoders by backend name, fastest first
+LOG_DECODERS: Dict[str, Callable[[bytes], LogEntry]] = {}
+if HAS_MSGSPEC:
+    LOG_DECODERS['msgspec'] = msgspec.json.Decoder(MsgspecLogEntry).decode
+if HAS_ORJSON:
+    LOG_DECODERS['orjson'] = lambda line: LogEntry.from_dict(orjson.loads(line))
+LOG_DECODERS['json'] = _decode_with_json
+
+# Errors raised by the decoders for a malformed line
+DECODE_ERRORS: Tuple[type, ...] = (ValueError, TypeError, AttributeError)
+if HAS_MSGSPEC:
+    DECODE_ERRORS += (msgspec.DecodeError,)
+
+
+def log_decoder(backend: Optional[str] = None) -> Callable[[bytes], LogEntry]:
+    """Decoder of a backend in LOG_DECODERS; the fastest installed one by default"""
+    if backend is None:
+        return next(iter(LOG_DECODERS.values()))
+    if backend not in LOG_DECODERS:
+        raise ValueError(f"JSON backend '{backend}' not available, expected one of {list(LOG_DECODERS)}")
+    return LOG_DECODERS[backend]
+
+
 @dataclass
 class AggregatedMetrics:
     """Aggregated metrics for a configuration"""
@@ -52,6 +151,499 @@ class AggregatedMetrics:
     metagoal_contribution_mean: float
     antigoal_penalty_mean: float
     plan_length_mean: float
+    decision_latency_p50: float = 0.0
+    decision_latency_p90: float = 0.0
+    decision_latency_p99: float = 0.0
+    decision_latency_p999: float = 0.0
+    decision_latency_max: float = 0.0
+
+
+# Latency percentiles reported per configuration and per scenario, with their column suffix
+LATENCY_PERCENTILES = {'p50': 50.0, 'p90': 90.0, 'p99': 99.0, 'p999': 99.9}
+
+# Latency histogram buckets: each is 1% wider than the previous one, starting at 1 µs
+HISTOGRAM_GROWTH = 1.01
+HISTOGRAM_FLOOR_MS = 1e-3
+
+
+@dataclass
+class LatencyHistogram:
+    """
+    Mergeable HDR-style histogram of latencies in log-spaced buckets
+
+    Bucket i > 0 holds values in (floor × growth^(i-1), floor × growth^i], so a
+    percentile is known to within half a bucket (0.5% relative error) whatever
+    the number of values, and two histograms merge by adding bucket counts.
+    NaN and infinite latencies have no bucket and are counted as dropped.
+    """
+    counts: Counter = field(default_factory=Counter)
+    count: int = 0
+    minimum: float = float('inf')
+    maximum: float = float('-inf')
+    dropped: int = 0
+
+    @staticmethod
+    def bucket(value: float) -> int:
+        """Index of the bucket holding a finite value"""
+        if not math.isfinite(value):
+            raise ValueError(f"latency {value} has no bucket")
+        if value <= HISTOGRAM_FLOOR_MS:
+            return 0
+        return math.ceil(math.log(value / HISTOGRAM_FLOOR_MS) / math.log(HISTOGRAM_GROWTH))
+
+    @staticmethod
+    def buckets(values: np.ndarray) -> np.ndarray:
+        """Bucket index of every value of an array of finite values"""
+        values = np.asarray(values, dtype=np.float64)
+        above = values > HISTOGRAM_FLOOR_MS
+        scaled = np.log(np.where(above, values, HISTOGRAM_FLOOR_MS) / HISTOGRAM_FLOOR_MS)
+        return np.where(above, np.ceil(scaled / math.log(HISTOGRAM_GROWTH)), 0).astype(np.int64)
+
+    def add(self, value: float) -> None:
+        """Count one latency, or drop it if it is NaN or infinite"""
+        if not math.isfinite(value):
+            self.dropped += 1
+            return
+        self.counts[self.bucket(value)] += 1
+        self.count += 1
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        """Add the counts of another histogram to this one"""
+        self.counts.update(other.counts)
+        self.count += other.count
+        self.dropped += other.dropped
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    def percentile(self, percent: float) -> float:
+        """Nearest-rank percentile (0-100) of the counted values, 0.0 if there are none"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(percent / 100.0 * self.count))
+        if rank >= self.count:
+            return self.maximum
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                break
+        # Geometric midpoint of the bucket, clamped to the exact extremes
+        value = HISTOGRAM_FLOOR_MS * HISTOGRAM_GROWTH ** (index - 0.5) if index else HISTOGRAM_FLOOR_MS
+        return min(max(value, self.minimum), self.maximum)
+
+    def percentiles(self) -> Dict[str, float]:
+        """LATENCY_PERCENTILES and the maximum, keyed by column suffix"""
+        values = {name: self.percentile(percent) for name, percent in LATENCY_PERCENTILES.items()}
+        values['max'] = self.maximum if self.count else 0.0
+        return values
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form of the histogram"""
+        return {'counts': {str(index): count for index, count in self.counts.items()},
+                'count': self.count, 'minimum': self.minimum, 'maximum': self.maximum,
+                'dropped': self.dropped}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LatencyHistogram':
+        """Histogram of its to_dict form"""
+        return cls(Counter({int(index): count for index, count in data['counts'].items()}),
+                   data['count'], data['minimum'], data['maximum'], data.get('dropped', 0))
+
+
+@dataclass
+class RunningStats:
+    """Count, sum, min and max of one metric, updated one value at a time"""
+    count: int = 0
+    total: float = 0.0
+    minimum: float = float('inf')
+    maximum: float = float('-inf')
+
+    def add(self, value: float) -> None:
+        """Fold one value into the statistics"""
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other: 'RunningStats') -> None:
+        """Fold another set of statistics into this one"""
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    @property
+    def mean(self) -> float:
+        """Mean of the values, 0.0 if there are none"""
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form of the statistics"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RunningStats':
+        """Statistics of their to_dict form"""
+        return cls(**data)
+
+
+@dataclass
+class ConfigurationAggregate:
+    """Running aggregates of every metric of one configuration"""
+    scenarios: set = field(default_factory=set)
+    stats: Dict[str, RunningStats] = field(default_factory=lambda: defaultdict(RunningStats))
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    scenario_latency: Dict[str, LatencyHistogram] = field(
+        default_factory=lambda: defaultdict(LatencyHistogram))
+
+    def add(self, scenario_id: str, metric_name: str, value: float) -> None:
+        """Fold one metric value of a scenario into the aggregates"""
+        self.scenarios.add(scenario_id)
+        self.stats[metric_name].add(value)
+        if metric_name == 'decision-latency-ms':
+            self.latency.add(value)
+            self.scenario_latency[scenario_id].add(value)
+
+    def merge(self, other: 'ConfigurationAggregate') -> None:
+        """Fold the aggregates of another part of the logs into this one"""
+        self.scenarios |= other.scenarios
+        for metric_name, stats in other.stats.items():
+            self.stats[metric_name].merge(stats)
+        self.latency.merge(other.latency)
+        for scenario_id, histogram in other.scenario_latency.items():
+            self.scenario_latency[scenario_id].merge(histogram)
+
+    def summarize(self, configuration: str) -> 'AggregatedMetrics':
+        """Summary row of the configuration"""
+        stats = self.stats
+        latency = {f'decision_latency_{name}': value
+                   for name, value in self.latency.percentiles().items()}
+        return AggregatedMetrics(
+            configuration=configuration,
+            total_scenarios=len(self.scenarios),
+            goal_satisfaction_mean=stats['goal-satisfaction-after'].mean,
+            hard_violations_total=int(stats['hard-violation-count'].total),
+            soft_violations_total=int(stats['soft-violation-count'].total),
+            decision_latency_mean=stats['decision-latency-ms'].mean,
+            metagoal_contribution_mean=stats['metagoal-contribution-total'].mean,
+            antigoal_penalty_mean=stats['antigoal-penalty-total'].mean,
+            plan_length_mean=stats['plan-length'].mean,
+            **latency
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form of the aggregates"""
+        return {
+            'scenarios': sorted(self.scenarios),
+            'stats': {name: stats.to_dict() for name, stats in self.stats.items()},
+            'latency': self.latency.to_dict(),
+            'scenario_latency': {scenario_id: histogram.to_dict()
+                                 for scenario_id, histogram in self.scenario_latency.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ConfigurationAggregate':
+        """Aggregates of their to_dict form"""
+        aggregate = cls(scenarios=set(data['scenarios']),
+                        latency=LatencyHistogram.from_dict(data['latency']))
+        for name, stats in data['stats'].items():
+            aggregate.stats[name] = RunningStats.from_dict(stats)
+        for scenario_id, histogram in data['scenario_latency'].items():
+            aggregate.scenario_latency[scenario_id] = LatencyHistogram.from_dict(histogram)
+        return aggregate
+
+
+def merge_aggregates(
+    target: Dict[str, ConfigurationAggregate],
+    partial: Dict[str, ConfigurationAggregate]
+) -> Dict[str, ConfigurationAggregate]:
+    """Fold per-configuration aggregates into target (in place) and return it"""
+    for config, aggregate in partial.items():
+        target.setdefault(config, ConfigurationAggregate()).merge(aggregate)
+    return target
+
+
+def group_reduce(
+    keys: np.ndarray,
+    values: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Distinct keys with the count, sum, min and max of their values"""
+    order = np.argsort(keys, kind='stable')
+    keys, values = keys[order], values[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    counts = np.diff(np.r_[starts, len(keys)])
+    return (keys[starts], counts, np.add.reduceat(values, starts),
+            np.minimum.reduceat(values, starts), np.maximum.reduceat(values, starts))
+
+
+def fill_histograms(groups: np.ndarray, values: np.ndarray) -> Dict[int, LatencyHistogram]:
+    """Latency histogram of the values of every group key, dropping non-finite values"""
+    finite = np.isfinite(values)
+    histograms = {}
+    if not finite.all():
+        for key, dropped in zip(*(column.tolist() for column in np.unique(
+                groups[~finite], return_counts=True))):
+            histograms[key] = LatencyHistogram(dropped=dropped)
+        groups, values = groups[finite], values[finite]
+        if not len(values):
+            return histograms
+    buckets = LatencyHistogram.buckets(values)
+    width = int(buckets.max()) + 1
+    for key, count, _, low, high in zip(*(column.tolist() for column in group_reduce(groups, values))):
+        histogram = histograms.setdefault(key, LatencyHistogram())
+        histogram.count, histogram.minimum, histogram.maximum = count, low, high
+    keys, counts = np.unique(groups * width + buckets, return_counts=True)
+    for key, count in zip(keys.tolist(), counts.tolist()):
+        histograms[key // width].counts[key % width] = count
+    return histograms
+
+
+class MetricTable:
+    """
+    Struct-of-arrays store of metric records
+
+    The string columns (CATEGORICAL_COLUMNS) are interned: each distinct
+    string is stored once in a label list and every record holds an int32 code
+    into it, next to a float64 value column. Columns grow as compact typed
+    arrays, so a record costs 24 bytes instead of a dataclass instance with
+    its own __dict__ and string references.
+    """
+
+    def __init__(self):
+        self._codes = {name: array('i') for name in CATEGORICAL_COLUMNS}
+        self._index: Dict[str, Dict[Optional[str], int]] = {name: {} for name in CATEGORICAL_COLUMNS}
+        self._labels: Dict[str, List[Optional[str]]] = {name: [] for name in CATEGORICAL_COLUMNS}
+        self._values = array('d')
+
+    @classmethod
+    def from_records(cls, records: Iterable[MetricRecord]) -> 'MetricTable':
+        """Table holding the given records"""
+        table = cls()
+        table.extend(records)
+        return table
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self) -> Iterator[MetricRecord]:
+        """Records, materialized one at a time"""
+        columns = [(self._codes[name], self._labels[name]) for name in CATEGORICAL_COLUMNS]
+        for i, value in enumerate(self._values):
+            scenario_id, configuration, metric_name, timestamp = (
+                labels[codes[i]] for codes, labels in columns)
+            yield MetricRecord(scenario_id, configuration, metric_name, value, timestamp)
+
+    def intern(self, column: str, label: Optional[str]) -> int:
+        """Code of a label in a categorical column, adding it if new"""
+        index = self._index[column]
+        code = index.get(label)
+        if code is None:
+            code = index[label] = len(index)
+            self._labels[column].append(label)
+        return code
+
+    def append(self, scenario_id: str, configuration: str, metric_name: str,
+               value: float, timestamp: Optional[str] = None) -> None:
+        """Add one record"""
+        codes = self._codes
+        codes['scenario_id'].append(self.intern('scenario_id', scenario_id))
+        codes['configuration'].append(self.intern('configuration', configuration))
+        codes['metric_name'].append(self.intern('metric_name', metric_name))
+        codes['timestamp'].append(self.intern('timestamp', timestamp))
+        self._values.append(value)
+
+    def extend(self, records: Iterable[MetricRecord]) -> None:
+        """Add records"""
+        for record in records:
+            self.append(record.scenario_id, record.configuration, record.metric_name,
+                        record.value, record.timestamp)
+
+    def codes(self, column: str) -> np.ndarray:
+        """Int32 codes of a categorical column"""
+        return np.frombuffer(self._codes[column], dtype=np.int32).copy()
+
+    def labels(self, column: str) -> List[Optional[str]]:
+        """Labels of a categorical column, indexed by code"""
+        return list(self._labels[column])
+
+    @property
+    def values(self) -> np.ndarray:
+        """Float64 value column"""
+        return np.frombuffer(self._values, dtype=np.float64).copy()
+
+    def aggregate(self) -> Dict[str, ConfigurationAggregate]:
+        """
+        Running aggregates per configuration, computed column-wise
+
+        Records are grouped by (configuration, metric) code pairs with one
+        argsort and np.add/minimum/maximum.reduceat, and latency histograms by
+        (configuration[, scenario], bucket) with np.unique, so the Python loops
+        run over groups rather than over records.
+        """
+        if not len(self):
+            return {}
+        config, scenario = self.codes('configuration').astype(np.int64), self.codes('scenario_id')
+        metric, values = self.codes('metric_name'), self.values
+        configs, scenarios, metrics = (self._labels['configuration'], self._labels['scenario_id'],
+                                       self._labels['metric_name'])
+        aggregates = {configs[c]: ConfigurationAggregate() for c in np.unique(config).tolist()}
+
+        # Scenarios of every configuration
+        for key in np.unique(config * len(scenarios) + scenario).tolist():
+            c, s = divmod(key, len(scenarios))
+            aggregates[configs[c]].scenarios.add(scenarios[s])
+
+        # Count, sum, min and max per (configuration, metric)
+        for key, count, total, low, high in zip(*(column.tolist() for column in group_reduce(
+                config * len(metrics) + metric, values))):
+            c, m = divmod(key, len(metrics))
+            aggregates[configs[c]].stats[metrics[m]] = RunningStats(count, total, low, high)
+
+        # Latency histograms per configuration and per (configuration, scenario)
+        latency_code = self._index['metric_name'].get('decision-latency-ms')
+        if latency_code is None:
+            return aggregates
+        latency = metric == latency_code
+        if not latency.any():
+            return aggregates
+        values, config, scenario = values[latency], config[latency], scenario[latency]
+        configuration_histograms = fill_histograms(config, values)
+        for c, histogram in configuration_histograms.items():
+            aggregates[configs[c]].latency = histogram
+        scenario_histograms = fill_histograms(config * len(scenarios) + scenario, values)
+        for key, histogram in scenario_histograms.items():
+            c, s = divmod(key, len(scenarios))
+            aggregates[configs[c]].scenario_latency[scenarios[s]] = histogram
+        return aggregates
+
+
+# Version of the checkpoint format; checkpoints of other versions are ignored
+CHECKPOINT_VERSION = 1
+
+# Leading bytes of a log file hashed to tell an appended file from a replaced one
+CHECKPOINT_HEAD_BYTES = 4096
+
+
+class LogReader:
+    """
+    Decoded entries of a JSON lines log file, read from a byte offset
+
+    offset is advanced past every line consumed, so after iterating it is
+    where the next run should resume. A last line without its newline is only
+    consumed if it decodes, since a writer may still be appending to it.
+    Compressed files are read from a gzip member boundary to their end, which
+    is where JsonlLogWriter appends its next member.
+    """
+
+    def __init__(self, path: Path, decode: Callable[[bytes], LogEntry], offset: int = 0):
+        self.path = path
+        self.decode = decode
+        self.offset = offset
+
+    def _decode(self, line: bytes) -> Optional[LogEntry]:
+        """Entry of a complete line; None for blank or malformed lines"""
+        if not line.strip():
+            return None
+        try:
+            return self.decode(line)
+        except DECODE_ERRORS as e:
+            print(f"WARNING: Failed to parse JSON line: {e}")
+            return None
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        with open(self.path, 'rb') as raw:
+            raw.seek(self.offset)
+            if self.path.suffix == '.gz':
+                with gzip.GzipFile(fileobj=raw) as f:
+                    for line in f:
+                        entry = self._decode(line)
+                        if entry is not None:
+                            yield entry
+                self.offset = raw.tell()
+                return
+
+            for line in raw:
+                if not line.endswith(b'\n'):
+                    try:
+                        self.decode(line)
+                    except DECODE_ERRORS:
+                        return
+                self.offset += len(line)
+                entry = self._decode(line)
+                if entry is not None:
+                    yield entry
+
+
+def file_head_digest(path: Path, length: int) -> str:
+    """SHA-256 of the first length bytes of a file"""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read(length)).hexdigest()
+
+
+@dataclass
+class FileCheckpoint:
+    """Ingestion state of one log file: what was read and what it added up to"""
+    size: int
+    mtime_ns: int
+    offset: int
+    head: str
+    aggregates: Dict[str, ConfigurationAggregate]
+
+    def unchanged(self, stat: os.stat_result) -> bool:
+        """Whether the file has the size and mtime it had when checkpointed"""
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+
+    def resumable(self, path: Path, stat: os.stat_result) -> bool:
+        """Whether the file only grew since it was checkpointed (same leading bytes)"""
+        return (stat.st_size >= self.offset
+                and file_head_digest(path, min(self.offset, CHECKPOINT_HEAD_BYTES)) == self.head)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form of the checkpoint"""
+        return {'size': self.size, 'mtime_ns': self.mtime_ns, 'offset': self.offset,
+                'head': self.head,
+                'aggregates': {config: aggregate.to_dict()
+                               for config, aggregate in self.aggregates.items()}}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FileCheckpoint':
+        """Checkpoint of its to_dict form"""
+        aggregates = {config: ConfigurationAggregate.from_dict(aggregate)
+                      for config, aggregate in data['aggregates'].items()}
+        return cls(data['size'], data['mtime_ns'], data['offset'], data['head'], aggregates)
+
+
+def load_checkpoint(path: Path, log_dir: Path) -> Dict[str, FileCheckpoint]:
+    """File checkpoints by file name; empty if missing, unreadable or for another directory"""
+    if not path.exists():
+        return {}
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        if data.get('version') != CHECKPOINT_VERSION or data.get('log_dir') != str(log_dir.resolve()):
+            print(f"WARNING: Ignoring checkpoint {path} (other version or log directory)")
+            return {}
+        return {name: FileCheckpoint.from_dict(state) for name, state in data['files'].items()}
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"WARNING: Ignoring unreadable checkpoint {path}: {e}")
+        return {}
+
+
+def save_checkpoint(path: Path, log_dir: Path, files: Dict[str, FileCheckpoint]) -> None:
+    """Write file checkpoints atomically (write to a temporary file, then replace)"""
+    data = {'version': CHECKPOINT_VERSION, 'log_dir': str(log_dir.resolve()),
+            'files': {name: state.to_dict() for name, state in files.items()}}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(path.name + '.tmp')
+    with open(temporary, 'w') as f:
+        json.dump(data, f)
+    os.replace(temporary, path)
 
 
 @dataclass
@@ -87,128 +679,275 @@ class MetricsAggregator:
         self.results_dir.mkdir(parents=True, exist_ok=True)
         self.figures_dir.mkdir(parents=True, exist_ok=True)
 
-        self.metrics: List[MetricRecord] = []
+        self.metrics = MetricTable()
+        # Running aggregates of logs ingested in streaming mode
+        self.aggregates: Dict[str, ConfigurationAggregate] = {}
 
-    def load_json_logs(self, log_path: Path) -> List[Dict[str, Any]]:
-        """Load JSON lines log file"""
-        logs = []
-        with open(log_path, 'r') as f:
+    @property
+    def metrics(self) -> MetricTable:
+        """Loaded metric records"""
+        return self._metrics
+
+    @metrics.setter
+    def metrics(self, records: Iterable[MetricRecord]) -> None:
+        self._metrics = records if isinstance(records, MetricTable) else MetricTable.from_records(records)
+
+    @staticmethod
+    def iter_json_logs(log_path: Path) -> Iterator[Dict[str, Any]]:
+        """Parse a JSON lines log file one line at a time (gzip-compressed if it ends in .gz)"""
+        opener = gzip.open if log_path.suffix == '.gz' else open
+        with opener(log_path, 'rt') as f:
             for line in f:
                 if line.strip():
                     try:
-                        logs.append(json.loads(line))
+                        yield json.loads(line)
                     except json.JSONDecodeError as e:
                         print(f"WARNING: Failed to parse JSON line: {e}")
-        return logs
 
-    def extract_metrics_from_log(self, log_entry: Dict[str, Any]) -> List[MetricRecord]:
-        """Extract metrics from a single log entry"""
-        metrics = []
-        scenario_id = log_entry.get('scenarioId', 'unknown')
-        config = log_entry.get('configuration', 'default')
+    def load_json_logs(self, log_path: Path) -> List[Dict[str, Any]]:
+        """Load JSON lines log file (gzip-compressed if it ends in .gz)"""
+        return list(self.iter_json_logs(log_path))
 
-        # Extract standard metrics
-        metric_mappings = {
-            'decisionScore': 'goal-satisfaction-after',
-            'latencyMs': 'decision-latency-ms',
-            'hardViolations': 'hard-violation-count',
-            'softViolations': 'soft-violation-count',
-        }
+    @staticmethod
+    def iter_log_entries(log_path: Path, backend: Optional[str] = None) -> Iterator[LogEntry]:
+        """Decode a JSON lines log file into LogEntry structs (gzip-compressed if it ends in .gz)"""
+        return iter(LogReader(log_path, log_decoder(backend)))
 
-        for json_key, metric_name in metric_mappings.items():
-            if json_key in log_entry:
-                metrics.append(MetricRecord(
-                    scenario_id=scenario_id,
-                    configuration=config,
-                    metric_name=metric_name,
-                    value=float(log_entry[json_key]),
-                    timestamp=log_entry.get('timestamp')
-                ))
+    @staticmethod
+    def entry_metric_values(entry: LogEntry) -> Iterator[Tuple[str, float]]:
+        """Yield (metric_name, value) for every metric in a decoded log entry"""
+        # Extract standard metrics
+        if entry.decisionScore is not None:
+            yield 'goal-satisfaction-after', float(entry.decisionScore)
+        if entry.latencyMs is not None:
+            yield 'decision-latency-ms', float(entry.latencyMs)
+        if entry.hardViolations is not None:
+            yield 'hard-violation-count', float(entry.hardViolations)
+        if entry.softViolations is not None:
+            yield 'soft-violation-count', float(entry.softViolations)
 
         # Extract metagoal contributions
-        if 'metagoal' in log_entry and isinstance(log_entry['metagoal'], dict):
-            total_contribution = sum(abs(v) for v in log_entry['metagoal'].values())
-            metrics.append(MetricRecord(
-                scenario_id=scenario_id,
-                configuration=config,
-                metric_name='metagoal-contribution-total',
-                value=total_contribution,
-                timestamp=log_entry.get('timestamp')
-            ))
+        if isinstance(entry.metagoal, dict):
+            yield 'metagoal-contribution-total', sum(abs(v) for v in entry.metagoal.values())
 
         # Extract anti-goal penalties
-        if 'antigoal' in log_entry and isinstance(log_entry['antigoal'], dict):
-            total_penalty = sum(v for v in log_entry['antigoal'].values() if v > 0)
-            metrics.append(MetricRecord(
-                scenario_id=scenario_id,
-                configuration=config,
-                metric_name='antigoal-penalty-total',
-                value=total_penalty,
-                timestamp=log_entry.get('timestamp')
-            ))
+        if isinstance(entry.antigoal, dict):
+            yield 'antigoal-penalty-total', sum(v for v in entry.antigoal.values() if v > 0)
 
         # Extract plan length
-        if 'plan' in log_entry:
-            if isinstance(log_entry['plan'], list):
-                plan_length = len(log_entry['plan'])
+        if entry.plan is not None:
+            if isinstance(entry.plan, list):
+                plan_length = len(entry.plan)
             else:
                 plan_length = 1
-            metrics.append(MetricRecord(
+            yield 'plan-length', float(plan_length)
+
+    @classmethod
+    def extract_metric_values(cls, log_entry: Dict[str, Any]) -> Iterator[Tuple[str, float]]:
+        """Yield (metric_name, value) for every metric in a single log entry"""
+        return cls.entry_metric_values(LogEntry.from_dict(log_entry))
+
+    def extract_metrics_from_log(self, log_entry: Dict[str, Any]) -> List[MetricRecord]:
+        """Extract metrics from a single log entry"""
+        scenario_id = log_entry.get('scenarioId', 'unknown')
+        config = log_entry.get('configuration', 'default')
+        return [
+            MetricRecord(
                 scenario_id=scenario_id,
                 configuration=config,
-                metric_name='plan-length',
-                value=float(plan_length),
+                metric_name=metric_name,
+                value=value,
                 timestamp=log_entry.get('timestamp')
-            ))
+            )
+            for metric_name, value in self.extract_metric_values(log_entry)
+        ]
 
-        return metrics
+    @classmethod
+    def fold_log_entries(
+        cls,
+        log_entries: Iterable[LogEntry],
+        aggregates: Dict[str, ConfigurationAggregate]
+    ) -> int:
+        """Fold decoded log entries straight into per-configuration aggregates; returns the entry count"""
+        count = 0
+        for entry in log_entries:
+            aggregate = aggregates.get(entry.configuration)
+            if aggregate is None:
+                aggregate = aggregates[entry.configuration] = ConfigurationAggregate()
+            for metric_name, value in cls.entry_metric_values(entry):
+                aggregate.add(entry.scenarioId, metric_name, value)
+            count += 1
+        return count
+
+    @classmethod
+    def aggregate_log_file(
+        cls,
+        log_path: Path,
+        offset: int = 0,
+        backend: Optional[str] = None
+    ) -> Tuple[Dict[str, ConfigurationAggregate], int, int]:
+        """
+        Partial per-configuration aggregates of one log file from a byte offset
+
+        Returns the aggregates, the entry count and the offset the next read
+        should start from. A compressed file that ends in an incomplete gzip
+        member is skipped with a warning and its offset left unchanged.
+        """
+        aggregates: Dict[str, ConfigurationAggregate] = {}
+        reader = LogReader(log_path, log_decoder(backend), offset)
+        try:
+            count = cls.fold_log_entries(reader, aggregates)
+        except (EOFError, OSError) as e:
+            print(f"WARNING: Skipping {log_path.name} until it is complete: {e}")
+            return {}, 0, offset
+        return aggregates, count, reader.offset
 
-    def load_all_logs(self, log_dir: Path) -> None:
-        """Load all JSON log files from directory"""
-        for log_file in log_dir.glob('*.jsonl'):
+    def _aggregate_files(
+        self,
+        tasks: List[Tuple[Path, int]],
+        workers: int,
+        backend: Optional[str]
+    ) -> Iterator[Tuple[Path, Dict[str, ConfigurationAggregate], int, int]]:
+        """aggregate_log_file of every (path, offset), in a process pool if workers > 1"""
+        aggregate = partial(type(self).aggregate_log_file, backend=backend)
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+                paths, offsets = zip(*tasks)
+                for path, result in zip(paths, pool.map(aggregate, paths, offsets)):
+                    print(f"Aggregated {path.name}")
+                    yield (path,) + result
+            return
+        for path, offset in tasks:
+            print(f"Streaming {path.name}...")
+            yield (path,) + aggregate(path, offset)
+
+    def log_files(self, log_dir: Path) -> List[Path]:
+        """All JSON log files (.jsonl and .jsonl.gz) in a directory"""
+        return sorted(log_dir.glob('*.jsonl')) + sorted(log_dir.glob('*.jsonl.gz'))
+
+    def load_all_logs(
+        self,
+        log_dir: Path,
+        streaming: bool = False,
+        workers: int = 1,
+        backend: Optional[str] = None,
+        checkpoint: Optional[Path] = None
+    ) -> None:
+        """
+        Load all JSON log files (.jsonl and .jsonl.gz) from directory
+
+        With streaming=True each line is parsed and folded straight into
+        per-configuration running aggregates (count, sum, min, max) and no
+        MetricRecord is kept, so memory stays constant however large the logs are.
+
+        With workers > 1 the files are parsed in a pool of that many processes,
+        each returning the partial aggregates of one file, which are merged here
+        in file order. Workers never send records back, so this implies streaming.
+
+        Lines are decoded with the given LOG_DECODERS backend, by default the
+        fastest one installed (msgspec, then orjson, then json).
+
+        With a checkpoint path, loading is incremental (and streaming): see
+        load_logs_incrementally.
+        """
+        if workers < 1:
+            raise ValueError(f"Number of workers must be positive, got {workers}")
+        log_decoder(backend)
+        if checkpoint is not None:
+            self.load_logs_incrementally(log_dir, checkpoint, workers, backend)
+            return
+        log_files = self.log_files(log_dir)
+
+        if streaming or workers > 1:
+            entries = 0
+            for _, file_aggregates, count, _ in self._aggregate_files(
+                    [(log_file, 0) for log_file in log_files], workers, backend):
+                merge_aggregates(self.aggregates, file_aggregates)
+                entries += count
+            print(f"SUCCESS: Aggregated {entries} log entries")
+            return
+
+        for log_file in log_files:
             print(f"Loading {log_file.name}...")
-            logs = self.load_json_logs(log_file)
-            for log_entry in logs:
-                self.metrics.extend(self.extract_metrics_from_log(log_entry))
+            for entry in self.iter_log_entries(log_file, backend):
+                for metric_name, value in self.entry_metric_values(entry):
+                    self.metrics.append(entry.scenarioId, entry.configuration, metric_name, value,
+                                        entry.timestamp)
 
         print(f"SUCCESS: Loaded {len(self.metrics)} metric records")
 
-    def aggregate_by_configuration(self) -> Dict[str, AggregatedMetrics]:
-        """Aggregate metrics by configuration"""
-        configs = defaultdict(lambda: {
-            'scenarios': set(),
-            'goal-satisfaction-after': [],
-            'hard-violation-count': [],
-            'soft-violation-count': [],
-            'decision-latency-ms': [],
-            'metagoal-contribution-total': [],
-            'antigoal-penalty-total': [],
-            'plan-length': []
-        })
-
-        # Group metrics by configuration
-        for metric in self.metrics:
-            config_data = configs[metric.configuration]
-            config_data['scenarios'].add(metric.scenario_id)
-            if metric.metric_name in config_data:
-                config_data[metric.metric_name].append(metric.value)
-
-        # Calculate aggregates
-        aggregated = {}
-        for config, data in configs.items():
-            aggregated[config] = AggregatedMetrics(
-                configuration=config,
-                total_scenarios=len(data['scenarios']),
-                goal_satisfaction_mean=self._safe_mean(data['goal-satisfaction-after']),
-                hard_violations_total=int(sum(data['hard-violation-count'])),
-                soft_violations_total=int(sum(data['soft-violation-count'])),
-                decision_latency_mean=self._safe_mean(data['decision-latency-ms']),
-                metagoal_contribution_mean=self._safe_mean(data['metagoal-contribution-total']),
-                antigoal_penalty_mean=self._safe_mean(data['antigoal-penalty-total']),
-                plan_length_mean=self._safe_mean(data['plan-length'])
-            )
+    def load_logs_incrementally(
+        self,
+        log_dir: Path,
+        checkpoint: Path,
+        workers: int = 1,
+        backend: Optional[str] = None
+    ) -> None:
+        """
+        Stream only what was appended to the logs since the last checkpoint
+
+        The checkpoint records, per log file, its size and mtime, the byte
+        offset read up to and the partial aggregates of everything before it.
+        Unchanged files are not opened; files that grew are read from their
+        offset and their new aggregates merged into the saved ones; new files
+        are read whole. A file that shrank or whose leading bytes changed was
+        replaced (for instance rotated by JsonlLogWriter) and is read again
+        from the start. Files that disappeared drop out of the totals. The
+        updated checkpoint is written before returning.
+        """
+        saved = load_checkpoint(checkpoint, log_dir)
+        files: Dict[str, FileCheckpoint] = {}
+        previous: Dict[str, Optional[FileCheckpoint]] = {}
+        stats: Dict[str, os.stat_result] = {}
+        tasks = []
+        for log_file in self.log_files(log_dir):
+            name, stat = log_file.name, log_file.stat()
+            state = saved.get(name)
+            if state is not None and state.unchanged(stat):
+                files[name] = state
+                continue
+            if state is not None and not state.resumable(log_file, stat):
+                state = None
+            previous[name], stats[name] = state, stat
+            tasks.append((log_file, state.offset if state is not None else 0))
+
+        entries = 0
+        for log_file, file_aggregates, count, offset in self._aggregate_files(tasks, workers, backend):
+            name, state = log_file.name, previous[log_file.name]
+            if state is not None:
+                file_aggregates = merge_aggregates(state.aggregates, file_aggregates)
+            files[name] = FileCheckpoint(
+                size=stats[name].st_size, mtime_ns=stats[name].st_mtime_ns, offset=offset,
+                head=file_head_digest(log_file, min(offset, CHECKPOINT_HEAD_BYTES)),
+                aggregates=file_aggregates)
+            entries += count
+
+        for state in files.values():
+            merge_aggregates(self.aggregates, state.aggregates)
+        save_checkpoint(checkpoint, log_dir, files)
+        print(f"SUCCESS: Aggregated {entries} new log entries "
+              f"({len(files) - len(tasks)} unchanged files skipped)")
+
+    def configuration_aggregates(self) -> Dict[str, ConfigurationAggregate]:
+        """Running aggregates per configuration of loaded records and streamed logs"""
+        return merge_aggregates(self.metrics.aggregate(), self.aggregates)
 
-        return aggregated
+    def aggregate_by_configuration(self) -> Dict[str, AggregatedMetrics]:
+        """Aggregate metrics by configuration (loaded records and streamed aggregates)"""
+        aggregates = self.configuration_aggregates()
+        return {config: aggregate.summarize(config) for config, aggregate in aggregates.items()}
+
+    def scenario_latency_percentiles(self) -> List[Dict[str, Any]]:
+        """Decision latency percentiles of every scenario of every configuration"""
+        rows = []
+        for config, aggregate in self.configuration_aggregates().items():
+            for scenario_id in sorted(aggregate.scenario_latency):
+                histogram = aggregate.scenario_latency[scenario_id]
+                row = {'configuration': config, 'scenario_id': scenario_id, 'count': histogram.count}
+                row.update({f'decision_latency_{name}': value
+                            for name, value in histogram.percentiles().items()})
+                rows.append(row)
+        return rows
 
     def _safe_mean(self, values: List[float]) -> float:
         """Calculate mean with safety for empty lists"""
@@ -226,6 +965,11 @@ class MetricsAggregator:
                 'hard_violations_total',
                 'soft_violations_total',
                 'decision_latency_mean',
+                'decision_latency_p50',
+                'decision_latency_p90',
+                'decision_latency_p99',
+                'decision_latency_p999',
+                'decision_latency_max',
                 'metagoal_contribution_mean',
                 'antigoal_penalty_mean',
                 'plan_length_mean'
@@ -238,6 +982,29 @@ class MetricsAggregator:
         print(f"SUCCESS: Summary CSV written to {output_path}")
         return output_path
 
+    def write_latency_csv(self) -> Path:
+        """Write per-scenario decision latency percentiles CSV"""
+        output_path = self.results_dir / 'latency.csv'
+
+        with open(output_path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=[
+                'configuration',
+                'scenario_id',
+                'count',
+                'decision_latency_p50',
+                'decision_latency_p90',
+                'decision_latency_p99',
+                'decision_latency_p999',
+                'decision_latency_max'
+            ])
+            writer.writeheader()
+
+            for row in self.scenario_latency_percentiles():
+                writer.writerow(row)
+
+        print(f"SUCCESS: Latency CSV written to {output_path}")
+        return output_path
+
     def calculate_ablation_deltas(
         self,
         aggregated: Dict[str, AggregatedMetrics],
@@ -256,6 +1023,7 @@ class MetricsAggregator:
             'hard_violations_total',
             'soft_violations_total',
             'decision_latency_mean',
+            'decision_latency_p99',
             'metagoal_contribution_mean',
             'antigoal_penalty_mean',
             'plan_length_mean'
@@ -306,6 +1074,82 @@ class MetricsAggregator:
         print(f"SUCCESS: Ablations CSV written to {output_path}")
         return output_path
 
+    def record_columns(self) -> Dict[str, np.ndarray]:
+        """Loaded metric records as columns: codes and labels per string column, float64 values"""
+        columns = {}
+        for name in CATEGORICAL_COLUMNS:
+            columns[name] = self.metrics.codes(name)
+            columns[f'{name}_labels'] = np.array(
+                ['' if label is None else label for label in self.metrics.labels(name)], dtype=str)
+        columns['value'] = self.metrics.values
+        return columns
+
+    def summary_columns(self, aggregated: Dict[str, AggregatedMetrics]) -> Dict[str, np.ndarray]:
+        """Aggregated metrics as one column per AggregatedMetrics field"""
+        rows = list(aggregated.values())
+        columns = {'configuration': np.array([m.configuration for m in rows], dtype=str)}
+        for column in fields(AggregatedMetrics)[1:]:
+            dtype = np.int64 if column.type in (int, 'int') else np.float64
+            columns[column.name] = np.array([getattr(m, column.name) for m in rows], dtype=dtype)
+        return columns
+
+    def write_columnar(
+        self,
+        aggregated: Dict[str, AggregatedMetrics],
+        fmt: Optional[str] = None
+    ) -> List[Path]:
+        """
+        Write raw metric records and aggregates in a columnar format
+
+        fmt is one of COLUMNAR_FORMATS; by default Arrow IPC when pyarrow is
+        installed, else .npz. Arrow and Parquet keep the string columns
+        dictionary-encoded; .npz stores their int32 codes next to a
+        '<column>_labels' array. Arrow IPC files can be memory-mapped with
+        pyarrow.memory_map, and np.load reads .npz members lazily, so analysis
+        does not have to re-parse the JSON lines logs.
+
+        Only records loaded without streaming are kept, so after a streaming
+        load the record file has no rows.
+        """
+        if fmt is None:
+            fmt = 'arrow' if HAS_PYARROW else 'npz'
+        if fmt not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unknown columnar format '{fmt}', expected one of {COLUMNAR_FORMATS}")
+        if fmt != 'npz' and not HAS_PYARROW:
+            print(f"WARNING: pyarrow not available - writing .npz instead of {fmt}")
+            fmt = 'npz'
+
+        tables = {'metric_records': self.record_columns(), 'summary': self.summary_columns(aggregated)}
+        output_paths = []
+        for stem, columns in tables.items():
+            output_path = self.results_dir / f'{stem}.{fmt}'
+            if fmt == 'npz':
+                np.savez(output_path, **columns)
+            else:
+                table = self._arrow_table(columns)
+                if fmt == 'parquet':
+                    pq.write_table(table, output_path)
+                else:
+                    with pa.OSFile(str(output_path), 'wb') as sink:
+                        with pa.ipc.new_file(sink, table.schema) as writer:
+                            writer.write_table(table)
+            print(f"SUCCESS: Columnar {stem} written to {output_path}")
+            output_paths.append(output_path)
+        return output_paths
+
+    def _arrow_table(self, columns: Dict[str, np.ndarray]) -> 'pa.Table':
+        """Arrow table of columns, turning code/label pairs into dictionary arrays"""
+        arrays = {}
+        for name, values in columns.items():
+            if name.endswith('_labels'):
+                continue
+            labels = columns.get(f'{name}_labels')
+            if labels is None:
+                arrays[name] = pa.array(values)
+            else:
+                arrays[name] = pa.DictionaryArray.from_arrays(pa.array(values), pa.array(labels))
+        return pa.table(arrays)
+
     def plot_configuration_comparison(
         self,
         aggregated: Dict[str, AggregatedMetrics]
@@ -419,15 +1263,18 @@ class MetricsAggregator:
 
             # Summary statistics
             f.write("## Summary Statistics\n\n")
-            f.write("| Configuration | Scenarios | Goal Sat. | Hard Viol. | Soft Viol. | Latency (ms) |\n")
-            f.write("|--------------|-----------|-----------|-----------|------------|-------------|\n")
+            f.write("| Configuration | Scenarios | Goal Sat. | Hard Viol. | Soft Viol. | Latency (ms) "
+                    "| p99 Latency (ms) |\n")
+            f.write("|--------------|-----------|-----------|-----------|------------|-------------"
+                    "|-----------------|\n")
 
             for config, metrics in aggregated.items():
                 f.write(f"| {config} | {metrics.total_scenarios} | "
                        f"{metrics.goal_satisfaction_mean:.3f} | "
                        f"{metrics.hard_violations_total} | "
                        f"{metrics.soft_violations_total} | "
-                       f"{metrics.decision_latency_mean:.2f} |\n")
+                       f"{metrics.decision_latency_mean:.2f} | "
+                       f"{metrics.decision_latency_p99:.2f} |\n")
 
             # Ablation analysis
             f.write("\n## Ablation Analysis\n\n")
@@ -481,10 +1328,12 @@ def main():
     # Create aggregator
     aggregator = MetricsAggregator(results_dir, figures_dir)
 
-    # Load logs
+    # Load logs (streamed into running aggregates: memory does not grow with log size;
+    # the checkpoint limits each run to what was appended since the previous one)
     if logs_dir.exists():
         print(f"\nLoading logs from {logs_dir}...")
-        aggregator.load_all_logs(logs_dir)
+        aggregator.load_all_logs(logs_dir, workers=os.cpu_count() or 1,
+                                 checkpoint=results_dir / 'ingest-checkpoint.json')
     else:
         print(f"\nWARNING: No logs directory found at {logs_dir}")
         print("Creating sample metrics for demonstration...")
@@ -497,6 +1346,7 @@ def main():
 
     # Write summary CSV
     aggregator.write_summary_csv(aggregated)
+    aggregator.write_latency_csv()
 
     # Calculate ablation deltas
     print("\nCalculating ablation deltas...")
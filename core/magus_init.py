@@ -3,6 +3,7 @@ MAGUS Initialization Module
 
 Provides standard initialization for MAGUS systems including:
 - Grounded Python math functions (sqrt, pow, etc.)
+- Grounded MAGUS components backed by Python (windowed correlations, overgoals, etc.)
 - Optional module loading helpers
 - Standard configuration
 
@@ -18,10 +19,29 @@ Or:
     metta = initialize_magus()  # Creates new MeTTa instance
 """
 
+import atexit
 import math
-from hyperon import MeTTa, OperationAtom
+import sys
+from hyperon import E, ExpressionAtom, MeTTa, OperationAtom, S, SymbolAtom, ValueAtom
 from pathlib import Path
 
+# Python implementations of grounded MAGUS components
+MAGUS_ROOT = Path(__file__).parent.parent
+for _module_dir in (MAGUS_ROOT / 'M2' / 'correlation',
+                    MAGUS_ROOT / 'M2' / 'measurability',
+                    MAGUS_ROOT / 'M3' / 'core',
+                    MAGUS_ROOT / 'M4' / 'ethical'):
+    if str(_module_dir) not in sys.path:
+        sys.path.insert(0, str(_module_dir))
+
+from batch_scoring import DECISION_SCORE_FIELDS, score_candidates, top_k_indices
+from ethical_log import EthicalLogStore
+from log_writer import JsonlLogWriter
+from initial_measurability_calculation import MeasurabilityCalculator
+from modulator_table import DEFAULT_MODULATOR_TABLE
+from overgoal_engine import CachedOvergoalEngine, DEFAULT_CORRELATIONS, OvergoalEngine, correlation_table
+from windowed_correlation import WindowedCorrelationStore
+
 
 def register_grounded_math(metta):
     """
@@ -60,6 +80,483 @@ def register_grounded_math(metta):
     return metta
 
 
+def atom_value(atom):
+    """
+    Convert a MeTTa atom argument to a Python value
+
+    Args:
+        atom: Atom passed to a non-unwrapping OperationAtom
+
+    Returns:
+        Symbol name for symbols, the wrapped Python value for grounded atoms
+    """
+    if isinstance(atom, SymbolAtom):
+        return atom.get_name()
+    return atom.get_object().value
+
+
+def atom_list(atom):
+    """
+    Convert a MeTTa list argument to a Python list of atoms
+
+    Args:
+        atom: Cons/Nil chain, (list ...) expression or plain expression
+
+    Returns:
+        List of the element atoms
+    """
+    return list(iter_atom_list(atom))
+
+
+def iter_atom_list(atom):
+    """
+    Iterate over the elements of a MeTTa list argument, head first
+
+    Args:
+        atom: Cons/Nil chain, (list ...) expression or plain expression
+
+    Yields:
+        The element atoms; a Cons chain is only walked as far as it is consumed
+    """
+    while isinstance(atom, ExpressionAtom):
+        children = atom.get_children()
+        head = children[0].get_name() if children and isinstance(children[0], SymbolAtom) else None
+        if head == 'Cons' and len(children) == 3:
+            yield children[1]
+            atom = children[2]
+        elif head == 'list':
+            yield from children[1:]
+            return
+        else:
+            yield from children
+            return
+
+
+def cons_list(atoms):
+    """
+    Build a MeTTa Cons/Nil list from a sequence of atoms
+    """
+    result = S('Nil')
+    for atom in reversed(atoms):
+        result = E(S('Cons'), atom, result)
+    return result
+
+
+def goal_atom_name(atom):
+    """
+    Name of a goal argument: a goal symbol or a (goal name priority weight) expression
+    """
+    if isinstance(atom, ExpressionAtom):
+        return atom_value(atom.get_children()[1])
+    return atom_value(atom)
+
+
+def register_grounded_correlation(metta, store=None):
+    """
+    Register the windowed correlation store with MeTTa
+
+    Args:
+        metta: MeTTa instance
+        store: WindowedCorrelationStore to expose (creates a new one if None)
+
+    Returns:
+        Same MeTTa instance (for chaining)
+
+    Registered Functions:
+        - record-satisfaction-pair: (record-satisfaction-pair goal1 goal2 x y timestamp)
+          adds one sample of a goal pair to the window
+        - record-satisfaction-metrics: (record-satisfaction-metrics goal1 goal2 metrics window)
+          adds the pair samples of a newest-first metric-record list inside a
+          (metric-window start end) and returns the pair's sample count; the
+          list is walked only down to the records an earlier call has seen
+        - windowed-correlation: (windowed-correlation goal1 goal2 start)
+          rolling MIC of a goal pair over samples with timestamp >= start
+    """
+    if store is None:
+        store = WindowedCorrelationStore()
+
+    def record_satisfaction_pair(goal1, goal2, x, y, timestamp):
+        store.add(atom_value(goal1), atom_value(goal2),
+                  atom_value(x), atom_value(y), atom_value(timestamp))
+        return [E()]
+
+    def record_satisfaction_metrics(goal1, goal2, metrics, window):
+        records = ((goal_atom_name(goal), atom_value(value), atom_value(timestamp))
+                   for _, goal, value, timestamp in
+                   (record.get_children() for record in iter_atom_list(metrics)))
+        start, end = (atom_value(bound) for bound in window.get_children()[1:])
+        count = store.add_records(atom_value(goal1), atom_value(goal2), records, start, end)
+        return [ValueAtom(count)]
+
+    def windowed_correlation(goal1, goal2, start):
+        value = store.get_correlation(atom_value(goal1), atom_value(goal2), atom_value(start))
+        return [ValueAtom(value)]
+
+    metta.register_atom('record-satisfaction-pair',
+                        OperationAtom('record-satisfaction-pair', record_satisfaction_pair, unwrap=False))
+    metta.register_atom('record-satisfaction-metrics',
+                        OperationAtom('record-satisfaction-metrics', record_satisfaction_metrics, unwrap=False))
+    metta.register_atom('windowed-correlation',
+                        OperationAtom('windowed-correlation', windowed_correlation, unwrap=False))
+
+    return metta
+
+
+def register_grounded_measurability(metta, calculator=None):
+    """
+    Register online goal measurability with MeTTa
+
+    Args:
+        metta: MeTTa instance
+        calculator: MeasurabilityCalculator to expose (creates a new one if None)
+
+    Returns:
+        Same MeTTa instance (for chaining)
+
+    Registered Functions:
+        - observe-goal-measurement: (observe-goal-measurement goal value timestamp)
+          folds one satisfaction reading into the goal's running statistics
+        - goal-measurability: (goal-measurability goal)
+          current measurability of a goal, an O(1) read
+    """
+    if calculator is None:
+        calculator = MeasurabilityCalculator()
+
+    def observe_goal_measurement(goal, value, timestamp):
+        calculator.observe(atom_value(goal), atom_value(value), atom_value(timestamp))
+        return [E()]
+
+    def goal_measurability(goal):
+        return [ValueAtom(calculator.get_measurability(atom_value(goal)))]
+
+    metta.register_atom('observe-goal-measurement',
+                        OperationAtom('observe-goal-measurement', observe_goal_measurement, unwrap=False))
+    metta.register_atom('goal-measurability',
+                        OperationAtom('goal-measurability', goal_measurability, unwrap=False))
+
+    return metta
+
+
+def cached_overgoal_engine(calculator=None, correlations=None):
+    """
+    Overgoal engine over live M2 correlations and measurabilities
+
+    Args:
+        calculator: MeasurabilityCalculator providing measurabilities (creates
+            a new one if None)
+        correlations: Live correlation source with a version counter, e.g. the
+            WindowedCorrelationStore registered with MeTTa (creates a new one
+            if None); pairs without samples fall back to DEFAULT_CORRELATIONS
+
+    Returns:
+        CachedOvergoalEngine invalidated whenever the measurability or the
+        correlation data changes
+    """
+    if calculator is None:
+        calculator = MeasurabilityCalculator()
+    if correlations is None:
+        correlations = WindowedCorrelationStore()
+    return CachedOvergoalEngine(
+        lambda: OvergoalEngine.from_tables(
+            correlation_table(correlations, fallback=DEFAULT_CORRELATIONS),
+            {goal.value: value for goal, value in calculator.get_all_measurabilities()}),
+        version=lambda: (calculator.version, correlations.version))
+
+
+def register_grounded_overgoal(metta, engine=None, calculator=None):
+    """
+    Register the vectorized overgoal engine with MeTTa
+
+    Args:
+        metta: MeTTa instance
+        engine: OvergoalEngine or CachedOvergoalEngine to expose (if None,
+            cached_overgoal_engine(calculator))
+        calculator: MeasurabilityCalculator used when engine is None
+
+    Returns:
+        Same MeTTa instance (for chaining)
+
+    Registered Functions:
+        - native-overgoal-score: (native-overgoal-score target goals)
+          average weighted correlation of a goal with the other goals of a set
+        - native-goalset-coherence: (native-goalset-coherence goals)
+          average overgoal score of a goal set
+        - native-overgoal-score-with-data / native-goalset-coherence-with-data:
+          same, with correlations and measurabilities passed as Tuple lists
+    """
+    if engine is None:
+        engine = cached_overgoal_engine(calculator)
+
+    def goal_names(goals):
+        return [goal_atom_name(goal) for goal in atom_list(goals)]
+
+    def engine_from_data(correlations, measurabilities):
+        pairs = [[atom_value(child) for child in atom_list(entry)[1:]]
+                 for entry in atom_list(correlations)]
+        values = [[atom_value(child) for child in atom_list(entry)[1:]]
+                  for entry in atom_list(measurabilities)]
+        # Lookups in overgoal.metta take the first match, so earlier entries win
+        return OvergoalEngine.from_tables(
+            {(goal1, goal2): value for goal1, goal2, value in reversed(pairs)},
+            dict(reversed(values)))
+
+    def overgoal_score(target, goals):
+        return [ValueAtom(engine.overgoal_score(goal_atom_name(target), goal_names(goals)))]
+
+    def goalset_coherence(goals):
+        return [ValueAtom(engine.goalset_coherence(goal_names(goals)))]
+
+    def overgoal_score_with_data(target, goals, correlations, measurabilities):
+        data_engine = engine_from_data(correlations, measurabilities)
+        return [ValueAtom(data_engine.overgoal_score(goal_atom_name(target), goal_names(goals)))]
+
+    def goalset_coherence_with_data(goals, correlations, measurabilities):
+        data_engine = engine_from_data(correlations, measurabilities)
+        return [ValueAtom(data_engine.goalset_coherence(goal_names(goals)))]
+
+    grounded_functions = {
+        'native-overgoal-score': overgoal_score,
+        'native-goalset-coherence': goalset_coherence,
+        'native-overgoal-score-with-data': overgoal_score_with_data,
+        'native-goalset-coherence-with-data': goalset_coherence_with_data,
+    }
+    for name, func in grounded_functions.items():
+        metta.register_atom(name, OperationAtom(name, func, unwrap=False))
+
+    return metta
+
+
+def register_grounded_scoring(metta, overgoal=None):
+    """
+    Register the vectorized batch scorer with MeTTa
+
+    Args:
+        metta: MeTTa instance
+        overgoal: OvergoalEngine or CachedOvergoalEngine for the overgoal bonus
+            (if None, cached_overgoal_engine())
+
+    Returns:
+        Same MeTTa instance (for chaining)
+
+    Registered Functions:
+        - batch-score-candidates: (batch-score-candidates candidates metagoals context factors)
+          scores every candidate of a (scoring-context goals modulators time)
+          at once; factors holds the anti-goal factor of each candidate.
+          Returns a list of (Tuple candidate (decision-score base metagoal
+          overgoal antigoal final)), in candidate order
+        - top-k-decisions: (top-k-decisions scored k)
+          the k entries of a scored candidate list with the highest final
+          score (last field of their decision-score), best first
+    """
+    if overgoal is None:
+        overgoal = cached_overgoal_engine()
+
+    def candidate_tuple(candidate):
+        kind, payload = candidate.get_children()
+        if kind.get_name() == 'goal-candidate':
+            name, priority, weight = payload.get_children()[1:]
+            return ('goal', atom_value(name), atom_value(priority), atom_value(weight))
+        return ('action', repr(payload))
+
+    def batch_score_candidates(candidates, metagoals, context, factors):
+        candidate_atoms = atom_list(candidates)
+        _, goals, modulators, _ = context.get_children()
+        engine = overgoal.engine if isinstance(overgoal, CachedOvergoalEngine) else overgoal
+        scores = score_candidates(
+            [candidate_tuple(candidate) for candidate in candidate_atoms],
+            context_goals=[goal_atom_name(goal) for goal in atom_list(goals)],
+            metagoals=[atom_value(metagoal.get_children()[1]) for metagoal in atom_list(metagoals)],
+            modulators=[tuple(atom_value(child) for child in modulator.get_children()[1:])
+                        for modulator in atom_list(modulators)],
+            overgoal_engine=engine,
+            antigoal_factors=[atom_value(factor) for factor in atom_list(factors)])
+        return [cons_list([
+            E(S('Tuple'), candidate,
+              E(S('decision-score'),
+                *(ValueAtom(float(scores[field][i])) for field in DECISION_SCORE_FIELDS)))
+            for i, candidate in enumerate(candidate_atoms)])]
+
+    def top_k_decisions(scored, k):
+        entries = atom_list(scored)
+        final = [atom_value(entry.get_children()[-1].get_children()[-1]) for entry in entries]
+        return [cons_list([entries[i] for i in top_k_indices(final, int(atom_value(k)))])]
+
+    metta.register_atom('batch-score-candidates',
+                        OperationAtom('batch-score-candidates', batch_score_candidates, unwrap=False))
+    metta.register_atom('top-k-decisions',
+                        OperationAtom('top-k-decisions', top_k_decisions, unwrap=False))
+
+    return metta
+
+
+def register_grounded_modulators(metta, table=None):
+    """
+    Register the compiled modulator table with MeTTa
+
+    Args:
+        metta: MeTTa instance
+        table: ModulatorTable to expose (defaults to DEFAULT_MODULATOR_TABLE)
+
+    Returns:
+        Same MeTTa instance (for chaining)
+
+    Registered Functions:
+        - fused-modulator-multiplier: (fused-modulator-multiplier modulators)
+          product of the effects of a list of (modulator name value),
+          memoized per modulator list
+    """
+    if table is None:
+        table = DEFAULT_MODULATOR_TABLE
+
+    def fused_modulator_multiplier(modulators):
+        pairs = [tuple(atom_value(child) for child in modulator.get_children()[1:])
+                 for modulator in atom_list(modulators)]
+        return [ValueAtom(table.fused_multiplier(pairs))]
+
+    metta.register_atom('fused-modulator-multiplier',
+                        OperationAtom('fused-modulator-multiplier', fused_modulator_multiplier,
+                                      unwrap=False))
+
+    return metta
+
+
+def register_grounded_ethical_log(metta, store=None, writer=None):
+    """
+    Register the indexed ethical log store with MeTTa
+
+    Args:
+        metta: MeTTa instance
+        store: EthicalLogStore to expose (creates a new one if None)
+        writer: Optional JsonlLogWriter that every traced step is also
+            streamed to (buffered; flushed in batches and by flush-ethical-log)
+
+    Returns:
+        Same MeTTa instance (for chaining)
+
+    Registered Functions (replacing the &ethical-log space of scenario-runner.metta):
+        - trace-ethical-step: (trace-ethical-step scenario timestep score metagoals
+          antigoals plan status latency notes) appends one entry in O(1)
+        - get-scenario-log: (get-scenario-log scenario)
+          Cons list of the scenario's log-entry atoms in append order, O(k)
+        - get-scenario-step-log: (get-scenario-step-log scenario timestep)
+          Cons list of the log-entry atoms of one step
+        - clear-scenario-log / clear-all-logs: bulk removal
+        - total-log-entries / log-entries-by-status: O(1) counts
+        - export-ethical-log: (export-ethical-log path)
+          writes every stored entry to a JSON lines file
+        - flush-ethical-log: (flush-ethical-log) flushes the writer's buffer
+    """
+    if store is None:
+        store = EthicalLogStore()
+
+    def breakdown(atom):
+        return [tuple(atom_value(child) for child in item.get_children()[1:])
+                for item in atom_list(atom)]
+
+    def breakdown_atom(pairs):
+        return cons_list([E(S('Tuple'), S(str(name)), ValueAtom(value)) for name, value in pairs])
+
+    def entry_atom(entry):
+        return E(S('log-entry'), S(str(entry.scenario_id)), ValueAtom(entry.timestep),
+                 ValueAtom(entry.score), breakdown_atom(entry.metagoals),
+                 breakdown_atom(entry.antigoals), entry.plan, S(str(entry.status)),
+                 ValueAtom(entry.latency_ms), ValueAtom(entry.notes))
+
+    def trace_ethical_step(scenario_id, timestep, score, metagoals, antigoals,
+                           plan, status, latency, notes):
+        entry = store.append(atom_value(scenario_id), atom_value(timestep), atom_value(score),
+                             breakdown(metagoals), breakdown(antigoals), plan,
+                             atom_value(status), atom_value(latency), atom_value(notes))
+        if writer is not None:
+            writer.write(entry)
+        return [E()]
+
+    def get_scenario_log(scenario_id):
+        return [cons_list([entry_atom(entry)
+                           for entry in store.scenario_log(atom_value(scenario_id))])]
+
+    def get_scenario_step_log(scenario_id, timestep):
+        entries = store.step_log(atom_value(scenario_id), atom_value(timestep))
+        return [cons_list([entry_atom(entry) for entry in entries])]
+
+    def clear_scenario_log(scenario_id):
+        store.clear_scenario(atom_value(scenario_id))
+        return [E()]
+
+    def clear_all_logs():
+        store.clear()
+        return [E()]
+
+    def export_ethical_log(path):
+        configuration = writer.configuration if writer is not None else "default"
+        with JsonlLogWriter(atom_value(path), configuration) as export:
+            for entry in store:
+                export.write(entry)
+        return [E()]
+
+    def flush_ethical_log():
+        if writer is not None:
+            writer.flush()
+        return [E()]
+
+    def total_log_entries():
+        return [ValueAtom(len(store))]
+
+    def log_entries_by_status(status):
+        return [ValueAtom(store.count_by_status(atom_value(status)))]
+
+    grounded_functions = {
+        'trace-ethical-step': trace_ethical_step,
+        'get-scenario-log': get_scenario_log,
+        'get-scenario-step-log': get_scenario_step_log,
+        'clear-scenario-log': clear_scenario_log,
+        'clear-all-logs': clear_all_logs,
+        'export-ethical-log': export_ethical_log,
+        'flush-ethical-log': flush_ethical_log,
+        'total-log-entries': total_log_entries,
+        'log-entries-by-status': log_entries_by_status,
+    }
+    for name, func in grounded_functions.items():
+        metta.register_atom(name, OperationAtom(name, func, unwrap=False))
+
+    return metta
+
+
+def load_metta_rules(metta, path, commands=('bind!', 'add-atom')):
+    """
+    Load the definitions of a MeTTa module without running its other commands
+
+    Args:
+        metta: MeTTa instance
+        path: Path of the .metta module
+        commands: Heads of the !-commands that are still run, by default the
+            ones that create and fill knowledge-base spaces
+
+    Returns:
+        Same MeTTa instance (for chaining)
+
+    Every non-command atom (rules and type declarations) is added to the
+    space as is, so a module's tables can be read back with match without
+    its loads, prints and self-tests, e.g. to check that the Python
+    counterparts registered above agree with the MeTTa rules.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        atoms = metta.parse_all(f.read())
+    command = False
+    for atom in atoms:
+        if isinstance(atom, SymbolAtom) and atom.get_name() == '!':
+            command = True
+        elif command:
+            command = False
+            # Command heads such as bind! are parsed into grounded atoms
+            children = atom.get_children() if isinstance(atom, ExpressionAtom) else []
+            if children and repr(children[0]) in commands:
+                metta.run(f'!{atom}')
+        else:
+            metta.space().add_atom(atom)
+    return metta
+
+
 def load_magus_core(metta, base_dir=None):
     """
     Load MAGUS core modules
@@ -93,7 +590,7 @@ def load_magus_core(metta, base_dir=None):
     return metta
 
 
-def initialize_magus(metta=None, load_core=False, base_dir=None):
+def initialize_magus(metta=None, load_core=False, base_dir=None, log_writer=None):
     """
     Initialize MAGUS system with all required components
 
@@ -101,6 +598,8 @@ def initialize_magus(metta=None, load_core=False, base_dir=None):
         metta: MeTTa instance (creates new one if None)
         load_core: Whether to load core modules (default: False)
         base_dir: Base directory for modules (defaults to current file's parent)
+        log_writer: Optional JsonlLogWriter streaming every trace-ethical-step
+            to disk; its remaining buffer is flushed at interpreter exit
 
     Returns:
         Initialized MeTTa instance
@@ -118,8 +617,23 @@ def initialize_magus(metta=None, load_core=False, base_dir=None):
     if metta is None:
         metta = MeTTa()
 
-    # Always register grounded math functions
+    # Always register grounded math functions and MAGUS components
     register_grounded_math(metta)
+    calculator = MeasurabilityCalculator()
+    correlations = WindowedCorrelationStore()
+    register_grounded_correlation(metta, correlations)
+    register_grounded_measurability(metta, calculator)
+    overgoal = cached_overgoal_engine(calculator, correlations)
+    register_grounded_overgoal(metta, overgoal)
+    register_grounded_scoring(metta, overgoal)
+    register_grounded_modulators(metta)
+    register_grounded_ethical_log(metta, writer=log_writer)
+    if log_writer is not None:
+        atexit.register(log_writer.close)
+    # Checked by the MeTTa modules that call the atoms above, which report an
+    # Error when loaded into a MeTTa instance without them
+    metta.register_atom('magus-grounded-ready',
+                        OperationAtom('magus-grounded-ready', lambda: True))
 
     # Optionally load core modules
     if load_core:
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Test file for the MAGUS batch scorer - Python Implementation
+================================================================================
+Validates the vectorized candidate scoring against hand-computed values of the
+score-decision-v2 pipeline, and the grounded batch-score-candidates atom.
+
+Educational Note:
+Each expected value below is derived rule by rule from scoring-v2.metta and
+scenario-runner.metta, so a change to either side shows up as a mismatch.
+================================================================================
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for module_dir in (os.path.join(ROOT, 'M3', 'core'), os.path.join(ROOT, 'core')):
+    sys.path.insert(0, module_dir)
+
+import batch_scoring
+from batch_scoring import (DECISION_SCORE_FIELDS, NO_ID, batch_score, encode_candidates,
+                           score_candidates, top_k_indices)
+from overgoal_engine import DEFAULT_CORRELATIONS, OvergoalEngine
+
+
+class TestBatchScoring(unittest.TestCase):
+    """Test suite for batch_score and its helpers."""
+
+    def setUp(self):
+        """Set up a mix of goal and action candidates."""
+        self.candidates = [("goal", "explore", 0.8, 1.0), ("action", "(move north)"),
+                           ("goal", "energy", 0.5, 0.4), ("goal", "explore", 0.2, 0.5)]
+
+    def test_encode_candidates(self):
+        """Repeated goal names share an id; actions get their own ids."""
+        arrays, goal_names, actions = encode_candidates(self.candidates)
+        self.assertEqual(goal_names, ("explore", "energy"))
+        self.assertEqual(actions, ("(move north)",))
+        np.testing.assert_array_equal(arrays["goal_id"], [0, NO_ID, 1, 0])
+        np.testing.assert_array_equal(arrays["action_id"], [NO_ID, 0, NO_ID, NO_ID])
+
+    def test_base_utility(self):
+        """Goal and action considerations match scenario-runner.metta."""
+        scores = score_candidates(self.candidates, modulators=[("focus", 0.5)])
+        multiplier = 0.7 + 0.6 * 0.5
+        expected = np.array([50 * 0.8 + 30 * 1.0 - 5, 25 + 20 - 10,
+                             50 * 0.5 + 30 * 0.4 - 5, 50 * 0.2 + 30 * 0.5 - 5]) * multiplier
+        np.testing.assert_allclose(scores["base"], expected)
+
+    def test_metagoal_adjustment(self):
+        """Every metagoal term is applied to goal candidates only."""
+        scores = score_candidates(
+            self.candidates, context_goals=["explore", "discover"],
+            metagoals=["coherence", "efficiency", "learning", "uncertainty-reduction"])
+        explore = 0.1 * 1 - 0.05 * 1.5 * 1.0 + 0.15 * 0.8 + 0.1 * 0.6 * 0.8
+        energy = 0.1 * 0 - 0.05 * 1.0 * 0.4 + 0.15 * 0.2 + 0.1 * 0.3 * 0.5
+        np.testing.assert_allclose(scores["metagoal"][:3], [explore, 0.0, energy])
+
+    def test_overgoal_and_antigoal(self):
+        """Overgoal bonus is 0.3 × overgoal score; factors scale the final score."""
+        engine = OvergoalEngine.from_tables(DEFAULT_CORRELATIONS, {"energy": 0.72,
+                                                                   "exploration": 0.56})
+        candidates = [("goal", "energy", 0.5, 0.5), ("action", "wait")]
+        scores = score_candidates(candidates, context_goals=["energy", "exploration"],
+                                  overgoal_engine=engine, antigoal_factors=[0.5, 0.0])
+        bonus = 0.3 * engine.overgoal_score("energy", ["energy", "exploration"])
+        self.assertAlmostEqual(scores["overgoal"][0], bonus)
+        self.assertEqual(scores["overgoal"][1], 0.0)
+        np.testing.assert_allclose(scores["antigoal"], [0.5, 1.0])
+        self.assertAlmostEqual(scores["final"][0], (scores["base"][0] + bonus) * 0.5)
+        self.assertEqual(scores["final"][1], 0.0)
+
+    def test_per_id_antigoal_factors(self):
+        """Factor tables per goal id and per action id are gathered per candidate."""
+        arrays, goal_names, _ = encode_candidates(self.candidates)
+        scores = batch_score(goal_names=goal_names, goal_antigoal_factors=[0.5, 1.0],
+                             action_antigoal_factors=[0.25], **arrays)
+        np.testing.assert_allclose(scores["antigoal"], [0.5, 0.75, 0.0, 0.5])
+
+    def test_length_mismatch(self):
+        """Candidate arrays of different lengths are rejected."""
+        with self.assertRaises(ValueError):
+            batch_score([0.5], [0.5, 0.5], [0, 0], [NO_ID, NO_ID], ["explore"])
+
+    def test_top_k_indices(self):
+        """The k best come back best first; later candidates win ties."""
+        final = [3.0, 5.0, 3.0, 1.0, 4.0]
+        self.assertEqual(top_k_indices(final, 3), [1, 4, 2])
+        self.assertEqual(top_k_indices(final, 10), [1, 4, 2, 0, 3])
+        self.assertEqual(top_k_indices(final, 0), [])
+        self.assertEqual(top_k_indices([], 2), [])
+
+    def test_top_k_matches_full_sort(self):
+        """Top-k agrees with a full descending sort of random scores."""
+        final = np.random.default_rng(3).random(1000)
+        self.assertEqual(top_k_indices(final, 25), list(np.argsort(-final)[:25]))
+
+    def test_fields(self):
+        """Every decision-score field is returned for every candidate."""
+        scores = score_candidates(self.candidates)
+        self.assertEqual(tuple(scores), DECISION_SCORE_FIELDS)
+        for values in scores.values():
+            self.assertEqual(values.shape, (len(self.candidates),))
+
+
+class TestGroundedBatchScoring(unittest.TestCase):
+    """Test the batch scoring atoms registered with MeTTa."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Initialize MeTTa with the grounded MAGUS components."""
+        try:
+            from magus_init import initialize_magus
+        except ImportError as error:
+            raise unittest.SkipTest(f"hyperon not available: {error}")
+        cls.metta = initialize_magus()
+
+    def test_batch_score_candidates(self):
+        """Scores come back as (Tuple candidate decision-score) in candidate order."""
+        result = self.metta.run(
+            '!(batch-score-candidates '
+            '(Cons (goal-candidate (goal explore 0.8 1.0)) (Cons (action-candidate wait) Nil)) '
+            '(Cons (metagoal learning) Nil) '
+            '(scoring-context (Cons (goal explore 0.8 1.0) Nil) (Cons (modulator arousal 0.5) Nil) 0) '
+            '(Cons 1.0 (Cons 0.5 Nil)))')[0][0]
+        first, rest = result.get_children()[1:]
+        candidate, score = first.get_children()[1:]
+        self.assertEqual(repr(candidate), '(goal-candidate (goal explore 0.8 1.0))')
+        values = [child.get_object().value for child in score.get_children()[1:]]
+        np.testing.assert_allclose(values, [65.0, 0.15 * 0.8, 0.0, 0.0, 65.0 + 0.15 * 0.8])
+        action_score = rest.get_children()[1].get_children()[2]
+        self.assertAlmostEqual(action_score.get_children()[5].get_object().value, 17.5)
+
+    def test_top_k_decisions(self):
+        """The atom keeps the k best entries of a scored list, best first."""
+        result = self.metta.run(
+            '!(top-k-decisions (Cons (a (decision-score 1 0 0 0 3)) '
+            '(Cons (b (decision-score 1 0 0 0 5)) (Cons (c (decision-score 1 0 0 0 4)) Nil))) 2)')
+        self.assertEqual(repr(result[0][0]),
+                         '(Cons (b (decision-score 1 0 0 0 5)) '
+                         '(Cons (c (decision-score 1 0 0 0 4)) Nil))')
+
+
+class TestMeTTaRuleTables(unittest.TestCase):
+    """Test the batch scorer's tables against the MeTTa rules they are copied from."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Load the rules of scoring-v2.metta and scenario-runner.metta."""
+        try:
+            from hyperon import MeTTa
+            from magus_init import load_metta_rules
+        except ImportError as error:
+            raise unittest.SkipTest(f"hyperon not available: {error}")
+        cls.scoring = load_metta_rules(MeTTa(), os.path.join(ROOT, 'M3', 'core', 'scoring-v2.metta'))
+        cls.runner = load_metta_rules(MeTTa(), os.path.join(ROOT, 'M4', 'ethical',
+                                                            'scenario-runner.metta'))
+
+    @staticmethod
+    def rules(metta, pattern, template):
+        """Values of the template for every rule matching a pattern; None for variables."""
+        from hyperon import VariableAtom
+        rows = metta.run(f'!(match &self {pattern} {template})')[0]
+        return [tuple(None if isinstance(child, VariableAtom) else
+                      child.get_name() if hasattr(child, 'get_name') else child.get_object().value
+                      for child in row.get_children()) for row in rows]
+
+    def table(self, pattern):
+        """Per-goal table and catch-all default of a rule with ($n $v) in its pattern."""
+        rows = self.rules(self.scoring, pattern, '($n $v)')
+        defaults = [value for name, value in rows if name is None]
+        self.assertEqual(len(defaults), 1)
+        return {name: value for name, value in rows if name is not None}, defaults[0]
+
+    def test_goal_tables(self):
+        """Cost, novelty and information gain tables equal their MeTTa rules."""
+        self.assertEqual(self.table('(= (estimate-goal-cost $n $p $w) (* $w $v))'),
+                         (batch_scoring.GOAL_COST_FACTORS, batch_scoring.DEFAULT_COST_FACTOR))
+        self.assertEqual(self.table('(= (calculate-novelty $n $c) $v)'),
+                         (batch_scoring.GOAL_NOVELTY, batch_scoring.DEFAULT_NOVELTY))
+        self.assertEqual(self.table('(= (estimate-info-gain $n $p) (* $p $v))'),
+                         (batch_scoring.GOAL_INFO_GAIN, batch_scoring.DEFAULT_INFO_GAIN))
+        self.assertEqual(set(self.rules(self.scoring, '(= (check-goal-synergy $a $b) True)',
+                                        '($a $b)')),
+                         batch_scoring.GOAL_SYNERGIES)
+
+    def test_metagoal_and_overgoal_weights(self):
+        """Metagoal weights and the overgoal bonus equal their MeTTa rules."""
+        weights = self.rules(self.scoring,
+                             '(= (single-metagoal-score $g $c (metagoal $m)) (* $w $t))', '($m $w)')
+        self.assertEqual(dict(weights), batch_scoring.METAGOAL_WEIGHTS)
+        bonus = self.rules(self.scoring, '(= (calculate-overgoal-adjustment $g $c) '
+                                         '(let* (($s $e) ($b (* $w $x))) $r))', '($w)')
+        self.assertEqual(bonus, [(batch_scoring.OVERGOAL_BONUS,)])
+
+    def test_scenario_considerations(self):
+        """Consideration and discouragement scores equal scenario-runner's rules."""
+        def score(pattern):
+            return self.rules(self.runner, pattern, '($v)')
+        self.assertEqual(score('(= (goal-alignment-score (goal-candidate $g) $gs) (* $v $p))'),
+                         [(batch_scoring.GOAL_ALIGNMENT_PER_PRIORITY,)])
+        self.assertEqual(score('(= (goal-alignment-score (action-candidate $a) $gs) $v)'),
+                         [(batch_scoring.ACTION_ALIGNMENT,)])
+        self.assertEqual(score('(= (ethical-value-score (goal-candidate $g)) (* $v $w))'),
+                         [(batch_scoring.GOAL_ETHICAL_VALUE_PER_WEIGHT,)])
+        self.assertEqual(score('(= (ethical-value-score (action-candidate $a)) $v)'),
+                         [(batch_scoring.ACTION_ETHICAL_VALUE,)])
+        self.assertEqual(score('(= (ethical-risk-score (goal-candidate $g)) $v)'),
+                         [(batch_scoring.GOAL_ETHICAL_RISK,)])
+        self.assertEqual(score('(= (ethical-risk-score (action-candidate $a)) $v)'),
+                         [(batch_scoring.ACTION_ETHICAL_RISK,)])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Test file for the MAGUS ethical log store - Python Implementation
+================================================================================
+Validates the indexed ethical log: appends, per-scenario and per-step
+retrieval, bulk clearing, and the grounded logging atoms of scenario-runner.
+================================================================================
+"""
+
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for module_dir in (os.path.join(ROOT, 'M4', 'ethical'), os.path.join(ROOT, 'core')):
+    sys.path.insert(0, module_dir)
+
+from ethical_log import EthicalLogStore
+
+
+class TestEthicalLogStore(unittest.TestCase):
+    """Test suite for EthicalLogStore."""
+
+    def setUp(self):
+        """Set up a log with two interleaved scenarios."""
+        self.store = EthicalLogStore()
+        for step in range(3):
+            self.store.append("rescue", step, 0.5 + step, [("coherence", 0.1)],
+                              [("safety", 0.0)], "move", "success", 2.0)
+            self.store.append("triage", step, 0.2, [], [("hard-veto", 1.0)],
+                              "wait", "failure", 4.0, "vetoed")
+
+    def test_scenario_log_in_append_order(self):
+        """A scenario's log holds only its entries, in append order."""
+        log = self.store.scenario_log("rescue")
+        self.assertEqual([entry.timestep for entry in log], [0, 1, 2])
+        self.assertTrue(all(entry.scenario_id == "rescue" for entry in log))
+        self.assertEqual(log[0].metagoals, (("coherence", 0.1),))
+        self.assertEqual(self.store.scenario_log("unknown"), [])
+
+    def test_step_index(self):
+        """Entries are indexed by (scenario, timestep)."""
+        self.store.append("rescue", 1, 9.0, [], [], "retry", "pending", 1.0)
+        self.assertEqual([entry.score for entry in self.store.step_log("rescue", 1)], [1.5, 9.0])
+        self.assertEqual(self.store.step_log("rescue", 7), [])
+
+    def test_counts(self):
+        """Size and status counts follow appends and clears."""
+        self.assertEqual(len(self.store), 6)
+        self.assertEqual(self.store.count_by_status("failure"), 3)
+        self.assertEqual(self.store.clear_scenario("triage"), 3)
+        self.assertEqual(len(self.store), 3)
+        self.assertEqual(self.store.count_by_status("failure"), 0)
+        self.assertEqual(self.store.scenarios, ["rescue"])
+
+    def test_clear(self):
+        """Clearing drops every scenario at once."""
+        self.store.clear()
+        self.assertEqual(len(self.store), 0)
+        self.assertEqual(list(self.store), [])
+        self.assertEqual(self.store.step_log("rescue", 0), [])
+
+
+class TestGroundedEthicalLog(unittest.TestCase):
+    """Test the logging atoms registered with MeTTa."""
+
+    def setUp(self):
+        """Initialize MeTTa with the grounded MAGUS components."""
+        try:
+            from magus_init import initialize_magus
+        except ImportError as error:
+            self.skipTest(f"hyperon not available: {error}")
+        self.metta = initialize_magus()
+
+    def test_trace_and_retrieve(self):
+        """Logged steps come back as a Cons list of log-entry atoms."""
+        self.metta.run('!(trace-ethical-step test-logging 1 0.75 (list (Tuple metagoal1 0.2)) '
+                       '(list (Tuple antigoal1 0.1)) test-action success 10.0 "Test log")')
+        result = self.metta.run('!(get-scenario-log test-logging)')
+        self.assertEqual(repr(result[0][0]),
+                         '(Cons (log-entry test-logging 1 0.75 (Cons (Tuple metagoal1 0.2) Nil) '
+                         '(Cons (Tuple antigoal1 0.1) Nil) test-action success 10.0 "Test log") Nil)')
+        self.assertEqual(self.metta.run('!(total-log-entries)')[0][0].get_object().value, 1)
+
+    def test_clear_scenario_log(self):
+        """Clearing a scenario leaves an empty log."""
+        self.metta.run('!(trace-ethical-step gone 1 0.5 Nil Nil wait pending 1.0 "")')
+        self.metta.run('!(clear-scenario-log gone)')
+        self.assertEqual(repr(self.metta.run('!(get-scenario-log gone)')[0][0]), 'Nil')
+        self.assertEqual(self.metta.run('!(log-entries-by-status pending)')[0][0]
+                         .get_object().value, 0)
+
+
+class TestScenarioRunnerLog(unittest.TestCase):
+    """Test the logging pipeline of scenario-runner.metta on the grounded store."""
+
+    def setUp(self):
+        """Load scenario-runner.metta on top of the grounded MAGUS components."""
+        try:
+            from magus_init import initialize_magus
+        except ImportError as error:
+            self.skipTest(f"hyperon not available: {error}")
+        self.metta = initialize_magus()
+        with open(os.path.join(ROOT, 'M4', 'ethical', 'scenario-runner.metta'),
+                  encoding='utf-8') as f:
+            self.metta.run(f.read())
+
+    def value(self, expression):
+        """Single grounded value of a MeTTa expression."""
+        result = self.metta.run(f'!{expression}')
+        self.assertEqual(len(result[0]), 1, result)
+        return result[0][0].get_object().value
+
+    def test_trace_ethical_step_end_to_end(self):
+        """Steps traced after loading the runner are stored once and read back in order."""
+        self.metta.run('!(trace-ethical-step rescue 1 0.4 Nil (Cons (Tuple safety 0.0) Nil) '
+                       'move success 10.0 "")')
+        self.metta.run('!(trace-ethical-step rescue 2 0.75 (Cons (Tuple coherence 0.2) Nil) Nil '
+                       'move success 12.0 "ok")')
+        self.metta.run('!(trace-ethical-step triage 1 0.9 Nil (Cons (Tuple hard-veto 1.0) Nil) '
+                       'wait failure 4.0 "vetoed")')
+        log = self.metta.run('!(get-scenario-log rescue)')[0]
+        self.assertEqual([repr(atom) for atom in log],
+                         ['(Cons (log-entry rescue 1 0.4 Nil (Cons (Tuple safety 0.0) Nil) '
+                          'move success 10.0 "") (Cons (log-entry rescue 2 0.75 '
+                          '(Cons (Tuple coherence 0.2) Nil) Nil move success 12.0 "ok") Nil))'])
+        step = self.metta.run('!(get-scenario-step-log triage 1)')[0]
+        self.assertEqual([repr(atom) for atom in step],
+                         ['(Cons (log-entry triage 1 0.9 Nil (Cons (Tuple hard-veto 1.0) Nil) '
+                          'wait failure 4.0 "vetoed") Nil)'])
+        self.assertEqual(self.value('(total-log-entries)'), 3)
+        self.assertEqual(self.value('(log-entries-by-status success)'), 2)
+
+        self.metta.run('!(clear-scenario-log rescue)')
+        self.assertEqual(repr(self.metta.run('!(get-scenario-log rescue)')[0][0]), 'Nil')
+        self.assertEqual(self.value('(total-log-entries)'), 1)
+        self.metta.run('!(clear-all-logs)')
+        self.assertEqual(self.value('(total-log-entries)'), 0)
+
+
+class TestPlainMeTTaGuard(unittest.TestCase):
+    """Test that scenario-runner.metta refuses a MeTTa instance without grounded atoms."""
+
+    def test_plain_metta_reports_error(self):
+        """Loading into a plain MeTTa() returns an Error; initialize_magus passes the check."""
+        try:
+            from hyperon import MeTTa
+            from magus_init import initialize_magus
+        except ImportError as error:
+            self.skipTest(f"hyperon not available: {error}")
+        with open(os.path.join(ROOT, 'M4', 'ethical', 'scenario-runner.metta'),
+                  encoding='utf-8') as f:
+            source = f.read()
+        errors = [repr(atom) for results in MeTTa().run(source) for atom in results
+                  if repr(atom).startswith('(Error')]
+        self.assertEqual(errors, ['(Error scenario-runner.metta '
+                                  '"grounded MAGUS atoms missing; use initialize_magus()")'])
+        self.assertFalse([atom for results in initialize_magus().run(source) for atom in results
+                          if repr(atom).startswith('(Error')])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test file for the MAGUS ethical log writer - Python Implementation
+================================================================================
+Validates batching, compression and rotation of the JSON lines writer, and that
+its output is read back by the M4 metrics aggregator.
+================================================================================
+"""
+
+import gzip
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for module_dir in (os.path.join(ROOT, 'M4', 'ethical'), os.path.join(ROOT, 'M4', 'evaluation'),
+                   os.path.join(ROOT, 'core')):
+    sys.path.insert(0, module_dir)
+
+from ethical_log import EthicalLogStore
+from log_writer import JsonlLogWriter, entry_record
+
+
+class TestJsonlLogWriter(unittest.TestCase):
+    """Test suite for JsonlLogWriter."""
+
+    def setUp(self):
+        """Set up a temporary directory and a few log entries."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+        store = EthicalLogStore()
+        self.entries = [
+            store.append("rescue", step, 0.5, [("coherence", 0.1), ("learning", -0.2)],
+                         [("hard-veto", 1.0), ("energy", 0.3), ("risk", 0.0)],
+                         "move", "success", 2.5)
+            for step in range(5)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read_lines(self, path):
+        opener = gzip.open if path.suffix == '.gz' else open
+        with opener(path, 'rt') as f:
+            return [json.loads(line) for line in f]
+
+    def test_record_fields(self):
+        """Records carry the keys and violation counts read by metrics.py."""
+        record = entry_record(self.entries[0], "full-system", timestamp="t")
+        self.assertEqual(record, {
+            "scenarioId": "rescue", "configuration": "full-system", "decisionScore": 0.5,
+            "latencyMs": 2.5, "hardViolations": 1, "softViolations": 1,
+            "metagoal": {"coherence": 0.1, "learning": -0.2},
+            "antigoal": {"hard-veto": 1.0, "energy": 0.3, "risk": 0.0},
+            "plan": "move", "timestamp": "t"})
+
+    def test_batched_flush(self):
+        """Entries reach the file only in full batches or on close."""
+        path = self.root / 'ethical.jsonl'
+        writer = JsonlLogWriter(path, batch_size=2)
+        for entry in self.entries[:3]:
+            writer.write(entry)
+        self.assertEqual(len(self.read_lines(path)), 2)
+        writer.close()
+        self.assertEqual(len(self.read_lines(path)), 3)
+        self.assertEqual(writer.written, 3)
+
+    def test_gzip_appends(self):
+        """Compressed files stay readable across several flushes."""
+        with JsonlLogWriter(self.root / 'ethical.jsonl', compress=True, batch_size=2) as writer:
+            for entry in self.entries:
+                writer.write(entry)
+        self.assertEqual(writer.path.name, 'ethical.jsonl.gz')
+        self.assertEqual(len(self.read_lines(writer.path)), 5)
+
+    def test_rotation(self):
+        """Files over the size limit move to numbered segments; nothing is lost."""
+        with JsonlLogWriter(self.root / 'ethical.jsonl', batch_size=1, max_bytes=1) as writer:
+            for entry in self.entries[:3]:
+                writer.write(entry)
+        names = sorted(path.name for path in self.root.iterdir())
+        self.assertEqual(names, ['ethical.1.jsonl', 'ethical.2.jsonl', 'ethical.3.jsonl'])
+        self.assertEqual(sum(len(self.read_lines(self.root / name)) for name in names), 3)
+
+    def test_metrics_aggregator_reads_output(self):
+        """Plain and compressed logs are loaded by MetricsAggregator."""
+        from metrics import MetricsAggregator
+        with JsonlLogWriter(self.root / 'logs' / 'a.jsonl', "full-system") as writer:
+            writer.write(self.entries[0])
+        with JsonlLogWriter(self.root / 'logs' / 'b.jsonl', "full-system", compress=True) as writer:
+            writer.write(self.entries[1])
+        aggregator = MetricsAggregator(self.root / 'results', self.root / 'figures')
+        aggregator.load_all_logs(self.root / 'logs')
+        aggregated = aggregator.aggregate_by_configuration()["full-system"]
+        self.assertEqual(aggregated.hard_violations_total, 2)
+        self.assertAlmostEqual(aggregated.decision_latency_mean, 2.5)
+
+
+class TestGroundedLogWriter(unittest.TestCase):
+    """Test streaming trace-ethical-step to a writer through MeTTa."""
+
+    def test_trace_streams_to_writer(self):
+        """Traced steps are written on flush-ethical-log and export-ethical-log."""
+        try:
+            from magus_init import initialize_magus
+        except ImportError as error:
+            self.skipTest(f"hyperon not available: {error}")
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'run.jsonl'
+            metta = initialize_magus(log_writer=JsonlLogWriter(path, "full-system"))
+            metta.run('!(trace-ethical-step rescue 1 0.75 (list (Tuple coherence 0.2)) '
+                      '(list (Tuple hard-veto 1.0)) move success 10.0 "ok")')
+            self.assertFalse(path.exists())
+            metta.run('!(flush-ethical-log)')
+            with open(path) as f:
+                record = json.loads(f.readline())
+            self.assertEqual(record["scenarioId"], "rescue")
+            self.assertEqual(record["hardViolations"], 1)
+
+            export = Path(directory) / 'export.jsonl'
+            metta.run(f'!(export-ethical-log "{export.as_posix()}")')
+            with open(export) as f:
+                self.assertEqual(len(f.readlines()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -9,6 +9,9 @@ from hyperon import MeTTa
 from pathlib import Path
 import sys
 
+sys.path.insert(0, str(Path(__file__).parent.parent / 'core'))
+from magus_init import initialize_magus
+
 def print_section(title):
     """Print formatted section header"""
     print(f"\n{'='*70}")
@@ -74,7 +77,8 @@ def test_ethical_logging():
     """Test ethical logging pipeline"""
     print_section("ETHICAL LOGGING TEST")
 
-    metta = MeTTa()
+    # The ethical log atoms are grounded by magus_init (M4/ethical/ethical_log.py)
+    metta = initialize_magus(MeTTa())
     base_dir = Path(__file__).parent.parent
 
     # Load modules
@@ -121,6 +125,7 @@ def test_ethical_logging():
     result = metta.run('!(get-scenario-log test-logging)')
     assert result, "FAIL: Could not retrieve log"
     assert len(result) > 0, "FAIL: Log should contain entries"
+    assert 'log-entry test-logging 1 0.75' in str(result[0]), f"FAIL: Missing entry in {result[0]}"
     print(f"SUCCESS: Retrieved log entries: {len(result)} entries")
     return True
 
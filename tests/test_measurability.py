@@ -15,12 +15,21 @@ integration testing with other system components.
 import unittest
 import sys
 import os
+import tempfile
 from typing import Dict, List, Tuple
 
-# Add the current directory to the path to import our module
+import numpy as np
+
+# Add the current directory to the path to import our module, and the
+# correlation module for the satisfaction stores
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'correlation'))
 
+import initial_measurability_calculation
 from initial_measurability_calculation import MeasurabilityCalculator, Goal
+from measurability_estimator import estimate_clarity, estimate_confidence, noise_variances
+from online_measurability import RunningGoalStatistics
+from satisfaction_store import FileSatisfactionStore, SatisfactionStore
 
 
 class TestMeasurabilityCalculations(unittest.TestCase):
@@ -355,6 +364,276 @@ class TestMeasurabilityCalculations(unittest.TestCase):
         self.assertTrue(result_custom)
 
 
+class TestWeightedCorrelationMatrix(unittest.TestCase):
+    """
+    Test suite for the batched measurability-weighted correlation matrix.
+    
+    Educational Note:
+    The broadcasted matrix must equal get_weighted_correlation applied to
+    every pair of goals.
+    """
+
+    def setUp(self):
+        """Set up a calculator and a symmetric correlation matrix."""
+        self.calculator = MeasurabilityCalculator()
+        self.goals = [Goal.ENERGY, Goal.EXPLORATION, Goal.AFFINITY]
+        self.corr = np.array([[1.0, 0.7, 0.5],
+                              [0.7, 1.0, 0.3],
+                              [0.5, 0.3, 1.0]])
+
+    def test_matches_pairwise_weighting(self):
+        """Every entry equals the per-pair geometric-mean weighting."""
+        weighted = self.calculator.weighted_correlation_matrix(self.corr, self.goals)
+        for i, goal1 in enumerate(self.goals):
+            for j, goal2 in enumerate(self.goals):
+                self.assertAlmostEqual(
+                    weighted[i, j],
+                    self.calculator.get_weighted_correlation(goal1, goal2, self.corr[i, j]))
+        np.testing.assert_allclose(weighted, weighted.T)
+
+    def test_shape_mismatch(self):
+        """A matrix that does not match the goal list is rejected."""
+        self.assertRaises(ValueError, self.calculator.weighted_correlation_matrix,
+                          self.corr, self.goals[:2])
+
+
+class TestMeasurabilityEstimator(unittest.TestCase):
+    """
+    Test suite for the data-driven, batched measurability estimator.
+    
+    Educational Note:
+    Noisier, sparser or less complete data must lower confidence, and
+    disagreeing redundant sensors must lower clarity.
+    """
+
+    def setUp(self):
+        """Set up slowly drifting satisfaction signals for a batch of goals."""
+        self.rng = np.random.default_rng(9)
+        self.timestamps = np.arange(500, dtype=float)
+        self.signal = 0.5 + 0.2 * np.sin(self.timestamps / 50.0)
+
+    def test_noise_ignores_slow_drift(self):
+        """Successive differences measure jitter, not the drifting signal."""
+        noisy = self.signal + self.rng.normal(0, 0.05, 500)
+        variances = noise_variances(np.vstack([self.signal, noisy]))
+        self.assertLess(variances[0], 1e-3)
+        self.assertAlmostEqual(float(np.sqrt(variances[1])), 0.05, delta=0.01)
+
+    def test_confidence_factors(self):
+        """Noise, a low sample rate and missing data each lower confidence."""
+        clean = self.signal.copy()
+        noisy = self.signal + self.rng.normal(0, 0.1, 500)
+        gappy = self.signal.copy()
+        gappy[::2] = np.nan
+        confidence = estimate_confidence(np.vstack([clean, noisy, gappy]), self.timestamps)
+        self.assertGreater(confidence[0], 0.95)
+        self.assertLess(confidence[1], confidence[0])
+        self.assertAlmostEqual(confidence[2], 0.25, delta=0.02)
+        slow = estimate_confidence(clean[None, :], self.timestamps * 4)
+        self.assertAlmostEqual(float(slow[0]), confidence[0] / 4, delta=0.01)
+
+    def test_clarity_from_redundant_agreement(self):
+        """Agreeing sensors give high clarity, disagreeing sensors low clarity."""
+        agreeing = self.signal + self.rng.normal(0, 0.01, (3, 500))
+        disagreeing = self.signal + self.rng.normal(0, 0.3, (3, 500))
+        single = np.vstack([self.signal, np.full(500, np.nan), np.full(500, np.nan)])
+        clarity = estimate_clarity(np.stack([agreeing, disagreeing, single]))
+        self.assertGreater(clarity[0], 0.9)
+        self.assertLess(clarity[1], 0.3)
+        self.assertTrue(np.isnan(clarity[2]))
+
+    def test_refresh_replaces_static_tables(self):
+        """Refreshed goals use estimates; the others keep the static values."""
+        calculator = MeasurabilityCalculator()
+        redundant = self.signal + self.rng.normal(0, 0.01, (1, 3, 500))
+        calculator.refresh_estimates([Goal.ENERGY], self.signal[None, :], self.timestamps, redundant)
+        self.assertGreater(calculator.calculate_confidence(Goal.ENERGY), 0.95)
+        self.assertGreater(calculator.calculate_clarity(Goal.ENERGY), 0.9)
+        self.assertAlmostEqual(calculator.get_measurability(Goal.AFFINITY), 0.20)
+        calculator.refresh_estimates(["exploration"], self.signal[None, :], self.timestamps)
+        self.assertAlmostEqual(calculator.calculate_clarity(Goal.EXPLORATION), 0.8)
+
+    def test_batch_of_thousands_of_goals(self):
+        """Thousands of goals are estimated in one vectorized refresh."""
+        goals = 2000
+        samples = self.signal + self.rng.normal(0, 0.05, (goals, 500))
+        redundant = samples[:, None, :] + self.rng.normal(0, 0.02, (goals, 3, 500))
+        calculator = MeasurabilityCalculator()
+        estimates = calculator.refresh_estimates(
+            [f"goal-{i}" for i in range(goals)], samples, self.timestamps, redundant)
+        self.assertEqual(estimates["measurability"].shape, (goals,))
+        self.assertTrue(np.all((estimates["measurability"] > 0) & (estimates["measurability"] < 1)))
+        self.assertAlmostEqual(calculator.get_measurability("goal-7"),
+                               float(estimates["measurability"][7]))
+
+
+class TestOnlineMeasurability(unittest.TestCase):
+    """
+    Test suite for constant-memory running measurability statistics.
+    
+    Educational Note:
+    Folding readings in one at a time must give the same mean, variance and
+    confidence as computing them over the whole history at once.
+    """
+
+    def setUp(self):
+        """Set up a noisy, regularly sampled reading stream."""
+        rng = np.random.default_rng(21)
+        self.timestamps = np.arange(400, dtype=float)
+        self.values = 0.6 + rng.normal(0, 0.05, 400)
+
+    def test_running_statistics_match_batch(self):
+        """Welford mean/variance and online confidence agree with the batch results."""
+        statistics = RunningGoalStatistics()
+        for value, timestamp in zip(self.values, self.timestamps):
+            statistics.update(value, timestamp)
+        self.assertAlmostEqual(statistics.mean, float(self.values.mean()))
+        self.assertAlmostEqual(statistics.variance, float(self.values.var()))
+        self.assertAlmostEqual(statistics.noise_variance,
+                               float(noise_variances(self.values[None, :])[0]))
+        self.assertAlmostEqual(statistics.confidence(),
+                               float(estimate_confidence(self.values[None, :], self.timestamps)[0]))
+        self.assertEqual(statistics.gap_count, 0)
+
+    def test_gaps_reduce_confidence(self):
+        """A long silence is recorded as a gap and lowers confidence."""
+        statistics = RunningGoalStatistics()
+        for timestamp in [0.0, 1.0, 2.0, 12.0, 13.0]:
+            statistics.update(0.5, timestamp)
+        self.assertEqual(statistics.gap_count, 1)
+        self.assertEqual(statistics.longest_gap, 10.0)
+        # The gap skipped 9 readings at the expected interval of 1.0
+        self.assertEqual(statistics.missing_count, 9)
+        self.assertAlmostEqual(statistics.missing_ratio, 9.0 / 14.0)
+        self.assertRaises(ValueError, statistics.update, 0.5, 5.0)
+
+    def test_non_finite_readings_are_skipped(self):
+        """NaN and infinite readings leave the running statistics untouched."""
+        statistics, finite = RunningGoalStatistics(), RunningGoalStatistics()
+        for value, timestamp in zip(self.values[:50], self.timestamps[:50]):
+            self.assertTrue(statistics.update(value, timestamp))
+            finite.update(value, timestamp)
+        self.assertFalse(statistics.update(float('nan'), 50.0))
+        self.assertFalse(statistics.update(float('inf'), 51.0))
+        self.assertEqual(statistics.summary(), finite.summary())
+        calculator = MeasurabilityCalculator()
+        calculator.observe(Goal.ENERGY, 0.5, 0.0)
+        version = calculator.version
+        calculator.observe(Goal.ENERGY, float('-inf'), 1.0)
+        self.assertEqual(calculator.version, version)
+        self.assertEqual(calculator.get_running_statistics(Goal.ENERGY)["count"], 1)
+
+    def test_sparse_regular_readings_are_not_missing(self):
+        """Readings every 5 time units miss nothing; only the sample rate lowers confidence."""
+        statistics = RunningGoalStatistics()
+        for timestamp in range(0, 100, 5):
+            statistics.update(0.5, float(timestamp))
+        self.assertEqual(statistics.gap_count, 0)
+        self.assertEqual(statistics.missing_ratio, 0.0)
+        self.assertAlmostEqual(statistics.confidence(), 20 / 95)
+
+    def test_observe_drives_get_measurability(self):
+        """Observed goals use running confidence; others keep static values."""
+        calculator = MeasurabilityCalculator()
+        calculator.observe(Goal.ENERGY, 0.5, 0.0)
+        self.assertAlmostEqual(calculator.get_measurability(Goal.ENERGY), 0.72)
+        for value, timestamp in zip(self.values, self.timestamps):
+            calculator.observe("energy", value, timestamp)
+        expected = calculator.get_running_statistics(Goal.ENERGY)["confidence"] * 0.9
+        self.assertAlmostEqual(calculator.get_measurability(Goal.ENERGY), expected)
+        self.assertEqual(calculator.get_running_statistics(Goal.ENERGY)["count"], 401)
+        self.assertAlmostEqual(calculator.get_measurability(Goal.AFFINITY), 0.20)
+
+    def test_components_follow_observed_confidence(self):
+        """Stored-component lookups agree with calculate_* once a goal is observed."""
+        calculator = MeasurabilityCalculator()
+        for value, timestamp in zip(self.values, self.timestamps):
+            calculator.observe(Goal.ENERGY, value, timestamp)
+        confidence = calculator.calculate_confidence(Goal.ENERGY)
+        self.assertNotAlmostEqual(confidence, 0.8)
+        self.assertEqual(calculator.get_measurement_confidence(Goal.ENERGY), confidence)
+        goal, component_confidence, clarity, measurability = \
+            calculator.get_measurability_components(Goal.ENERGY)
+        self.assertEqual(component_confidence, confidence)
+        self.assertAlmostEqual(measurability, calculator.get_measurability(Goal.ENERGY))
+
+    def test_observed_goal_outside_magus(self):
+        """A goal outside the static tables gets default clarity once observed."""
+        calculator = MeasurabilityCalculator()
+        self.assertEqual(calculator.get_measurability("safety"), 0.0)
+        self.assertRaises(KeyError, calculator.get_measurability_components, "safety")
+        calculator.observe("safety", 0.5, 0.0)
+        self.assertEqual(calculator.get_measurability_components("safety"),
+                         ("safety", 0.0, initial_measurability_calculation.DEFAULT_CLARITY, 0.0))
+        for value, timestamp in zip(self.values[1:10], self.timestamps[1:10]):
+            calculator.observe("safety", value, timestamp)
+        confidence = calculator.get_running_statistics("safety")["confidence"]
+        self.assertGreater(confidence, 0.0)
+        self.assertAlmostEqual(calculator.get_measurability("safety"), confidence)
+        goal, component_confidence, clarity, measurability = \
+            calculator.get_measurability_components("safety")
+        self.assertEqual((component_confidence, clarity), (confidence, 1.0))
+        self.assertAlmostEqual(measurability, calculator.get_measurability("safety"))
+        self.assertEqual(calculator.get_measurability("unobserved"), 0.0)
+
+
+class TestStoreBackedMeasurability(unittest.TestCase):
+    """
+    Test suite for reading satisfaction history from a memory-mapped store.
+    
+    Educational Note:
+    Chunked statistics must agree with NumPy's whole-array results no matter
+    where the chunk boundaries fall.
+    """
+
+    def setUp(self):
+        """Write a store with missing readings to a temporary directory."""
+        self.directory = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(3)
+        rows = rng.random((1000, 3))
+        rows[rng.random(1000) < 0.3, 2] = np.nan
+        self.rows = rows
+        memory = SatisfactionStore.from_samples([goal.value for goal in Goal], rows)
+        self.store = memory.save(os.path.join(self.directory.name, "history"))
+
+    def tearDown(self):
+        """Remove the temporary store."""
+        self.directory.cleanup()
+
+    def test_chunked_statistics_match_numpy(self):
+        """Statistics merged across chunks equal the whole-column results."""
+        original = initial_measurability_calculation.STATISTICS_CHUNK_ROWS
+        initial_measurability_calculation.STATISTICS_CHUNK_ROWS = 97
+        try:
+            calculator = MeasurabilityCalculator(store=self.store)
+            for index, goal in enumerate(Goal):
+                stats = calculator.get_sample_statistics(goal)
+                column = self.rows[:, index]
+                self.assertEqual(stats["readings"], 1000)
+                self.assertEqual(stats["observed"], int(np.count_nonzero(~np.isnan(column))))
+                self.assertAlmostEqual(stats["mean"], float(np.nanmean(column)))
+                self.assertAlmostEqual(stats["variance"], float(np.nanvar(column)))
+        finally:
+            initial_measurability_calculation.STATISTICS_CHUNK_ROWS = original
+
+    def test_reopened_store_is_memory_mapped(self):
+        """A reopened store pages columns from disk and keeps appending."""
+        reopened = FileSatisfactionStore(self.store.directory)
+        self.assertIsInstance(reopened.column(Goal.ENERGY), np.memmap)
+        reopened.extend([1000.0], [[0.5, 0.5, 0.5]])
+        self.assertEqual(len(FileSatisfactionStore(self.store.directory)), 1001)
+        self.assertRaises(ValueError, MeasurabilityCalculator().get_sample_statistics, Goal.ENERGY)
+
+    def test_refresh_from_store(self):
+        """Estimates can be refreshed straight from a memory-mapped store."""
+        calculator = MeasurabilityCalculator(store=self.store)
+        estimates = calculator.refresh_from_store()
+        self.assertEqual(estimates["confidence"].shape, (3,))
+        # Affinity misses about 30% of its readings
+        self.assertLess(calculator.calculate_confidence(Goal.AFFINITY),
+                        calculator.calculate_confidence(Goal.ENERGY))
+
+
 def run_manual_tests():
     """
     Run manual tests that mirror the MeTTa test structure.
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test file for the MAGUS metagoals rolling correlation - Python Implementation
+================================================================================
+Runs get-rolling-correlation from M3/core/metagoals.metta on top of the
+grounded windowed correlation store registered by core/magus_init.py.
+
+Educational Note:
+The rule is loaded on its own, with goal-name and a fixed get-correlation table
+standing in for the M2 MeTTa modules, so the tests exercise the real rule text
+without the relative module paths metagoals.metta loads at its top.
+================================================================================
+"""
+
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'core'))
+
+METAGOALS = os.path.join(ROOT, 'M3', 'core', 'metagoals.metta')
+
+
+def metric_records(samples):
+    """Newest-first Cons list of metric-record atoms for (energy, exploration, timestamp) samples."""
+    records = 'Nil'
+    for energy, exploration, timestamp in samples:
+        records = (f'(Cons (metric-record (goal energy 0.8 1.0) {energy} {timestamp}) '
+                   f'(Cons (metric-record (goal exploration 0.5 1.0) {exploration} {timestamp}) '
+                   f'{records}))')
+    return records
+
+
+class TestRollingCorrelation(unittest.TestCase):
+    """Test get-rolling-correlation against the grounded windowed store."""
+
+    def setUp(self):
+        """Initialize MeTTa and load the rolling correlation rule."""
+        try:
+            from magus_init import initialize_magus, register_grounded_correlation
+        except ImportError as error:
+            raise unittest.SkipTest(f"hyperon not available: {error}")
+        from windowed_correlation import WindowedCorrelationStore
+        self.store = WindowedCorrelationStore()
+        self.metta = register_grounded_correlation(initialize_magus(), self.store)
+        with open(METAGOALS) as f:
+            source = f.read()
+        rule = source[source.index('(: get-rolling-correlation'):
+                      source.index(';; Calculate correlation using M2')]
+        self.metta.run('(= (goal-name (goal $name $priority $weight)) $name)\n'
+                       '(= (get-correlation energy exploration) 0.7)\n' + rule)
+
+    def rolling(self, records, start, end):
+        """Run get-rolling-correlation for energy and exploration over a window."""
+        result = self.metta.run(
+            f'!(get-rolling-correlation (goal energy 0.8 1.0) (goal exploration 0.5 1.0) '
+            f'{records} (metric-window {start} {end}))')
+        return float(result[0][0].get_object().value)
+
+    def test_empty_window_falls_back_to_m2(self):
+        """Without pair samples in the window the M2 correlation is used."""
+        self.assertEqual(self.rolling('Nil', 0, 1000), 0.7)
+        records = metric_records([(0.1, 0.1, 5), (0.2, 0.2, 6)])
+        self.assertEqual(self.rolling(records, 100, 1100), 0.7)
+
+    def test_metrics_feed_the_window(self):
+        """Pair samples in $metrics drive the MIC; repeated lists add nothing twice."""
+        records = metric_records([(i / 40, i / 40, i) for i in range(40)])
+        self.assertAlmostEqual(self.rolling(records, 0, 29), 1.0, places=9)
+        self.assertEqual(self.store.get_data_count("energy", "exploration"), 30)
+        self.assertAlmostEqual(self.rolling(records, 10, 39), 1.0, places=9)
+        self.assertEqual(self.store.get_data_count("energy", "exploration"), 30)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
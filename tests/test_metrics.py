@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""
+Test file for the MAGUS evaluation metrics - Python Implementation
+================================================================================
+Validates that streaming aggregation of JSON lines logs gives the same summary
+as loading every metric record, while keeping no records.
+================================================================================
+"""
+
+import csv
+import gzip
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'M4', 'evaluation'))
+
+import metrics
+from metrics import (LOG_DECODERS, ConfigurationAggregate, LatencyHistogram, LogEntry,
+                     MetricRecord, MetricsAggregator, MetricTable, RunningStats)
+
+
+def write_log(path, records):
+    """Write records as a JSON lines log file."""
+    with open(path, 'w') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+
+
+class TestRunningStats(unittest.TestCase):
+    """Test suite for RunningStats and ConfigurationAggregate."""
+
+    def test_add_and_merge(self):
+        """Count, sum, min, max and mean survive splitting the values in two."""
+        left, right, whole = RunningStats(), RunningStats(), RunningStats()
+        for value in (3.0, -1.0, 4.0):
+            left.add(value)
+            whole.add(value)
+        for value in (1.5, 9.0):
+            right.add(value)
+            whole.add(value)
+        left.merge(right)
+        self.assertEqual(left, whole)
+        self.assertEqual((left.count, left.minimum, left.maximum), (5, -1.0, 9.0))
+        self.assertAlmostEqual(left.mean, 16.5 / 5)
+
+    def test_empty(self):
+        """Empty statistics have mean 0.0 and merge as a no-op."""
+        stats = RunningStats()
+        self.assertEqual(stats.mean, 0.0)
+        stats.add(2.0)
+        stats.merge(RunningStats())
+        self.assertEqual((stats.count, stats.minimum, stats.maximum), (1, 2.0, 2.0))
+
+    def test_aggregate_merge(self):
+        """Merging aggregates unions scenarios and merges every metric."""
+        first, second = ConfigurationAggregate(), ConfigurationAggregate()
+        first.add("a", "plan-length", 2.0)
+        second.add("b", "plan-length", 4.0)
+        second.add("b", "decision-latency-ms", 1.0)
+        first.merge(second)
+        summary = first.summarize("full")
+        self.assertEqual(summary.total_scenarios, 2)
+        self.assertEqual(summary.plan_length_mean, 3.0)
+        self.assertEqual(summary.decision_latency_mean, 1.0)
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    """Test suite for LatencyHistogram."""
+
+    def setUp(self):
+        """Set up heavy-tailed latencies."""
+        self.values = np.random.default_rng(7).lognormal(mean=1.0, sigma=1.0, size=5000)
+
+    def test_percentiles_within_bucket_error(self):
+        """Percentiles are within 0.5% of the exact nearest-rank values."""
+        histogram = LatencyHistogram()
+        for value in self.values:
+            histogram.add(value)
+        ordered = np.sort(self.values)
+        for percent in (50, 90, 99, 99.9):
+            exact = ordered[int(np.ceil(percent / 100 * len(ordered))) - 1]
+            self.assertAlmostEqual(histogram.percentile(percent) / exact, 1.0, delta=0.005)
+        self.assertEqual(histogram.percentiles()['max'], ordered[-1])
+        self.assertEqual(histogram.percentile(100), ordered[-1])
+
+    def test_merge_equals_whole(self):
+        """Histograms of two shards merge into the histogram of all values."""
+        whole, left, right = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for i, value in enumerate(self.values):
+            whole.add(value)
+            (left if i % 3 else right).add(value)
+        left.merge(right)
+        self.assertEqual(left, whole)
+
+    def test_empty_and_tiny(self):
+        """No values give zeros; values below the floor share bucket 0."""
+        self.assertEqual(LatencyHistogram().percentiles(),
+                         {'p50': 0.0, 'p90': 0.0, 'p99': 0.0, 'p999': 0.0, 'max': 0.0})
+        histogram = LatencyHistogram()
+        histogram.add(0.0)
+        self.assertEqual(histogram.percentile(50), 0.0)
+
+    def test_non_finite_values_are_dropped(self):
+        """NaN and infinite latencies are counted as dropped, not bucketed."""
+        histogram, finite = LatencyHistogram(), LatencyHistogram()
+        for value in (5.0, float('nan'), float('inf'), 7.0, float('-inf')):
+            histogram.add(value)
+        for value in (5.0, 7.0):
+            finite.add(value)
+        self.assertEqual((histogram.count, histogram.dropped), (2, 3))
+        self.assertEqual(histogram.percentiles(), finite.percentiles())
+        histogram.merge(LatencyHistogram(dropped=2))
+        self.assertEqual(LatencyHistogram.from_dict(histogram.to_dict()), histogram)
+        self.assertEqual(histogram.dropped, 5)
+        legacy = finite.to_dict()
+        del legacy['dropped']
+        self.assertEqual(LatencyHistogram.from_dict(legacy), finite)
+
+    def test_fill_histograms_drops_non_finite(self):
+        """Grouped histograms drop the same values as adding them one by one."""
+        values = np.array([5.0, np.nan, 7.0, np.inf, np.nan, 3.0])
+        groups = np.array([0, 0, 1, 1, 2, 0])
+        expected = {}
+        for key, value in zip(groups.tolist(), values.tolist()):
+            expected.setdefault(key, LatencyHistogram()).add(value)
+        self.assertEqual(metrics.fill_histograms(groups, values), expected)
+        self.assertEqual(metrics.fill_histograms(groups[[1]], values[[1]]),
+                         {0: LatencyHistogram(dropped=1)})
+
+
+class TestMetricTable(unittest.TestCase):
+    """Test suite for MetricTable."""
+
+    def setUp(self):
+        """Set up random records over a few scenarios, configurations and metrics."""
+        rng = np.random.default_rng(11)
+        names = ['decision-latency-ms', 'plan-length', 'hard-violation-count']
+        self.records = [
+            MetricRecord(f"s{rng.integers(5)}", f"c{rng.integers(3)}", names[rng.integers(3)],
+                         float(rng.lognormal(2.0, 1.0)), None if i % 2 else f"t{i // 10}")
+            for i in range(2000)]
+        self.table = MetricTable.from_records(self.records)
+
+    def test_interned_columns(self):
+        """Strings are stored once; records round-trip through codes and labels."""
+        self.assertEqual(len(self.table), 2000)
+        self.assertEqual(len(self.table.labels('metric_name')), 3)
+        self.assertEqual(self.table.codes('configuration').dtype, np.int32)
+        self.assertEqual(self.table.values.dtype, np.float64)
+        self.assertEqual(list(self.table), self.records)
+
+    def test_aggregate_matches_record_loop(self):
+        """Column-wise grouping equals folding the records one by one."""
+        expected = {}
+        for record in self.records:
+            expected.setdefault(record.configuration, ConfigurationAggregate()).add(
+                record.scenario_id, record.metric_name, record.value)
+        actual = self.table.aggregate()
+        self.assertEqual(set(actual), set(expected))
+        for config, aggregate in expected.items():
+            result = actual[config]
+            self.assertEqual(result.scenarios, aggregate.scenarios)
+            self.assertEqual(result.latency, aggregate.latency)
+            self.assertEqual(dict(result.scenario_latency), dict(aggregate.scenario_latency))
+            for name, stats in aggregate.stats.items():
+                self.assertEqual((result.stats[name].count, result.stats[name].minimum,
+                                  result.stats[name].maximum),
+                                 (stats.count, stats.minimum, stats.maximum))
+                self.assertAlmostEqual(result.stats[name].total, stats.total)
+
+    def test_empty(self):
+        """An empty table has no aggregates."""
+        self.assertEqual(MetricTable().aggregate(), {})
+
+
+class TestLogDecoders(unittest.TestCase):
+    """Test suite for the JSON decoder backends."""
+
+    def setUp(self):
+        """Set up a log file with a full entry, a sparse entry and a malformed line."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / 'log.jsonl'
+        with open(self.path, 'w') as f:
+            f.write(json.dumps({"scenarioId": "s1", "configuration": "full", "decisionScore": 1,
+                                "latencyMs": 2.5, "hardViolations": 0, "softViolations": 2,
+                                "metagoal": {"learning": -0.5}, "antigoal": {"risk": 0.25},
+                                "plan": ["a", "b"], "timestamp": "t0", "extra": [1]}) + '\n')
+            f.write('{"latencyMs": 4}\n\n{"scenarioId": "s2",\n')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_backends_agree(self):
+        """Every installed backend decodes the same entries and skips the bad line."""
+        expected = [
+            LogEntry("s1", "full", 1, 2.5, 0, 2, {"learning": -0.5}, {"risk": 0.25}, ["a", "b"], "t0"),
+            LogEntry(latencyMs=4),
+        ]
+        for backend in LOG_DECODERS:
+            with self.subTest(backend=backend):
+                entries = list(MetricsAggregator.iter_log_entries(self.path, backend))
+                self.assertEqual([tuple(getattr(entry, name) for name in LogEntry._fields)
+                                  for entry in entries], [tuple(entry) for entry in expected])
+
+    def test_entry_metric_values(self):
+        """Decoded entries yield the metrics of the equivalent JSON object."""
+        entry = next(MetricsAggregator.iter_log_entries(self.path, 'json'))
+        self.assertEqual(dict(MetricsAggregator.entry_metric_values(entry)), {
+            'goal-satisfaction-after': 1.0, 'decision-latency-ms': 2.5,
+            'hard-violation-count': 0.0, 'soft-violation-count': 2.0,
+            'metagoal-contribution-total': 0.5, 'antigoal-penalty-total': 0.25, 'plan-length': 2.0})
+
+    def test_unknown_backend(self):
+        """Backends that are not installed are rejected."""
+        with self.assertRaises(ValueError):
+            list(MetricsAggregator.iter_log_entries(self.path, 'ujson'))
+
+
+class TestStreamingAggregation(unittest.TestCase):
+    """Test suite for MetricsAggregator.load_all_logs(streaming=True)."""
+
+    def setUp(self):
+        """Set up two log files covering two configurations."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+        self.logs = self.root / 'logs'
+        self.logs.mkdir()
+        records = [
+            {"scenarioId": f"s{i % 3}", "configuration": "full" if i % 2 else "no-antigoal",
+             "decisionScore": 0.1 * i, "latencyMs": 5.0 + i, "hardViolations": i % 2,
+             "softViolations": 1, "metagoal": {"coherence": 0.1, "learning": -0.05 * i},
+             "antigoal": {"energy": 0.2 * i, "risk": -0.1}, "plan": ["move"] * (i % 4)}
+            for i in range(20)]
+        write_log(self.logs / 'a.jsonl', records[:12])
+        write_log(self.logs / 'b.jsonl', records[12:])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def aggregator(self):
+        """Fresh aggregator writing into the temporary directory."""
+        return MetricsAggregator(self.root / 'results', self.root / 'figures')
+
+    def test_matches_record_path(self):
+        """Streaming and record loading give the same per-configuration summary."""
+        loaded, streamed = self.aggregator(), self.aggregator()
+        loaded.load_all_logs(self.logs)
+        streamed.load_all_logs(self.logs, streaming=True)
+        self.assertEqual(len(streamed.metrics), 0)
+        expected = loaded.aggregate_by_configuration()
+        actual = streamed.aggregate_by_configuration()
+        self.assertEqual(set(actual), {"full", "no-antigoal"})
+        for config, summary in expected.items():
+            for name, value in vars(summary).items():
+                if isinstance(value, float):
+                    self.assertAlmostEqual(getattr(actual[config], name), value, msg=name)
+                else:
+                    self.assertEqual(getattr(actual[config], name), value, msg=name)
+
+    def test_min_max(self):
+        """Streamed aggregates keep the range of every metric."""
+        aggregator = self.aggregator()
+        aggregator.load_all_logs(self.logs, streaming=True)
+        latency = aggregator.aggregates["full"].stats["decision-latency-ms"]
+        self.assertEqual((latency.count, latency.minimum, latency.maximum), (10, 6.0, 24.0))
+
+    def test_parallel_matches_sequential(self):
+        """Partial aggregates merged from a process pool equal a sequential stream."""
+        sequential, parallel = self.aggregator(), self.aggregator()
+        sequential.load_all_logs(self.logs, streaming=True)
+        parallel.load_all_logs(self.logs, workers=2)
+        self.assertEqual(len(parallel.metrics), 0)
+        self.assertEqual(set(parallel.aggregates), set(sequential.aggregates))
+        for config, aggregate in sequential.aggregates.items():
+            merged = parallel.aggregates[config]
+            self.assertEqual(merged.scenarios, aggregate.scenarios)
+            for name, stats in aggregate.stats.items():
+                self.assertEqual(merged.stats[name].count, stats.count)
+                self.assertAlmostEqual(merged.stats[name].total, stats.total)
+                self.assertEqual(merged.stats[name].minimum, stats.minimum)
+                self.assertEqual(merged.stats[name].maximum, stats.maximum)
+
+    def test_latency_percentiles(self):
+        """Summary rows carry latency percentiles; latency.csv has one row per scenario."""
+        aggregator = self.aggregator()
+        aggregator.load_all_logs(self.logs, workers=2)
+        full = aggregator.aggregate_by_configuration()['full']
+        self.assertEqual(full.decision_latency_max, 24.0)
+        self.assertAlmostEqual(full.decision_latency_p50, 14.0, delta=0.07)
+        aggregator.write_summary_csv(aggregator.aggregate_by_configuration())
+        with open(self.root / 'results' / 'summary.csv') as f:
+            self.assertIn('decision_latency_p999', next(csv.reader(f)))
+        with open(aggregator.write_latency_csv()) as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 6)
+        s1 = next(row for row in rows if row['configuration'] == 'full' and row['scenario_id'] == 's1')
+        # Odd i with i % 3 == 1: latencies 6, 12, 18, 24 ms
+        self.assertEqual(s1['count'], '4')
+        self.assertEqual(float(s1['decision_latency_max']), 24.0)
+
+    def test_invalid_workers(self):
+        """A worker count below one is rejected."""
+        with self.assertRaises(ValueError):
+            self.aggregator().load_all_logs(self.logs, workers=0)
+
+
+def record(i, configuration="full"):
+    """Log record number i."""
+    return {"scenarioId": f"s{i % 4}", "configuration": configuration, "decisionScore": 0.01 * i,
+            "latencyMs": 1.0 + i, "hardViolations": i % 2, "plan": ["a"] * (i % 3)}
+
+
+class TestIncrementalAggregation(unittest.TestCase):
+    """Test suite for MetricsAggregator.load_all_logs(checkpoint=...)."""
+
+    def setUp(self):
+        """Set up a log directory with two files and a checkpoint path."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+        self.logs = self.root / 'logs'
+        self.logs.mkdir()
+        self.checkpoint = self.root / 'results' / 'checkpoint.json'
+        write_log(self.logs / 'a.jsonl', [record(i) for i in range(10)])
+        write_log(self.logs / 'b.jsonl', [record(i, "no-antigoal") for i in range(5)])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assertMatchesFullLoad(self, workers=1):
+        """An incremental run equals streaming every log from scratch."""
+        incremental = MetricsAggregator(self.root / 'results', self.root / 'figures')
+        incremental.load_all_logs(self.logs, workers=workers, checkpoint=self.checkpoint)
+        full = MetricsAggregator(self.root / 'results', self.root / 'figures')
+        full.load_all_logs(self.logs, streaming=True)
+        actual, expected = incremental.configuration_aggregates(), full.configuration_aggregates()
+        self.assertEqual(set(actual), set(expected))
+        for config, aggregate in expected.items():
+            self.assertNestedAlmostEqual(actual[config].to_dict(), aggregate.to_dict())
+        return incremental
+
+    def assertNestedAlmostEqual(self, actual, expected):
+        """Equal nested dicts and lists, up to float rounding."""
+        if isinstance(expected, dict):
+            self.assertEqual(set(actual), set(expected))
+            for key in expected:
+                self.assertNestedAlmostEqual(actual[key], expected[key])
+        elif isinstance(expected, list):
+            self.assertEqual(len(actual), len(expected))
+            for item, expected_item in zip(actual, expected):
+                self.assertNestedAlmostEqual(item, expected_item)
+        elif isinstance(expected, float):
+            self.assertAlmostEqual(actual, expected)
+        else:
+            self.assertEqual(actual, expected)
+
+    def test_first_run_writes_checkpoint(self):
+        """A first run reads everything and records every file's offset."""
+        self.assertMatchesFullLoad()
+        with open(self.checkpoint) as f:
+            files = json.load(f)['files']
+        self.assertEqual(files['a.jsonl']['offset'], (self.logs / 'a.jsonl').stat().st_size)
+        self.assertEqual(set(files), {'a.jsonl', 'b.jsonl'})
+
+    def test_appended_and_new_files(self):
+        """Appended lines and new files are added to the checkpointed aggregates."""
+        self.assertMatchesFullLoad()
+        with open(self.logs / 'a.jsonl', 'a') as f:
+            f.write(json.dumps(record(10)) + '\n' + json.dumps(record(11)) + '\n')
+        write_log(self.logs / 'c.jsonl', [record(i, "no-metagoal") for i in range(3)])
+        self.assertMatchesFullLoad(workers=2)
+
+    def test_unchanged_files_are_skipped(self):
+        """Files with their checkpointed size and mtime are not read again."""
+        self.assertMatchesFullLoad()
+        with open(self.checkpoint) as f:
+            data = json.load(f)
+        data['files']['b.jsonl']['aggregates'] = {}
+        with open(self.checkpoint, 'w') as f:
+            json.dump(data, f)
+        aggregator = MetricsAggregator(self.root / 'results', self.root / 'figures')
+        aggregator.load_all_logs(self.logs, checkpoint=self.checkpoint)
+        self.assertEqual(set(aggregator.aggregates), {"full"})
+
+    def test_incomplete_last_line(self):
+        """A line still being written is read once its newline arrives."""
+        with open(self.logs / 'a.jsonl', 'a') as f:
+            f.write(json.dumps(record(10))[:20])
+        self.assertMatchesFullLoad()
+        with open(self.logs / 'a.jsonl', 'a') as f:
+            f.write(json.dumps(record(10))[20:] + '\n')
+        incremental = self.assertMatchesFullLoad()
+        self.assertEqual(incremental.aggregates["full"].stats['decision-latency-ms'].count, 11)
+
+    def test_replaced_and_removed_files(self):
+        """Rewritten files are read from the start; removed files drop out."""
+        self.assertMatchesFullLoad()
+        write_log(self.logs / 'a.jsonl', [record(i + 100) for i in range(12)])
+        (self.logs / 'b.jsonl').unlink()
+        incremental = self.assertMatchesFullLoad()
+        self.assertEqual(set(incremental.aggregates), {"full"})
+        self.assertEqual(incremental.aggregates["full"].stats['plan-length'].count, 12)
+
+    def test_compressed_members(self):
+        """Gzip members appended to a compressed log are read from the last one."""
+        path = self.logs / 'c.jsonl.gz'
+        with gzip.open(path, 'ab') as f:
+            f.write((json.dumps(record(0, "no-metagoal")) + '\n').encode())
+        self.assertMatchesFullLoad()
+        with gzip.open(path, 'ab') as f:
+            f.write((json.dumps(record(1, "no-metagoal")) + '\n').encode())
+        incremental = self.assertMatchesFullLoad()
+        self.assertEqual(incremental.aggregates["no-metagoal"].stats['plan-length'].count, 2)
+
+    def test_ignores_checkpoint_of_other_directory(self):
+        """A checkpoint written for another log directory is not used."""
+        self.assertMatchesFullLoad()
+        other = self.root / 'other'
+        other.mkdir()
+        write_log(other / 'a.jsonl', [record(0)])
+        aggregator = MetricsAggregator(self.root / 'results', self.root / 'figures')
+        aggregator.load_all_logs(other, checkpoint=self.checkpoint)
+        self.assertEqual(aggregator.aggregates["full"].stats['plan-length'].count, 1)
+
+
+class TestColumnarWriter(unittest.TestCase):
+    """Test suite for MetricsAggregator.write_columnar."""
+
+    def setUp(self):
+        """Set up an aggregator holding a few records."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+        self.aggregator = MetricsAggregator(self.root / 'results', self.root / 'figures')
+        self.aggregator.metrics = [
+            MetricRecord('s1', 'full', 'decision-latency-ms', 4.0, 't0'),
+            MetricRecord('s1', 'full', 'plan-length', 2.0, 't0'),
+            MetricRecord('s2', 'no-antigoal', 'decision-latency-ms', 6.0),
+        ]
+        self.aggregated = self.aggregator.aggregate_by_configuration()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_npz_round_trip(self):
+        """Records come back as codes into labels; aggregates as typed columns."""
+        records_path, summary_path = self.aggregator.write_columnar(self.aggregated, 'npz')
+        with np.load(records_path) as records:
+            labels = records['scenario_id_labels']
+            self.assertEqual(list(labels[records['scenario_id']]), ['s1', 's1', 's2'])
+            self.assertEqual(list(records['metric_name_labels']),
+                             ['decision-latency-ms', 'plan-length'])
+            self.assertEqual(list(records['timestamp_labels'][records['timestamp']]),
+                             ['t0', 't0', ''])
+            np.testing.assert_array_equal(records['value'], [4.0, 2.0, 6.0])
+        with np.load(summary_path) as summary:
+            self.assertEqual(list(summary['configuration']), ['full', 'no-antigoal'])
+            self.assertEqual(summary['hard_violations_total'].dtype, np.int64)
+            np.testing.assert_array_equal(summary['decision_latency_max'], [4.0, 6.0])
+
+    def test_unknown_format(self):
+        """Formats outside COLUMNAR_FORMATS are rejected."""
+        with self.assertRaises(ValueError):
+            self.aggregator.write_columnar(self.aggregated, 'csv')
+
+    @unittest.skipUnless(metrics.HAS_PYARROW, "pyarrow not available")
+    def test_arrow_round_trip(self):
+        """Arrow IPC files memory-map back into dictionary-encoded tables."""
+        import pyarrow as pa
+        records_path, _ = self.aggregator.write_columnar(self.aggregated, 'arrow')
+        with pa.memory_map(str(records_path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+        self.assertEqual(table.column('scenario_id').to_pylist(), ['s1', 's1', 's2'])
+        self.assertEqual(table.column('value').to_pylist(), [4.0, 2.0, 6.0])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test file for the MAGUS modulator table - Python Implementation
+================================================================================
+Validates the compiled modulator effects and fused context multipliers against
+modulator-effect and apply-modulators in scoring-v2.metta.
+================================================================================
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for module_dir in (os.path.join(ROOT, 'M3', 'core'), os.path.join(ROOT, 'core')):
+    sys.path.insert(0, module_dir)
+
+from modulator_table import MODULATOR_PARAMS, ModulatorTable, modulator_multiplier
+
+
+class TestModulatorTable(unittest.TestCase):
+    """Test suite for ModulatorTable."""
+
+    def setUp(self):
+        """Set up a table over the scoring-v2 parameters."""
+        self.table = ModulatorTable()
+
+    def test_effects_match_params(self):
+        """Every modulator's effect is base + multiplier × value."""
+        for name, (base, multiplier) in MODULATOR_PARAMS.items():
+            self.assertAlmostEqual(self.table.effect(name, 0.5), base + multiplier * 0.5)
+
+    def test_unknown_modulator_is_neutral(self):
+        """Unknown modulators have effect 1.0 whatever their value."""
+        self.assertEqual(self.table.effect("mystery", 0.9), 1.0)
+        ids = [self.table.modulator_id("mystery"), self.table.modulator_id("focus")]
+        np.testing.assert_allclose(self.table.effects(ids, [0.9, 0.5]), [1.0, 1.0])
+
+    def test_fused_multiplier_is_product_of_effects(self):
+        """The fused multiplier equals applying the modulators one by one."""
+        modulators = [("arousal", 0.6), ("focus", 0.4), ("pleasure", 1.0), ("mystery", 2.0)]
+        expected = 1.0
+        for name, value in modulators:
+            expected *= self.table.effect(name, value)
+        self.assertAlmostEqual(self.table.fused_multiplier(modulators), expected)
+        self.assertEqual(self.table.fused_multiplier([]), 1.0)
+        self.assertAlmostEqual(modulator_multiplier(modulators), expected)
+
+    def test_context_cache_is_bounded(self):
+        """Fused multipliers are memoized per modulator list with LRU eviction."""
+        table = ModulatorTable(cache_size=2)
+        for value in (0.1, 0.2, 0.3):
+            table.fused_multiplier([("arousal", value)])
+        self.assertEqual(len(table._fused), 2)
+        self.assertNotIn((("arousal", 0.1),), table._fused)
+
+
+class TestGroundedModulators(unittest.TestCase):
+    """Test the fused-modulator-multiplier atom registered with MeTTa."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Initialize MeTTa with the grounded MAGUS components."""
+        try:
+            from magus_init import initialize_magus
+        except ImportError as error:
+            raise unittest.SkipTest(f"hyperon not available: {error}")
+        cls.metta = initialize_magus()
+
+    def test_fused_modulator_multiplier(self):
+        """The atom fuses a Cons list of modulators into one number."""
+        result = self.metta.run('!(fused-modulator-multiplier '
+                                '(Cons (modulator arousal 0.5) (Cons (modulator focus 1.0) Nil)))')
+        self.assertAlmostEqual(result[0][0].get_object().value, 1.0 * 1.3)
+
+    def test_params_match_modulator_kb(self):
+        """MODULATOR_PARAMS equals the modulator-params atoms of &modulator-kb."""
+        from hyperon import MeTTa
+        from magus_init import load_metta_rules
+        metta = load_metta_rules(MeTTa(), os.path.join(ROOT, 'M3', 'core', 'scoring-v2.metta'))
+        rows = metta.run('!(match &modulator-kb (modulator-params $name $base $mult) '
+                         '($name $base $mult))')[0]
+        params = {name.get_name(): (base.get_object().value, mult.get_object().value)
+                  for name, base, mult in (row.get_children() for row in rows)}
+        self.assertEqual(params, MODULATOR_PARAMS)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Test file for the MAGUS overgoal engine - Python Implementation
+================================================================================
+Validates the vectorized overgoal scores and goal-set coherence against the
+worked example in overgoal.metta, and the grounded atoms registered with MeTTa.
+
+Educational Note:
+The expected values are computed by hand from the documented formula, so the
+tests pin down the semantics the recursive MeTTa versions were meant to have.
+================================================================================
+"""
+
+import math
+import os
+import sys
+import unittest
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for module_dir in (os.path.join(ROOT, 'M2', 'correlation'), os.path.join(ROOT, 'M3', 'core'),
+                   os.path.join(ROOT, 'core')):
+    sys.path.insert(0, module_dir)
+
+from initial_correlation_calculation import CorrelationCalculator, Goal
+from overgoal_engine import (CachedOvergoalEngine, DEFAULT_CORRELATIONS, OvergoalEngine,
+                             correlation_table, goal_set_fingerprint)
+from streaming_correlation import StreamingCorrelation
+from windowed_correlation import WindowedCorrelationStore
+
+
+MEASURABILITIES = {"energy": 0.72, "exploration": 0.56, "affinity": 0.20}
+
+
+def weighted(goal1, goal2):
+    """Weighted correlation of two goals computed directly from the formula."""
+    pair = (goal1, goal2) if (goal1, goal2) in DEFAULT_CORRELATIONS else (goal2, goal1)
+    return DEFAULT_CORRELATIONS[pair] * math.sqrt(MEASURABILITIES[goal1] * MEASURABILITIES[goal2])
+
+
+class TestOvergoalEngine(unittest.TestCase):
+    """Test suite for OvergoalEngine."""
+
+    def setUp(self):
+        """Set up an engine over the example correlations and measurabilities."""
+        self.engine = OvergoalEngine.from_tables(DEFAULT_CORRELATIONS, MEASURABILITIES)
+        self.goals = ["energy", "exploration", "affinity"]
+
+    def test_worked_example(self):
+        """Overgoal(energy) matches the example in overgoal.metta (≈ 0.318)."""
+        expected = (weighted("energy", "exploration") + weighted("energy", "affinity")) / 2
+        score = self.engine.overgoal_score("energy", self.goals)
+        self.assertAlmostEqual(score, expected, places=12)
+        self.assertAlmostEqual(score, 0.318, places=2)
+
+    def test_scores_match_single_goal_scores(self):
+        """The batched scores equal the per-goal scores."""
+        scores = self.engine.overgoal_scores(self.goals)
+        for goal, score in zip(self.goals, scores):
+            self.assertAlmostEqual(score, self.engine.overgoal_score(goal, self.goals), places=12)
+
+    def test_coherence_is_mean_of_overgoal_scores(self):
+        """Coherence averages every goal's overgoal score."""
+        pairs = [("energy", "exploration"), ("energy", "affinity"), ("exploration", "affinity")]
+        expected = 2 * sum(weighted(a, b) for a, b in pairs) / 6
+        self.assertAlmostEqual(self.engine.goalset_coherence(self.goals), expected, places=12)
+
+    def test_unknown_goals_count_as_uncorrelated(self):
+        """Goals missing from the table add 0.0 but still count in averages."""
+        score = self.engine.overgoal_score("energy", ["energy", "exploration", "unknown"])
+        self.assertAlmostEqual(score, weighted("energy", "exploration") / 2, places=12)
+        self.assertEqual(self.engine.weighted_correlation("unknown", "energy"), 0.0)
+
+    def test_small_goal_sets(self):
+        """Sets with fewer than two distinct goals score 0.0."""
+        self.assertEqual(self.engine.goalset_coherence([]), 0.0)
+        self.assertEqual(self.engine.goalset_coherence(["energy"]), 0.0)
+        self.assertEqual(self.engine.overgoal_score("energy", ["energy"]), 0.0)
+
+    def test_repeated_goal_is_not_paired_with_itself(self):
+        """A repeated name is masked out like the goal itself."""
+        scores = self.engine.overgoal_scores(["energy", "energy", "exploration"])
+        self.assertAlmostEqual(scores[0], weighted("energy", "exploration"), places=12)
+        self.assertAlmostEqual(scores[1], weighted("energy", "exploration"), places=12)
+        self.assertAlmostEqual(scores[2], weighted("energy", "exploration"), places=12)
+
+    def test_shape_validation(self):
+        """A weighted matrix that does not match the goals is rejected."""
+        with self.assertRaises(ValueError):
+            OvergoalEngine(["energy", "exploration"], np.zeros((3, 3)))
+        with self.assertRaises(ValueError):
+            OvergoalEngine.from_matrix(["energy", "exploration"], np.zeros((1, 1)), MEASURABILITIES)
+
+
+class TestCorrelationSources(unittest.TestCase):
+    """Test building engines from the M2 correlation sources."""
+
+    def test_default_correlations_match_calculator(self):
+        """The fallback table agrees with the MIC of the M2 calculator data."""
+        table = correlation_table(CorrelationCalculator())
+        self.assertEqual(set(table), set(DEFAULT_CORRELATIONS))
+        for pair, value in DEFAULT_CORRELATIONS.items():
+            self.assertAlmostEqual(table[pair], value, places=2)
+
+    def test_from_matrix_matches_from_tables(self):
+        """A calculator correlation matrix gives the same engine as the pair table."""
+        goals = [Goal.ENERGY, Goal.EXPLORATION, Goal.AFFINITY]
+        names = ["energy", "exploration", "affinity"]
+        matrix = np.zeros((3, 3))
+        for (goal1, goal2), value in DEFAULT_CORRELATIONS.items():
+            i, j = names.index(goal1), names.index(goal2)
+            matrix[i, j] = matrix[j, i] = value
+        from_matrix = OvergoalEngine.from_matrix(goals, matrix, MEASURABILITIES)
+        from_tables = OvergoalEngine.from_tables(DEFAULT_CORRELATIONS, MEASURABILITIES)
+        np.testing.assert_allclose(from_matrix.overgoal_scores(names),
+                                   from_tables.overgoal_scores(names))
+
+    def test_live_pairs_override_fallback(self):
+        """Pairs with samples come from the source, the others from the fallback."""
+        streaming = StreamingCorrelation()
+        streaming.update_many("exploration", "energy", [(i / 50, i / 50) for i in range(50)])
+        self.assertEqual(streaming.version, 50)
+        table = correlation_table(streaming, fallback=DEFAULT_CORRELATIONS)
+        self.assertAlmostEqual(table[("exploration", "energy")], 1.0)
+        self.assertNotIn(("energy", "exploration"), table)
+        self.assertEqual(table[("energy", "affinity")], 0.5)
+        self.assertEqual(table[("exploration", "affinity")], 0.3)
+        self.assertEqual(correlation_table(StreamingCorrelation()), {})
+
+
+class TestCachedOvergoalEngine(unittest.TestCase):
+    """Test suite for the memoized overgoal engine."""
+
+    def setUp(self):
+        """Set up a cache whose data version is controlled by the test."""
+        self.measurabilities = dict(MEASURABILITIES)
+        self.version = 0
+        self.builds = 0
+
+        def build():
+            self.builds += 1
+            return OvergoalEngine.from_tables(DEFAULT_CORRELATIONS, self.measurabilities)
+
+        self.cache = CachedOvergoalEngine(build, lambda: self.version, maxsize=2)
+        self.goals = ["energy", "exploration", "affinity"]
+
+    def test_fingerprint_ignores_order_but_keeps_repeats(self):
+        """Permutations share a key; repeated goals do not collapse."""
+        self.assertEqual(goal_set_fingerprint(["a", "b"]), goal_set_fingerprint(["b", "a"]))
+        self.assertNotEqual(goal_set_fingerprint(["a", "b"]), goal_set_fingerprint(["a", "a", "b"]))
+
+    def test_repeated_requests_hit(self):
+        """The same goal set in any order is computed once."""
+        first = self.cache.overgoal_score("energy", self.goals)
+        second = self.cache.overgoal_score("energy", list(reversed(self.goals)))
+        self.assertEqual(first, second)
+        self.assertEqual(self.cache.cache_info()["hits"], 1)
+        self.assertEqual(self.cache.cache_info()["misses"], 1)
+        self.assertEqual(self.builds, 1)
+
+    def test_version_change_invalidates(self):
+        """Updated M2 data is picked up on the next request."""
+        before = self.cache.goalset_coherence(self.goals)
+        self.measurabilities["affinity"] = 0.9
+        self.version += 1
+        after = self.cache.goalset_coherence(self.goals)
+        self.assertGreater(after, before)
+        self.assertEqual(self.builds, 2)
+
+    def test_lru_eviction(self):
+        """The least recently used score is evicted first."""
+        self.cache.overgoal_score("energy", self.goals)
+        self.cache.overgoal_score("exploration", self.goals)
+        self.cache.overgoal_score("energy", self.goals)
+        self.cache.overgoal_score("affinity", self.goals)
+        self.assertEqual(self.cache.cache_info()["size"], 2)
+        self.cache.overgoal_score("energy", self.goals)
+        self.assertEqual(self.cache.cache_info()["hits"], 2)
+        self.cache.overgoal_score("exploration", self.goals)
+        self.assertEqual(self.cache.cache_info()["misses"], 4)
+
+    def test_calculator_version_invalidates(self):
+        """Observing a reading bumps the measurability calculator's version."""
+        sys.path.insert(0, os.path.join(ROOT, 'M2', 'measurability'))
+        from initial_measurability_calculation import MeasurabilityCalculator
+        calculator = MeasurabilityCalculator()
+        cache = CachedOvergoalEngine(
+            lambda: OvergoalEngine.from_tables(
+                DEFAULT_CORRELATIONS,
+                {goal.value: value for goal, value in calculator.get_all_measurabilities()}),
+            lambda: calculator.version)
+        before = cache.overgoal_score("energy", self.goals)
+        for timestamp in range(10):
+            calculator.observe("affinity", 0.5, float(timestamp))
+        self.assertNotEqual(cache.overgoal_score("energy", self.goals), before)
+
+    def test_correlation_version_invalidates(self):
+        """New pair samples bump the windowed store's version and rebuild the engine."""
+        store = WindowedCorrelationStore()
+        cache = CachedOvergoalEngine(
+            lambda: OvergoalEngine.from_tables(
+                correlation_table(store, fallback=DEFAULT_CORRELATIONS), MEASURABILITIES),
+            lambda: store.version)
+        before = cache.overgoal_score("energy", self.goals)
+        self.assertAlmostEqual(before, (weighted("energy", "exploration")
+                                        + weighted("energy", "affinity")) / 2, places=12)
+        for timestamp in range(50):
+            store.add("energy", "exploration", timestamp / 50, timestamp / 50, float(timestamp))
+        after = cache.overgoal_score("energy", self.goals)
+        self.assertAlmostEqual(after, (weighted("energy", "exploration") / 0.7
+                                       + weighted("energy", "affinity")) / 2, places=9)
+
+
+class TestGroundedOvergoal(unittest.TestCase):
+    """Test the overgoal atoms registered with MeTTa."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Initialize MeTTa with the grounded MAGUS components."""
+        try:
+            from magus_init import initialize_magus, register_grounded_overgoal
+        except ImportError as error:
+            raise unittest.SkipTest(f"hyperon not available: {error}")
+        cls.metta = initialize_magus()
+        register_grounded_overgoal(
+            cls.metta, OvergoalEngine.from_tables(DEFAULT_CORRELATIONS, MEASURABILITIES))
+
+    def run_number(self, program):
+        """Run a program and return its single numeric result."""
+        return float(self.metta.run(program)[0][0].get_object().value)
+
+    def test_native_overgoal_score(self):
+        """The atom accepts Cons lists of goal expressions."""
+        score = self.run_number(
+            '!(native-overgoal-score (goal energy 0.8 1.0) '
+            '(Cons (goal exploration 0.5 1.0) (Cons (goal affinity 0.3 1.0) Nil)))')
+        expected = (weighted("energy", "exploration") + weighted("energy", "affinity")) / 2
+        self.assertAlmostEqual(score, expected, places=9)
+
+    def test_native_goalset_coherence(self):
+        """The atom accepts (list ...) goal sets."""
+        coherence = self.run_number(
+            '!(native-goalset-coherence (list (goal energy 0.8 1.0) '
+            '(goal exploration 0.5 1.0) (goal affinity 0.3 1.0)))')
+        expected = OvergoalEngine.from_tables(DEFAULT_CORRELATIONS, MEASURABILITIES) \
+            .goalset_coherence(["energy", "exploration", "affinity"])
+        self.assertAlmostEqual(coherence, expected, places=9)
+
+    def test_native_overgoal_score_with_data(self):
+        """The with-data atom builds its table from Tuple lists."""
+        score = self.run_number(
+            '!(native-overgoal-score-with-data energy (Cons exploration (Cons affinity Nil)) '
+            '(Cons (Tuple energy exploration 0.7) (Cons (Tuple energy affinity 0.5) Nil)) '
+            '(Cons (Tuple energy 0.72) (Cons (Tuple exploration 0.56) '
+            '(Cons (Tuple affinity 0.2) Nil))))')
+        expected = (weighted("energy", "exploration") + weighted("energy", "affinity")) / 2
+        self.assertAlmostEqual(score, expected, places=9)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)